@@ -1,5 +1,6 @@
 # requirements.txt
 Django==4.2.7
+asgiref==3.7.2
 psycopg2-binary==2.9.9
 django-environ==0.11.2
 Pillow==10.1.0
@@ -7,18 +8,23 @@ django-crispy-forms==2.1
 crispy-bootstrap5==0.7
 django-extensions==3.2.3
 python-decouple==3.8
+uvicorn==0.24.0
 
 # ===== SETTINGS =====
 # latex_services/settings.py
 
 import os
+import sys
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = config('SECRET_KEY', default='django-insecure-change-me-in-production')
 DEBUG = config('DEBUG', default=True, cast=bool)
+# Under `manage.py test`, which turns on the stricter checks below
+TESTING = sys.argv[1:2] == ['test']
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1', cast=lambda v: [s.strip() for s in v.split(',')])
 
 INSTALLED_APPS = [
@@ -29,6 +35,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.humanize',
+    'django.contrib.postgres',
     
     # Third party
     'crispy_forms',
@@ -39,9 +46,15 @@ INSTALLED_APPS = [
     'clients',
     'projects',
     'communications',
+    'reports',
+    'api',
+    'jobs',
 ]
 
 MIDDLEWARE = [
+    'latex_services.instrumentation.RequestMetricsMiddleware',
+    'latex_services.clock.RequestClockMiddleware',
+    'latex_services.replicas.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -71,7 +84,7 @@ TEMPLATES = [
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': config('DB_ENGINE', default='django.db.backends.postgresql'),
         'NAME': config('DB_NAME', default='latex_services'),
         'USER': config('DB_USER', default='postgres'),
         'PASSWORD': config('DB_PASSWORD', default='password'),
@@ -80,6 +93,69 @@ DATABASES = {
     }
 }
 
+# Database connections. DB_CONN_MODE is one of:
+# 'close'      a new connection for every request (Django's default)
+# 'persistent' each thread keeps its connection for DB_CONN_MAX_AGE seconds,
+#              checked before reuse
+# 'pool'       a pool of at most DB_POOL_SIZE connections per process, shared
+#              by its request and query-pool threads (latex_services/db/pooled)
+DB_CONN_MODE = config('DB_CONN_MODE', default='close')
+if DB_CONN_MODE == 'persistent':
+    DATABASES['default'].update(
+        CONN_MAX_AGE=config('DB_CONN_MAX_AGE', default=600, cast=int),
+        CONN_HEALTH_CHECKS=True,
+    )
+elif DB_CONN_MODE == 'pool':
+    DATABASES['default'].update(
+        ENGINE='latex_services.db.pooled',
+        # Django returns the connection to the pool after each request
+        CONN_MAX_AGE=0,
+        OPTIONS={
+            'POOL_SIZE': config('DB_POOL_SIZE', default=10, cast=int),
+            'POOL_TIMEOUT': config('DB_POOL_TIMEOUT', default=10, cast=float),
+            'POOL_RECYCLE': config('DB_POOL_RECYCLE', default=3600, cast=float),
+            'POOL_CHECK_IDLE': config('DB_POOL_CHECK_IDLE', default=5, cast=float),
+        },
+    )
+elif DB_CONN_MODE != 'close':
+    raise ImproperlyConfigured(f'Unknown DB_CONN_MODE {DB_CONN_MODE!r}')
+
+# Behind PgBouncer (or another pooler) in transaction mode: no server-side
+# cursors, which .iterator() would hold open across transactions. Give the
+# role a UTC timezone (ALTER ROLE ... SET timezone TO 'UTC') so Django never
+# has to SET it per session.
+if config('DB_TRANSACTION_POOLER', default=False, cast=bool):
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Read replica (optional). Reports, dashboards and admin changelists read from
+# it while it keeps up (latex_services/replicas.py); everything else uses the
+# primary. Two SQLite files work as local stand-ins: DB_ENGINE=
+# django.db.backends.sqlite3, DB_NAME=primary.sqlite3, DB_REPLICA_NAME=
+# replica.sqlite3, and copy the primary file over the replica to "replicate".
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+DB_REPLICA_NAME = config('DB_REPLICA_NAME', default='')
+if DB_REPLICA_HOST or DB_REPLICA_NAME:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': DB_REPLICA_NAME or DATABASES['default']['NAME'],
+        'HOST': DB_REPLICA_HOST or DATABASES['default']['HOST'],
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        # Test runs read from the primary's test database
+        'TEST': {'MIRROR': 'default'},
+    }
+elif TESTING:
+    # A mirror for the routing tests in latex_services/tests.py
+    DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+DATABASE_ROUTERS = ['latex_services.replicas.ReplicaRouter']
+# Off in test runs unless a test turns it on: the replica connection can't
+# see rows a TestCase hasn't committed
+REPLICA_READS = config('REPLICA_READS', default=not TESTING, cast=bool)
+# Reads stay on the primary this long after a client writes
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+# Beyond this lag (seconds) reads fall back to the primary; rechecked per interval
+REPLICA_MAX_LAG_SECONDS = config('REPLICA_MAX_LAG_SECONDS', default=10, cast=float)
+REPLICA_LAG_CHECK_INTERVAL = config('REPLICA_LAG_CHECK_INTERVAL', default=5, cast=float)
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'America/Los_Angeles'  # Adjust for your timezone
@@ -95,6 +171,84 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Cache (use a shared backend such as Redis or Memcached in production so
+# invalidation reaches every worker)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='latex-services'),
+    }
+}
+
+# Background jobs (see run_workers). The revenue rollup, follow-up emails and
+# PDF previews are queued as jobs, so without a running run_workers they
+# silently stop happening: deployments without a worker must set JOBS_EAGER,
+# which runs each task inline when it is queued (also what tests use).
+JOBS_EAGER = config('JOBS_EAGER', default=False, cast=bool)
+JOBS_VISIBILITY_TIMEOUT = config('JOBS_VISIBILITY_TIMEOUT', default=600, cast=int)
+
+# Batch contact-form intake (api/webhook/contact/batch/); empty disables it
+INTAKE_API_TOKEN = config('INTAKE_API_TOKEN', default='')
+
+# File downloads. DOWNLOAD_OFFLOAD hands the transfer to the front-end server:
+# 'nginx' (X-Accel-Redirect to an internal location aliasing MEDIA_ROOT,
+#   location /protected-media/ { internal; alias /path/to/media/; })
+# 'sendfile' (X-Sendfile, for Apache or lighttpd), or '' to send from Django.
+DOWNLOAD_OFFLOAD = config('DOWNLOAD_OFFLOAD', default='')
+DOWNLOAD_ACCEL_PREFIX = config('DOWNLOAD_ACCEL_PREFIX', default='/protected-media/')
+# Lifetime of signed links sent to clients (seconds)
+DOWNLOAD_LINK_MAX_AGE = config('DOWNLOAD_LINK_MAX_AGE', default=7 * 24 * 3600, cast=int)
+
+# PDF previews, rendered by run_workers (pdftoppm from poppler-utils, resized
+# with Pillow) once per content hash. The least recently viewed are evicted
+# once the cache outgrows PREVIEW_CACHE_MAX_BYTES, and re-rendered the next
+# time someone views them.
+PREVIEW_CACHE_DIR = MEDIA_ROOT / 'previews'
+PREVIEW_CACHE_MAX_BYTES = config('PREVIEW_CACHE_MAX_BYTES', default=500 * 1024 * 1024, cast=int)
+PREVIEW_PAGES = config('PREVIEW_PAGES', default=3, cast=int)
+
+# Chunked uploads. Parts are assembled under MEDIA_ROOT so that completing
+# an upload is a rename into place rather than a copy.
+CHUNKED_UPLOAD_DIR = MEDIA_ROOT / 'uploads'
+UPLOAD_CHUNK_SIZE = config('UPLOAD_CHUNK_SIZE', default=8 * 1024 * 1024, cast=int)
+MAX_UPLOAD_SIZE = config('MAX_UPLOAD_SIZE', default=2 * 1024 ** 3, cast=int)
+
+# List views (keyset pagination)
+LIST_PAGE_SIZE = config('LIST_PAGE_SIZE', default=50, cast=int)
+# Rendered list rows (latex_services/fragments.py); an edit changes the key
+ROW_CACHE_TIMEOUT = config('ROW_CACHE_TIMEOUT', default=86400, cast=int)
+
+# Async views (serve with: uvicorn latex_services.asgi:application). Threads
+# running their independent queries side by side, per process.
+ASGI_APPLICATION = 'latex_services.asgi.application'
+ASYNC_QUERY_WORKERS = config('ASYNC_QUERY_WORKERS', default=8, cast=int)
+
+# Request metrics (/debug/requests/ for staff, X-Query-Count and
+# Server-Timing headers in DEBUG). Budgets are per URL name and include the
+# session and user lookups; strict mode (on for tests) raises instead of logging.
+REQUEST_METRICS_BUFFER = config('REQUEST_METRICS_BUFFER', default=500, cast=int)
+QUERY_BUDGETS_STRICT = config('QUERY_BUDGETS_STRICT', default=TESTING, cast=bool)
+QUERY_BUDGETS = {
+    'dashboard': 5,
+    'dashboard_async': 5,
+    'client_list': 3,
+    'client_detail': 5,
+    'project_list': 3,
+    'work_queue': 4,
+    'project_detail': 7,
+    'revenue_report': 5,
+    'revenue_report_async': 5,
+    'pipeline_report': 5,
+    'pipeline_report_async': 5,
+}
+
+# N+1 detection: the same normalized query run more than NPLUSONE_THRESHOLD
+# times in one request is reported with the stack that ran it. 'raise' for
+# tests, 'log' for production (a sampled fraction of requests), or 'off'.
+NPLUSONE_MODE = config('NPLUSONE_MODE', default='off')
+NPLUSONE_THRESHOLD = config('NPLUSONE_THRESHOLD', default=5, cast=int)
+NPLUSONE_SAMPLE_RATE = config('NPLUSONE_SAMPLE_RATE', default=0.05, cast=float)
+
 # Crispy Forms
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
@@ -110,11 +264,238 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='latex@dadams.cc')
 
+# latex_services/asgi.py
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'latex_services.settings')
+
+application = get_asgi_application()
+
+# latex_services/db/__init__.py
+# (empty file)
+
+# latex_services/db/pooled/__init__.py
+# (empty file)
+
+# latex_services/db/pooled/base.py
+"""
+PostgreSQL backend taking connections from a per-process pool instead of
+opening one per request. Used with CONN_MAX_AGE = 0, so Django hands the
+connection back at the end of each request. OPTIONS:
+  POOL_SIZE        connections per process, shared by its threads
+  POOL_TIMEOUT     seconds to wait for a free connection
+  POOL_RECYCLE     close connections older than this (seconds)
+  POOL_CHECK_IDLE  ping a connection idle longer than this before reuse
+"""
+import os
+import threading
+import time
+from django.db import OperationalError
+from django.db.backends.postgresql import base, creation
+from psycopg2 import extensions
+
+POOL_OPTIONS = {'POOL_SIZE': 10, 'POOL_TIMEOUT': 10.0, 'POOL_RECYCLE': 3600.0, 'POOL_CHECK_IDLE': 5.0}
+
+# (alias, database name) -> ConnectionPool, for this process. The name is part
+# of the key so switching to a test database never reuses a live connection.
+_pools = {}
+_pools_lock = threading.Lock()
+
+class PoolTimeout(OperationalError):
+    pass
+
+class ConnectionPool:
+    """At most `size` psycopg2 connections, checked out by one thread at a time"""
+    
+    def __init__(self, size, timeout, recycle, check_idle):
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.check_idle = check_idle
+        self.isolation_level = None
+        self._slots = threading.BoundedSemaphore(size)
+        # (connection, returned_at), most recently returned last
+        self._idle = []
+        self._created_at = {}
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+    
+    def checkout(self, connect):
+        """A healthy idle connection, or a new one from `connect()`"""
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise PoolTimeout(f'No database connection free within {self.timeout}s (pool size {self.size})')
+        waited = time.monotonic() - started
+        try:
+            connection = self._reuse() or self._create(connect)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return connection
+    
+    def release(self, connection, reuse=True):
+        """Give back a checked-out connection; reuse=False closes it instead"""
+        try:
+            expired = time.monotonic() - self._created_at.get(id(connection), 0) > self.recycle
+            if not reuse or connection.closed or expired:
+                self.discard(connection)
+                return
+            try:
+                # Never hand on an open transaction
+                if connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+                connection.autocommit = True
+            except Exception:
+                self.discard(connection)
+                return
+            with self._lock:
+                self._idle.append((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+    
+    def discard(self, connection):
+        with self._lock:
+            self._created_at.pop(id(connection), None)
+            self.discarded += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+    
+    def close_idle(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, returned_at in idle:
+            self.discard(connection)
+    
+    def _create(self, connect):
+        connection = connect()
+        with self._lock:
+            self._created_at[id(connection)] = time.monotonic()
+            self.created += 1
+        return connection
+    
+    def _reuse(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection, returned_at = self._idle.pop()
+            if self._healthy(connection, returned_at):
+                return connection
+            self.discard(connection)
+    
+    def _healthy(self, connection, returned_at):
+        if connection.closed:
+            return False
+        if time.monotonic() - returned_at < self.check_idle:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except Exception:
+            return False
+    
+    def stats(self):
+        with self._lock:
+            idle = len(self._idle)
+            return {
+                'size': self.size,
+                'open': self.created - self.discarded,
+                'idle': idle,
+                'in_use': self.created - self.discarded - idle,
+                'checkouts': self.checkouts,
+                'created': self.created,
+                'discarded': self.discarded,
+                'timeouts': self.timeouts,
+                'avg_wait_ms': round(self.wait_seconds / self.checkouts * 1000, 2) if self.checkouts else 0,
+                'max_wait_ms': round(self.max_wait_seconds * 1000, 2),
+            }
+
+def pool_stats():
+    """{alias: checkout and wait counters} for this process's pools"""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {f'{alias}:{name}': pool.stats() for (alias, name), pool in pools.items()}
+
+def close_idle_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_idle()
+
+# A forked child must not share its parent's sockets
+os.register_at_fork(before=close_idle_pools)
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections to the test database would block DROP DATABASE
+        close_idle_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+    
+    @property
+    def pool(self):
+        key = (self.alias, self.settings_dict['NAME'])
+        with _pools_lock:
+            if key not in _pools:
+                options = self.settings_dict['OPTIONS']
+                _pools[key] = ConnectionPool(
+                    size=int(options.get('POOL_SIZE', POOL_OPTIONS['POOL_SIZE'])),
+                    timeout=float(options.get('POOL_TIMEOUT', POOL_OPTIONS['POOL_TIMEOUT'])),
+                    recycle=float(options.get('POOL_RECYCLE', POOL_OPTIONS['POOL_RECYCLE'])),
+                    check_idle=float(options.get('POOL_CHECK_IDLE', POOL_OPTIONS['POOL_CHECK_IDLE'])),
+                )
+            return _pools[key]
+    
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        # Pool settings, not libpq options
+        for option in POOL_OPTIONS:
+            params.pop(option, None)
+        return params
+    
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        
+        def connect():
+            connection = super(DatabaseWrapper, self).get_new_connection(conn_params)
+            pool.isolation_level = self.isolation_level
+            return connection
+        
+        connection = pool.checkout(connect)
+        # Only set when a connection is created; every one shares the OPTIONS
+        self.isolation_level = pool.isolation_level
+        return connection
+    
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            # Closed mid-transaction, the wrapper keeps its reference: don't share it
+            self.pool.release(self.connection, reuse=not self.in_atomic_block)
+
 # ===== MODELS =====
 
 # clients/models.py
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.urls import reverse
 from django.utils import timezone
 
@@ -152,7 +533,13 @@ class Client(models.Model):
     # Business Information
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='lead')
     lead_source = models.CharField(max_length=20, choices=LEAD_SOURCE_CHOICES, default='website')
-    lifetime_value = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    
+    # Project aggregates, kept current by Project.save()/delete and
+    # ProjectQuerySet.update(); bulk_create and raw SQL callers must run
+    # recompute_clients themselves (see clients/aggregates.py)
+    project_count = models.PositiveIntegerField(default=0, editable=False)
+    total_value = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
+    lifetime_value = models.DecimalField(max_digits=10, decimal_places=2, default=0, editable=False)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -162,8 +549,23 @@ class Client(models.Model):
     # Notes
     notes = models.TextField(blank=True, help_text="Internal notes about this client")
     
+    # Search (maintained by a database trigger, see clients/migrations/0002_search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Backs keyset pagination in client_list
+            models.Index(fields=['-created_at', '-id'], name='client_created_id_idx'),
+            # Backs the LTV sort in the admin and top clients in revenue_report
+            models.Index(fields=['-total_value'], name='client_total_value_idx'),
+            # Stale leads in send_follow_up_emails: equality columns first, then the range
+            models.Index(fields=['status', 'last_contact', 'created_at'], name='client_status_contact_idx'),
+            # The pipeline report's lead sources and the admin's lead_source filter
+            models.Index(fields=['lead_source'], name='client_lead_source_idx'),
+            # The GIN search indexes are PostgreSQL-only and live in
+            # clients/migrations/0002_search.py so SQLite test runs can migrate
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.institution})"
@@ -180,10 +582,132 @@ class Client(models.Model):
         return self.projects.filter(status__in=['quoted', 'in_progress', 'review'])
 
 # projects/models.py
-from django.db import models
+import os
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import models, router, transaction
+from django.db.models import Case, ExpressionWrapper, F, Q, Value, When
+from django.db.models.lookups import Exact
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.contrib.postgres.search import SearchVectorField
 from django.urls import reverse
 from django.utils import timezone
+from clients.aggregates import apply_client_delta, recompute_clients
 from clients.models import Client
+from latex_services import clock
+from latex_services.stats_cache import invalidate_dashboard_stats
+from .storage import BLOB_PREFIX, blob_storage
+
+# A deadline this close counts as "due soon" (days_until_deadline <= 3)
+DUE_SOON = timedelta(days=4)
+
+# Project.priority as a sortable number; higher is more urgent
+PRIORITY_RANKS = {'low': 1, 'normal': 2, 'high': 3, 'urgent': 4}
+
+# The columns a project's contribution to its client's aggregates depends on
+CONTRIBUTION_FIELDS = ('client_id', 'status', 'final_amount')
+
+def contribution(client_id, status, final_amount):
+    """(client_id, total_value, lifetime_value) a project adds to its client"""
+    value = final_amount or 0
+    return (client_id, value, value if status == 'completed' else 0)
+
+def priority_rank_expression(priority):
+    """The rank of a priority value (or expression), computed in the database"""
+    if not hasattr(priority, 'resolve_expression'):
+        priority = Value(priority)
+    return Case(
+        *[When(Exact(priority, Value(name)), then=Value(rank)) for name, rank in PRIORITY_RANKS.items()],
+        default=Value(PRIORITY_RANKS['normal']),
+    )
+
+class PriorityRankField(models.PositiveSmallIntegerField):
+    """
+    Derived from the row's priority whenever it is written. pre_save also
+    runs for bulk_create and the intake's raw INSERT, which skip save().
+    """
+    
+    def pre_save(self, model_instance, add):
+        rank = PRIORITY_RANKS.get(model_instance.priority, PRIORITY_RANKS['normal'])
+        setattr(model_instance, self.attname, rank)
+        return rank
+
+class ProjectQuerySet(models.QuerySet):
+    def with_deadline_state(self, now=None):
+        """
+        Annotate overdue, due_soon and time_to_deadline against one `now`
+        (the request's, by default) instead of a clock read per row.
+        """
+        now = now or clock.now()
+        pending = ~Q(status='completed')
+        return self.annotate(
+            time_to_deadline=ExpressionWrapper(
+                F('deadline') - Value(now, output_field=models.DateTimeField()),
+                output_field=models.DurationField(),
+            ),
+            overdue=Case(
+                When(pending & Q(deadline__lt=now), then=Value(True)),
+                default=Value(False), output_field=models.BooleanField(),
+            ),
+            due_soon=Case(
+                When(pending & Q(deadline__gte=now, deadline__lt=now + DUE_SOON), then=Value(True)),
+                default=Value(False), output_field=models.BooleanField(),
+            ),
+        )
+    
+    def overdue(self, now=None):
+        # The overdue queue lists active projects only, unlike the badges.
+        # Same predicate as project_active_deadline_idx, so it's a range scan
+        return self.filter(status__in=Project.ACTIVE_STATUSES, deadline__lt=now or clock.now())
+    
+    def due_soon(self, now=None):
+        now = now or clock.now()
+        return self.filter(status__in=Project.ACTIVE_STATUSES, deadline__gte=now, deadline__lt=now + DUE_SOON)
+    
+    def work_queue(self, after=None):
+        """
+        Active projects, most urgent first, then earliest deadline
+        (project_work_queue_idx). `after` is a (priority_rank, deadline, id)
+        position to continue from, as decoded by decode_queue_cursor.
+        """
+        queryset = self.filter(status__in=Project.ACTIVE_STATUSES)
+        if after is not None:
+            rank, deadline, pk = after
+            # Deadlines ascend with the undated last, then ids ascend
+            if deadline is None:
+                later = Q(deadline__isnull=True, id__gt=pk)
+            else:
+                later = Q(deadline__gt=deadline) | Q(deadline=deadline, id__gt=pk) | Q(deadline__isnull=True)
+            queryset = queryset.filter(Q(priority_rank__lt=rank) | Q(priority_rank=rank) & later)
+        return queryset.order_by('-priority_rank', F('deadline').asc(nulls_last=True), 'id')
+    
+    def update(self, **kwargs):
+        """
+        update() skips Project.save(), so when it writes a column the client
+        aggregates depend on, the clients it touched are recomputed. A new
+        priority also rewrites priority_rank and updated_at, which the cached
+        list rows are keyed on.
+        """
+        if 'priority' in kwargs:
+            kwargs.setdefault('priority_rank', priority_rank_expression(kwargs['priority']))
+            kwargs.setdefault('updated_at', timezone.now())
+        attnames = {self.model._meta.get_field(name).attname for name in kwargs}
+        if not attnames & set(CONTRIBUTION_FIELDS):
+            return super().update(**kwargs)
+        using = self._db or router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            rows = list(self.using(using).select_for_update().values_list('pk', 'client_id'))
+            updated = super().update(**kwargs)
+            client_ids = {client_id for pk, client_id in rows}
+            if 'client_id' in attnames:
+                client_ids.update(self.model._base_manager.using(using).filter(
+                    pk__in=[pk for pk, client_id in rows]
+                ).values_list('client_id', flat=True))
+            recompute_clients(client_ids, using=using)
+        return updated
 
 class Project(models.Model):
     PROJECT_TYPE_CHOICES = [
@@ -210,6 +734,8 @@ class Project(models.Model):
         ('urgent', 'Urgent'),
     ]
     
+    ACTIVE_STATUSES = ['quoted', 'approved', 'in_progress', 'review']
+    
     # Basic Information
     client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name='projects')
     title = models.CharField(max_length=200)
@@ -219,6 +745,7 @@ class Project(models.Model):
     # Project Management
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='inquiry')
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='normal')
+    priority_rank = PriorityRankField(default=PRIORITY_RANKS['normal'], editable=False)
     
     # Financial
     quoted_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
@@ -245,8 +772,33 @@ class Project(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
+    # Search (maintained by a database trigger, see projects/migrations/0002_search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    objects = ProjectQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Backs keyset pagination in project_list
+            models.Index(fields=['-created_at', '-id'], name='project_created_id_idx'),
+            # ... and the same pages filtered by status
+            models.Index(fields=['status', '-created_at', '-id'], name='project_status_created_idx'),
+            # Completed projects by month: the revenue rollup
+            models.Index(fields=['status', 'completed_at'], name='project_status_completed_idx'),
+            # Quotes gone quiet: send_follow_up_emails
+            models.Index(fields=['status', 'updated_at'], name='project_status_updated_idx'),
+            # The overdue and due-soon queues, which only list ACTIVE_STATUSES rows
+            models.Index(
+                fields=['deadline'], name='project_active_deadline_idx',
+                condition=models.Q(status__in=['quoted', 'approved', 'in_progress', 'review']),
+            ),
+            # ProjectQuerySet.work_queue(): its first page is read off this index alone
+            models.Index(
+                fields=['-priority_rank', 'deadline', 'id'], name='project_work_queue_idx',
+                condition=models.Q(status__in=['quoted', 'approved', 'in_progress', 'review']),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.client.full_name}"
@@ -254,16 +806,109 @@ class Project(models.Model):
     def get_absolute_url(self):
         return reverse('project_detail', kwargs={'pk': self.pk})
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_revenue_bucket = instance.revenue_bucket()
+        return instance
+    
+    def stored_contribution(self, using):
+        """
+        The contribution columns of this project's row as stored, locked until
+        the transaction ends; None if there is no row.
+        """
+        return type(self)._base_manager.using(using).select_for_update().filter(
+            pk=self.pk
+        ).values(*CONTRIBUTION_FIELDS).first()
+    
+    def revenue_bucket(self):
+        """(month, project_type) this project counts toward in MonthlyRevenue, if any"""
+        if self.get_deferred_fields() & {'status', 'completed_at', 'project_type'}:
+            return None
+        if self.status != 'completed' or not self.completed_at:
+            return None
+        month = timezone.localtime(self.completed_at).date().replace(day=1)
+        return (month, self.project_type)
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'priority' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'priority_rank'}
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        
+        with transaction.atomic(using=using):
+            # The delta is taken against the stored row, locked here, rather
+            # than what this instance loaded: a concurrent save may have
+            # changed it since
+            stored = None if self._state.adding else self.stored_contribution(using)
+            super().save(*args, **kwargs)
+            
+            if stored is None:
+                current = contribution(self.client_id, self.status, self.final_amount)
+                apply_client_delta(current[0], 1, current[1], current[2], using=using)
+                return
+            # Only the columns this save wrote changed (deferred ones aren't written)
+            if kwargs.get('update_fields') is not None:
+                written = {self._meta.get_field(name).attname for name in kwargs['update_fields']}
+            else:
+                written = set(CONTRIBUTION_FIELDS) - self.get_deferred_fields()
+            previous = contribution(**stored)
+            current = contribution(**{
+                name: getattr(self, name) if name in written else value for name, value in stored.items()
+            })
+            
+            if previous[0] == current[0]:
+                if previous != current:
+                    apply_client_delta(
+                        current[0], 0, current[1] - previous[1], current[2] - previous[2], using=using
+                    )
+            else:
+                # Moved to another client
+                apply_client_delta(previous[0], -1, -previous[1], -previous[2], using=using)
+                apply_client_delta(current[0], 1, current[1], current[2], using=using)
+    
+    # The deadline properties use with_deadline_state() annotations when
+    # present. Any project not yet completed can be overdue or due soon.
+    
     @property
     def is_overdue(self):
-        return self.deadline and self.deadline < timezone.now() and self.status != 'completed'
+        if hasattr(self, 'overdue'):
+            return self.overdue
+        return bool(self.deadline) and self.status != 'completed' and self.deadline < clock.now()
+    
+    @property
+    def is_due_soon(self):
+        if hasattr(self, 'due_soon'):
+            return self.due_soon
+        if not self.deadline or self.status == 'completed':
+            return False
+        return clock.now() <= self.deadline < clock.now() + DUE_SOON
     
     @property
     def days_until_deadline(self):
         if not self.deadline:
             return None
-        delta = self.deadline - timezone.now()
-        return delta.days
+        if getattr(self, 'time_to_deadline', None) is not None:
+            return self.time_to_deadline.days
+        return (self.deadline - clock.now()).days
+
+@receiver(pre_delete, sender=Project)
+def lock_client_contribution(sender, instance, using, **kwargs):
+    # Both receivers run inside the deletion's transaction, including admin
+    # bulk deletes; the row is read (and locked) before it goes
+    instance._deleted_contribution = instance.stored_contribution(using)
+
+@receiver(post_delete, sender=Project)
+def remove_from_client_aggregates(sender, instance, using, **kwargs):
+    stored = getattr(instance, '_deleted_contribution', None)
+    if stored is not None:
+        previous = contribution(**stored)
+        apply_client_delta(previous[0], -1, -previous[1], -previous[2], using=using)
+
+@receiver([post_save, post_delete], sender=Project)
+@receiver([post_save, post_delete], sender=Client)
+def expire_dashboard_stats(sender, using, **kwargs):
+    transaction.on_commit(invalidate_dashboard_stats, using=using)
 
 class ProjectFile(models.Model):
     FILE_TYPE_CHOICES = [
@@ -275,7 +920,9 @@ class ProjectFile(models.Model):
     
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='files')
     file_type = models.CharField(max_length=20, choices=FILE_TYPE_CHOICES)
-    file = models.FileField(upload_to='project_files/%Y/%m/')
+    # Content-addressed: identical files share one blob (see projects/storage.py).
+    # Indexed for gc_project_files' reference checks.
+    file = models.FileField(storage=blob_storage, max_length=255, db_index=True)
     filename = models.CharField(max_length=255)
     description = models.CharField(max_length=500, blank=True)
     version = models.CharField(max_length=20, blank=True)
@@ -287,6 +934,155 @@ class ProjectFile(models.Model):
     
     def __str__(self):
         return f"{self.filename} - {self.project.title}"
+    
+    def get_absolute_url(self):
+        return reverse('download_file', args=[self.pk])
+    
+    @property
+    def content_hash(self):
+        """SHA-256 of the content, for files in the blob store"""
+        if self.file.name and self.file.name.startswith(f'{BLOB_PREFIX}/'):
+            return os.path.basename(self.file.name)
+        return None
+
+class FileUpload(models.Model):
+    """A resumable, chunked upload; becomes a ProjectFile once every byte is in"""
+    
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('complete', 'Complete'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='uploads')
+    uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
+    
+    # Copied onto the ProjectFile
+    filename = models.CharField(max_length=255)
+    file_type = models.CharField(max_length=20, choices=ProjectFile.FILE_TYPE_CHOICES)
+    description = models.CharField(max_length=500, blank=True)
+    version = models.CharField(max_length=20, blank=True)
+    
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    # SHA-256 of the first `received` bytes, extended as each chunk comes in
+    digest = models.CharField(max_length=64, blank=True, editable=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
+    project_file = models.OneToOneField(ProjectFile, on_delete=models.SET_NULL, null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size} bytes)"
+    
+    @property
+    def part_path(self):
+        # Where chunks are written until the upload completes
+        return os.path.join(settings.CHUNKED_UPLOAD_DIR, f'{self.pk}.part')
+
+class FilePreview(models.Model):
+    """Rendered preview images of one PDF content hash (see projects/previews.py)"""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+    
+    content_hash = models.CharField(max_length=64, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    pages = models.PositiveSmallIntegerField(default=0)
+    bytes = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Eviction order: least recently viewed goes first
+    last_accessed = models.DateTimeField(default=timezone.now, db_index=True)
+    
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.status})"
+
+@receiver(post_save, sender=ProjectFile)
+def queue_file_preview(sender, instance, created, **kwargs):
+    from .tasks import render_preview
+    
+    if not created or not instance.content_hash or not instance.filename.lower().endswith('.pdf'):
+        return
+    # Identical content uploaded again reuses the existing preview
+    if not FilePreview.objects.filter(content_hash=instance.content_hash).exists():
+        # After commit: a chunked upload's file is only moved into place then
+        transaction.on_commit(lambda: render_preview.enqueue(instance.pk))
+
+# projects/storage.py
+import hashlib
+import os
+import tempfile
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+BLOB_PREFIX = 'blobs'
+HASH_BLOCK_SIZE = 1024 * 1024
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each file under the SHA-256 of its content, sharded by prefix
+    (blobs/ab/cd/abcd...), so identical uploads share one file whatever name
+    they came in with. Rows can come and go freely: nothing is deleted with
+    them, and gc_project_files reclaims blobs no ProjectFile references.
+    """
+    
+    def blob_name(self, digest):
+        return f'{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}'
+    
+    def get_available_name(self, name, max_length=None):
+        # _save() decides the real name from the content
+        return name
+    
+    def _save(self, name, content):
+        tmp_dir = self.path(f'{BLOB_PREFIX}/tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+            return self._store(tmp_path, digest.hexdigest())
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def adopt(self, path, digest=None):
+        """
+        Take over a file already on this filesystem (renamed, not copied).
+        `digest` is its hex SHA-256, if the caller already has it.
+        """
+        if digest is None:
+            content_hash = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                    content_hash.update(block)
+            digest = content_hash.hexdigest()
+        return self._store(path, digest)
+    
+    def _store(self, path, digest):
+        name = self.blob_name(digest)
+        target = self.path(name)
+        if os.path.exists(target):
+            os.remove(path)
+            # A fresh mtime keeps gc_project_files' grace period from racing
+            # the row about to reference this blob
+            os.utime(target)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.chmod(path, self.file_permissions_mode or 0o644)
+            os.replace(path, target)
+        return name
+
+blob_storage = ContentAddressedStorage()
 
 # communications/models.py
 from django.db import models
@@ -321,132 +1117,2846 @@ class Communication(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # A client's latest communications (client_detail)
+            models.Index(fields=['client', '-created_at'], name='comm_client_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.communication_type} - {self.subject} ({self.created_at.strftime('%Y-%m-%d')})"
 
-# ===== VIEWS =====
+class EmailLog(models.Model):
+    """One row per automated email, so reruns of a sender never repeat a send"""
+    
+    KIND_CHOICES = [
+        ('lead_follow_up', 'Lead Follow-up'),
+        ('quote_follow_up', 'Quote Follow-up'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    # Identifies the thing being followed up on; a sent row blocks resending it
+    dedupe_key = models.CharField(max_length=200)
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name='email_logs')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='email_logs', null=True, blank=True)
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=200)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedupe_key'], condition=models.Q(status='sent'), name='email_log_sent_once'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} to {self.recipient} ({self.status})"
 
-# latex_services/urls.py
-from django.contrib import admin
-from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
-from django.views.generic import TemplateView
+# communications/delivery.py
+import time
+from collections import defaultdict, deque
+from django.core.mail import get_connection
 
-urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('', TemplateView.as_view(template_name='dashboard.html'), name='dashboard'),
-    path('clients/', include('clients.urls')),
-    path('projects/', include('projects.urls')),
-    path('communications/', include('communications.urls')),
-]
+class DomainThrottle:
+    """Sliding-window limit of sends per recipient domain"""
+    
+    def __init__(self, per_minute, clock=time.monotonic, sleep=time.sleep):
+        self.per_minute = per_minute
+        self.clock = clock
+        self.sleep = sleep
+        self.sent = defaultdict(deque)
+    
+    def wait(self, recipient):
+        if not self.per_minute:
+            return
+        window = self.sent[recipient.rpartition('@')[2].lower()]
+        now = self.clock()
+        while window and now - window[0] >= 60:
+            window.popleft()
+        if len(window) >= self.per_minute:
+            self.sleep(60 - (now - window[0]))
+            window.popleft()
+        window.append(self.clock())
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+class Delivery:
+    """
+    Sends EmailMessages over one reused backend connection.
+    
+    Messages go out one send_messages() call at a time on the open connection,
+    so a failure is attributed to exactly one message and the rest of the
+    batch still goes out.
+    """
+    
+    def __init__(self, backend=None, per_domain_per_minute=30, throttle=None):
+        self.connection = get_connection(backend, fail_silently=False)
+        self.throttle = throttle or DomainThrottle(per_domain_per_minute)
+    
+    def __enter__(self):
+        self.connection.open()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.connection.close()
+    
+    def send(self, messages):
+        """Yield (message, error) for each message; error is None on success"""
+        for message in messages:
+            self.throttle.wait(message.to[0])
+            message.connection = self.connection
+            try:
+                self.connection.send_messages([message])
+            except Exception as e:
+                yield message, e
+            else:
+                yield message, None
 
-# clients/views.py
-from django.shortcuts import render, get_object_or_404, redirect
-from django.contrib.auth.decorators import login_required
-from django.contrib import messages
-from django.db.models import Q, Sum, Count
-from django.utils import timezone
-from .models import Client
-from .forms import ClientForm
+# reports/models.py
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from projects.models import Project
 
-@login_required
-def client_list(requests):
-    clients = Client.objects.select_related().prefetch_related('projects')
-    
-    # Search functionality
-    search = request.GET.get('search')
-    if search:
-        clients = clients.filter(
-            Q(first_name__icontains=search) |
-            Q(last_name__icontains=search) |
-            Q(email__icontains=search) |
-            Q(institution__icontains=search)
-        )
+class MonthlyRevenue(models.Model):
+    """Completed-project revenue rolled up per month and project type"""
     
-    # Status filter
-    status = request.GET.get('status')
-    if status:
-        clients = clients.filter(status=status)
+    month = models.DateField(help_text="First day of the month, in TIME_ZONE")
+    project_type = models.CharField(max_length=30, choices=Project.PROJECT_TYPE_CHOICES)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    # Those of them with a final_amount: what average values divide by
+    valued_count = models.PositiveIntegerField(default=0)
     
-    # Add aggregated data
-    clients = clients.annotate(
-        project_count=Count('projects'),
-        total_value=Sum('projects__final_amount')
-    )
+    class Meta:
+        ordering = ['month', 'project_type']
+        constraints = [
+            models.UniqueConstraint(fields=['month', 'project_type'], name='monthly_revenue_bucket_uniq'),
+        ]
     
-    context = {
-        'clients': clients,
-        'search': search,
-        'status': status,
-        'status_choices': Client.STATUS_CHOICES,
-    }
-    return render(request, 'clients/client_list.html', context)
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.project_type}: ${self.revenue}"
 
-@login_required
-def client_detail(request, pk):
-    client = get_object_or_404(Client, pk=pk)
-    projects = client.projects.all()
-    recent_communications = client.communications.all()[:5]
+class PipelineSnapshot(models.Model):
+    """Daily count and quoted value of projects in each pipeline stage"""
     
-    context = {
-        'client': client,
-        'projects': projects,
-        'recent_communications': recent_communications,
-    }
-    return render(request, 'clients/client_detail.html', context)
+    date = models.DateField()
+    status = models.CharField(max_length=20, choices=Project.STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+    value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    class Meta:
+        ordering = ['-date', 'status']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'status'], name='pipeline_snapshot_day_status_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.status}: {self.count}"
 
-@login_required
-def client_create(request):
-    if request.method == 'POST':
-        form = ClientForm(request.POST)
-        if form.is_valid():
-            client = form.save()
-            messages.success(request, f'Client {client.full_name} created successfully!')
-            return redirect('client_detail', pk=client.pk)
-    else:
-        form = ClientForm()
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def refresh_revenue_rollup(sender, instance, using, **kwargs):
+    from .tasks import refresh_revenue
     
-    return render(request, 'clients/client_form.html', {'form': form, 'title': 'Add New Client'})
+    previous = getattr(instance, '_saved_revenue_bucket', None)
+    current = None if kwargs.get('signal') is post_delete else instance.revenue_bucket()
+    buckets = {bucket for bucket in (previous, current) if bucket}
+    if buckets:
+        # Recomputed by a worker once this transaction commits
+        refresh_revenue.enqueue(
+            sorted((month.isoformat(), project_type) for month, project_type in buckets), using=using
+        )
+    instance._saved_revenue_bucket = current
 
-# projects/views.py
-from django.shortcuts import render, get_object_or_404, redirect
-from django.contrib.auth.decorators import login_required
-from django.contrib import messages
-from django.db.models import Q
+# jobs/models.py
+from django.db import models
 from django.utils import timezone
-from .models import Project
-from .forms import ProjectForm
 
-@login_required
-def project_list(request):
-    projects = Project.objects.select_related('client').all()
+class Job(models.Model):
+    """A unit of background work, claimed by run_workers with SKIP LOCKED"""
     
-    # Status filter
-    status = request.GET.get('status')
-    if status:
-        projects = projects.filter(status=status)
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
     
-    # Priority filter
-    priority = request.GET.get('priority')
-    if priority:
-        projects = projects.filter(priority=priority)
+    # Dotted path of a function decorated with jobs.queue.task
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
     
-    # Overdue projects
-    show_overdue = request.GET.get('overdue')
-    if show_overdue:
-        projects = projects.filter(
-            deadline__lt=timezone.now(),
-            status__in=['quoted', 'approved', 'in_progress', 'review']
-        )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    last_error = models.TextField(blank=True)
     
-    context = {
-        'projects': projects,
+    # Scheduling and locking
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    
+    # Timing
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The claim query: next due queued jobs, or expired running ones
+            models.Index(fields=['run_at'], name='job_queued_run_at_idx', condition=models.Q(status='queued')),
+            models.Index(fields=['locked_at'], name='job_running_locked_at_idx', condition=models.Q(status='running')),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+    
+    @property
+    def wait_ms(self):
+        """Time spent queued before the last attempt started"""
+        if not self.started_at:
+            return None
+        return int((self.started_at - self.created_at).total_seconds() * 1000)
+
+# clients/aggregates.py
+from django.db import connections
+from django.db.models import F
+from .models import Client
+
+# Set-based recompute of the denormalized Client aggregates. Plain SQL so it
+# runs as a single UPDATE ... FROM on PostgreSQL and SQLite >= 3.33, and so
+# projects.models can use it without a circular import.
+RECOMPUTE_SQL = """
+    UPDATE clients_client
+    SET project_count = agg.project_count,
+        total_value = agg.total_value,
+        lifetime_value = agg.lifetime_value
+    FROM (
+        SELECT c.id AS client_id,
+               COUNT(p.id) AS project_count,
+               COALESCE(SUM(p.final_amount), 0) AS total_value,
+               COALESCE(SUM(CASE WHEN p.status = 'completed' THEN p.final_amount END), 0) AS lifetime_value
+        FROM clients_client c
+        LEFT JOIN projects_project p ON p.client_id = c.id
+        {where}
+        GROUP BY c.id
+    ) AS agg
+    WHERE clients_client.id = agg.client_id
+      AND (clients_client.project_count <> agg.project_count
+           OR clients_client.total_value <> agg.total_value
+           OR clients_client.lifetime_value <> agg.lifetime_value)
+"""
+
+def apply_client_delta(client_id, count, value, lifetime_value, using='default'):
+    """Shift one client's aggregates by a project's contribution"""
+    if not client_id or not (count or value or lifetime_value):
+        return
+    Client.objects.using(using).filter(pk=client_id).update(
+        project_count=F('project_count') + count,
+        total_value=F('total_value') + value,
+        lifetime_value=F('lifetime_value') + lifetime_value,
+    )
+
+def recompute_clients(client_ids=None, using='default'):
+    """
+    Recompute aggregates from the projects table, for the given clients or
+    for every client when client_ids is None. Returns the number of rows
+    that were out of date.
+    """
+    params = []
+    where = ''
+    if client_ids is not None:
+        client_ids = [pk for pk in client_ids if pk]
+        if not client_ids:
+            return 0
+        where = 'WHERE c.id IN ({})'.format(', '.join(['%s'] * len(client_ids)))
+        params = client_ids
+    with connections[using].cursor() as cursor:
+        cursor.execute(RECOMPUTE_SQL.format(where=where), params)
+        return cursor.rowcount
+
+# reports/rollups.py
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+from projects.models import Project
+from .models import MonthlyRevenue, PipelineSnapshot
+
+# Statuses counted as "reached the quote stage" for conversion rates
+QUOTED_STATUSES = ['quoted', 'approved', 'in_progress', 'completed']
+
+def month_bounds(month):
+    """Aware [start, end) datetimes for the month beginning on `month`"""
+    next_month = (month + timedelta(days=32)).replace(day=1)
+    return (
+        timezone.make_aware(datetime.combine(month, time.min)),
+        timezone.make_aware(datetime.combine(next_month, time.min)),
+    )
+
+def refresh_revenue_buckets(buckets, using='default'):
+    """Recompute the given (month, project_type) rows from the projects table"""
+    for month, project_type in buckets:
+        start, end = month_bounds(month)
+        totals = Project.objects.using(using).filter(
+            status='completed',
+            project_type=project_type,
+            completed_at__gte=start,
+            completed_at__lt=end,
+        ).aggregate(
+            revenue=Coalesce(Sum('final_amount'), Decimal(0)),
+            completed_count=Count('id'),
+            valued_count=Count('final_amount'),
+        )
+        rows = MonthlyRevenue.objects.using(using).filter(month=month, project_type=project_type)
+        if not totals['completed_count']:
+            rows.delete()
+        elif not rows.update(**totals):
+            MonthlyRevenue.objects.using(using).bulk_create(
+                [MonthlyRevenue(month=month, project_type=project_type, **totals)],
+                update_conflicts=True,
+                unique_fields=['month', 'project_type'],
+                update_fields=['revenue', 'completed_count', 'valued_count'],
+            )
+
+def rebuild_revenue_rollup(since=None, using='default'):
+    """
+    Replace the rollup (from `since`, a first-of-month date, onwards) with a
+    single TruncMonth GROUP BY pass over completed projects.
+    """
+    projects = Project.objects.using(using).filter(status='completed', completed_at__isnull=False)
+    existing = MonthlyRevenue.objects.using(using).all()
+    if since:
+        projects = projects.filter(completed_at__gte=month_bounds(since)[0])
+        existing = existing.filter(month__gte=since)
+    
+    buckets = projects.order_by().annotate(
+        month=TruncMonth('completed_at', output_field=DateField())
+    ).values('month', 'project_type').annotate(
+        revenue=Coalesce(Sum('final_amount'), Decimal(0)),
+        completed_count=Count('id'),
+        valued_count=Count('final_amount'),
+    )
+    
+    with transaction.atomic(using=using):
+        existing.delete()
+        created = MonthlyRevenue.objects.using(using).bulk_create(
+            [MonthlyRevenue(**bucket) for bucket in buckets],
+            batch_size=1000,
+        )
+    return len(created)
+
+def pipeline_stage_totals(using=None):
+    """{status: {'count', 'value'}} for every pipeline stage, in one GROUP BY"""
+    totals = {status: {'count': 0, 'value': Decimal(0)} for status, label in Project.STATUS_CHOICES}
+    rows = Project.objects.using(using).order_by().values('status').annotate(
+        count=Count('id'),
+        value=Coalesce(Sum('quoted_amount'), Decimal(0)),
+    )
+    for row in rows:
+        totals[row['status']] = {'count': row['count'], 'value': row['value']}
+    return totals
+
+def conversion_rates(counts):
+    """Funnel conversion percentages from a {status: count} mapping"""
+    inquiries = counts.get('inquiry', 0)
+    quotes = sum(counts.get(status, 0) for status in QUOTED_STATUSES)
+    completed = counts.get('completed', 0)
+    return {
+        'inquiry_to_quote': (quotes / inquiries * 100) if inquiries else 0,
+        'quote_to_completion': (completed / quotes * 100) if quotes else 0,
+        'overall_conversion': (completed / inquiries * 100) if inquiries else 0
+    }
+
+def take_pipeline_snapshot(date=None, using='default'):
+    """Write (or overwrite) the snapshot rows for `date`, default today"""
+    date = date or timezone.localdate()
+    snapshots = [
+        PipelineSnapshot(date=date, status=status, **totals)
+        for status, totals in pipeline_stage_totals(using=using).items()
+    ]
+    PipelineSnapshot.objects.using(using).bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=['date', 'status'],
+        update_fields=['count', 'value'],
+    )
+    return snapshots
+
+# ===== MIGRATIONS =====
+# Each app's chain is hand-written and kept in step with its models:
+# 0001_initial creates the tables as they first shipped and every later
+# change adds its own migration, with a data backfill where existing rows
+# need one. 0002_search also carries what makemigrations can't express
+# (pg_trgm, GIN indexes, triggers).
+
+# clients/migrations/0001_initial.py
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+    initial = True
+    
+    dependencies = []
+    
+    operations = [
+        migrations.CreateModel(
+            name='Client',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('phone', models.CharField(blank=True, max_length=20)),
+                ('institution', models.CharField(blank=True, max_length=200)),
+                ('department', models.CharField(blank=True, max_length=200)),
+                ('title', models.CharField(blank=True, help_text='e.g., PhD Candidate, Professor, etc.', max_length=100)),
+                ('field_of_study', models.CharField(blank=True, max_length=200)),
+                ('status', models.CharField(choices=[('lead', 'Lead'), ('contacted', 'Contacted'), ('active', 'Active Client'), ('completed', 'Completed Projects'), ('inactive', 'Inactive')], default='lead', max_length=20)),
+                ('lead_source', models.CharField(choices=[('website', 'Website Form'), ('referral', 'Referral'), ('twitter', 'Twitter/X'), ('bluesky', 'Bluesky'), ('conference', 'Conference'), ('email', 'Direct Email'), ('other', 'Other')], default='website', max_length=20)),
+                ('lifetime_value', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('last_contact', models.DateTimeField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True, help_text='Internal notes about this client')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
+
+# clients/migrations/0002_search.py
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVectorField
+from django.db import migrations
+
+FORWARD_SQL = [
+    # Over the UPPER(col::text) expressions Django compiles icontains to, so
+    # the substring lookups in latex_services/search.py can use it
+    """
+    CREATE INDEX IF NOT EXISTS client_search_trgm_idx ON clients_client
+    USING gin (UPPER(first_name::text) gin_trgm_ops, UPPER(last_name::text) gin_trgm_ops,
+               UPPER(email::text) gin_trgm_ops, UPPER(institution::text) gin_trgm_ops)
+    """,
+    "CREATE INDEX IF NOT EXISTS client_search_vector_idx ON clients_client USING gin (search_vector)",
+    """
+    CREATE OR REPLACE FUNCTION clients_client_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.first_name, '') || ' ' || coalesce(NEW.last_name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.email, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.institution, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER client_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF first_name, last_name, email, institution ON clients_client
+    FOR EACH ROW EXECUTE FUNCTION clients_client_search_vector_update()
+    """,
+    # Backfill existing rows through the trigger
+    "UPDATE clients_client SET first_name = first_name",
+]
+
+REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS client_search_vector_trigger ON clients_client",
+    "DROP FUNCTION IF EXISTS clients_client_search_vector_update()",
+    "DROP INDEX IF EXISTS client_search_vector_idx",
+    "DROP INDEX IF EXISTS client_search_trgm_idx",
+]
+
+def run_postgres_sql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('clients', '0001_initial'),
+    ]
+    
+    operations = [
+        # A no-op outside PostgreSQL
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='client',
+            name='search_vector',
+            field=SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(run_postgres_sql(FORWARD_SQL), run_postgres_sql(REVERSE_SQL)),
+    ]
+
+# clients/migrations/0003_created_id_index.py
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('clients', '0002_search'),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['-created_at', '-id'], name='client_created_id_idx'),
+        ),
+    ]
+
+# clients/migrations/0004_client_aggregates.py
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+def backfill(apps, schema_editor):
+    # The sums clients.aggregates.recompute_clients keeps, over the historical models
+    alias = schema_editor.connection.alias
+    Client = apps.get_model('clients', 'Client')
+    Project = apps.get_model('projects', 'Project')
+    
+    def per_client(aggregate, output_field, **filters):
+        rows = Project.objects.using(alias).filter(client=models.OuterRef('pk'), **filters)
+        value = rows.order_by().values('client').annotate(value=aggregate).values('value')
+        return Coalesce(models.Subquery(value), models.Value(0), output_field=output_field)
+    
+    Client.objects.using(alias).update(
+        project_count=per_client(models.Count('pk'), models.PositiveIntegerField()),
+        total_value=per_client(
+            models.Sum('final_amount'), models.DecimalField(max_digits=12, decimal_places=2)
+        ),
+        lifetime_value=per_client(
+            models.Sum('final_amount'), models.DecimalField(max_digits=10, decimal_places=2),
+            status='completed',
+        ),
+    )
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('clients', '0003_created_id_index'),
+        ('projects', '0003_created_id_index'),
+    ]
+    
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='project_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='total_value',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12),
+        ),
+        migrations.AlterField(
+            model_name='client',
+            name='lifetime_value',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['-total_value'], name='client_total_value_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
+
+# clients/migrations/0005_index_pack.py
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('clients', '0004_client_aggregates'),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['status', 'last_contact', 'created_at'], name='client_status_contact_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['lead_source'], name='client_lead_source_idx'),
+        ),
+    ]
+
+# projects/migrations/0001_initial.py
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+class Migration(migrations.Migration):
+    initial = True
+    
+    dependencies = [
+        ('clients', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='Project',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('project_type', models.CharField(choices=[('quick_fix', 'Quick Fix ($200)'), ('standard_conversion', 'Standard Conversion ($400-600)'), ('premium_workflow', 'Premium Workflow ($800-1200)'), ('custom', 'Custom Project')], max_length=30)),
+                ('description', models.TextField()),
+                ('status', models.CharField(choices=[('inquiry', 'Initial Inquiry'), ('quoted', 'Quote Sent'), ('approved', 'Quote Approved'), ('in_progress', 'In Progress'), ('review', 'Client Review'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], default='inquiry', max_length=20)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('normal', 'Normal'), ('high', 'High'), ('urgent', 'Urgent')], default='normal', max_length=10)),
+                ('quoted_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('final_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('paid', models.BooleanField(default=False)),
+                ('deadline', models.DateTimeField(blank=True, null=True)),
+                ('estimated_hours', models.DecimalField(blank=True, decimal_places=1, max_digits=5, null=True)),
+                ('actual_hours', models.DecimalField(blank=True, decimal_places=1, max_digits=5, null=True)),
+                ('source_format', models.CharField(blank=True, help_text='e.g., Word, LaTeX, Markdown', max_length=50)),
+                ('target_journal', models.CharField(blank=True, max_length=200)),
+                ('special_requirements', models.TextField(blank=True)),
+                ('github_repo', models.URLField(blank=True)),
+                ('overleaf_project', models.URLField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='projects', to='clients.client')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_type', models.CharField(choices=[('source', 'Source Document'), ('output', 'LaTeX Output'), ('reference', 'Reference Material'), ('revision', 'Revision')], max_length=20)),
+                ('file', models.FileField(upload_to='project_files/%Y/%m/')),
+                ('filename', models.CharField(max_length=255)),
+                ('description', models.CharField(blank=True, max_length=500)),
+                ('version', models.CharField(blank=True, max_length=20)),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='files', to='projects.project')),
+                ('uploaded_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-uploaded_at'],
+            },
+        ),
+    ]
+
+# projects/migrations/0002_search.py
+from django.contrib.postgres.search import SearchVectorField
+from django.db import migrations
+
+FORWARD_SQL = [
+    # Matches icontains' UPPER(title::text), see clients/migrations/0002_search.py
+    "CREATE INDEX IF NOT EXISTS project_title_trgm_idx ON projects_project USING gin (UPPER(title::text) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS project_search_vector_idx ON projects_project USING gin (search_vector)",
+    """
+    CREATE OR REPLACE FUNCTION projects_project_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.target_journal, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER project_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, target_journal, description ON projects_project
+    FOR EACH ROW EXECUTE FUNCTION projects_project_search_vector_update()
+    """,
+    "UPDATE projects_project SET title = title",
+]
+
+REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS project_search_vector_trigger ON projects_project",
+    "DROP FUNCTION IF EXISTS projects_project_search_vector_update()",
+    "DROP INDEX IF EXISTS project_search_vector_idx",
+    "DROP INDEX IF EXISTS project_title_trgm_idx",
+]
+
+def run_postgres_sql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('projects', '0001_initial'),
+        # pg_trgm is created there
+        ('clients', '0002_search'),
+    ]
+    
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(run_postgres_sql(FORWARD_SQL), run_postgres_sql(REVERSE_SQL)),
+    ]
+
+# projects/migrations/0003_created_id_index.py
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('projects', '0002_search'),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_at', '-id'], name='project_created_id_idx'),
+        ),
+    ]
+
+# projects/migrations/0004_fileupload.py
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('projects', '0003_created_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='FileUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('file_type', models.CharField(choices=[('source', 'Source Document'), ('output', 'LaTeX Output'), ('reference', 'Reference Material'), ('revision', 'Revision')], max_length=20)),
+                ('description', models.CharField(blank=True, max_length=500)),
+                ('version', models.CharField(blank=True, max_length=20)),
+                ('size', models.PositiveBigIntegerField()),
+                ('received', models.PositiveBigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('complete', 'Complete')], default='open', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='projects.project')),
+                ('project_file', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='projects.projectfile')),
+                ('uploaded_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
+
+# projects/migrations/0005_blob_storage.py
+from django.db import migrations, models
+import projects.storage
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('projects', '0004_fileupload'),
+    ]
+    
+    operations = [
+        # Existing rows keep their project_files/... names, which still
+        # resolve under MEDIA_ROOT; only new files go to the blob store
+        migrations.AlterField(
+            model_name='projectfile',
+            name='file',
+            field=models.FileField(db_index=True, max_length=255, storage=projects.storage.ContentAddressedStorage(), upload_to=''),
+        ),
+    ]
+
+# projects/migrations/0006_filepreview.py
+from django.db import migrations, models
+import django.utils.timezone
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('projects', '0005_blob_storage'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='FilePreview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('pages', models.PositiveSmallIntegerField(default=0)),
+                ('bytes', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_accessed', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
+
+# projects/migrations/0007_active_deadline_index.py
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('projects', '0006_filepreview'),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(
+                condition=models.Q(('status__in', ['quoted', 'approved', 'in_progress', 'review'])),
+                fields=['deadline'], name='project_active_deadline_idx',
+            ),
+        ),
+    ]
+
+# projects/migrations/0008_priority_rank.py
+from django.db import migrations, models
+import projects.models
+
+def backfill(apps, schema_editor):
+    from projects.models import PRIORITY_RANKS
+    Project = apps.get_model('projects', 'Project')
+    Project.objects.using(schema_editor.connection.alias).update(priority_rank=models.Case(
+        *[models.When(priority=priority, then=models.Value(rank)) for priority, rank in PRIORITY_RANKS.items()],
+        default=models.Value(PRIORITY_RANKS['normal']),
+    ))
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('projects', '0007_active_deadline_index'),
+    ]
+    
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='priority_rank',
+            field=projects.models.PriorityRankField(default=2, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(
+                condition=models.Q(('status__in', ['quoted', 'approved', 'in_progress', 'review'])),
+                fields=['-priority_rank', 'deadline', 'id'], name='project_work_queue_idx',
+            ),
+        ),
+    ]
+
+# projects/migrations/0009_index_pack.py
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('projects', '0008_priority_rank'),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='project_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'completed_at'], name='project_status_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'updated_at'], name='project_status_updated_idx'),
+        ),
+    ]
+
+# projects/migrations/0010_upload_digest.py
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('projects', '0009_index_pack'),
+    ]
+    
+    operations = [
+        # Left blank for uploads already open: their next chunk rebuilds it
+        # from the part file (projects/uploads.py)
+        migrations.AddField(
+            model_name='fileupload',
+            name='digest',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
+
+# communications/migrations/0001_initial.py
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+class Migration(migrations.Migration):
+    initial = True
+    
+    dependencies = [
+        ('clients', '0001_initial'),
+        ('projects', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='Communication',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('communication_type', models.CharField(choices=[('email', 'Email'), ('call', 'Phone Call'), ('meeting', 'Meeting'), ('note', 'Internal Note')], max_length=20)),
+                ('direction', models.CharField(choices=[('inbound', 'Inbound'), ('outbound', 'Outbound'), ('internal', 'Internal')], max_length=10)),
+                ('subject', models.CharField(max_length=200)),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='communications', to='clients.client')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='communications', to='projects.project')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
+
+# communications/migrations/0002_emaillog.py
+from django.db import migrations, models
+import django.db.models.deletion
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('clients', '0001_initial'),
+        ('projects', '0001_initial'),
+        ('communications', '0001_initial'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='EmailLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('lead_follow_up', 'Lead Follow-up'), ('quote_follow_up', 'Quote Follow-up')], max_length=30)),
+                ('dedupe_key', models.CharField(max_length=200)),
+                ('recipient', models.EmailField(max_length=254)),
+                ('subject', models.CharField(max_length=200)),
+                ('status', models.CharField(choices=[('sent', 'Sent'), ('failed', 'Failed')], max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='email_logs', to='clients.client')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='email_logs', to='projects.project')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'constraints': [
+                    models.UniqueConstraint(
+                        condition=models.Q(('status', 'sent')), fields=('dedupe_key',), name='email_log_sent_once'
+                    ),
+                ],
+            },
+        ),
+    ]
+
+# communications/migrations/0003_index_pack.py
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('communications', '0002_emaillog'),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='communication',
+            index=models.Index(fields=['client', '-created_at'], name='comm_client_created_idx'),
+        ),
+    ]
+
+# reports/migrations/0001_initial.py
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, TruncMonth
+
+PROJECT_TYPE_CHOICES = [
+    ('quick_fix', 'Quick Fix ($200)'),
+    ('standard_conversion', 'Standard Conversion ($400-600)'),
+    ('premium_workflow', 'Premium Workflow ($800-1200)'),
+    ('custom', 'Custom Project'),
+]
+
+def backfill(apps, schema_editor):
+    # Same buckets as reports.rollups.rebuild_revenue_rollup
+    alias = schema_editor.connection.alias
+    Project = apps.get_model('projects', 'Project')
+    MonthlyRevenue = apps.get_model('reports', 'MonthlyRevenue')
+    buckets = Project.objects.using(alias).filter(
+        status='completed', completed_at__isnull=False
+    ).order_by().annotate(
+        month=TruncMonth('completed_at', output_field=models.DateField())
+    ).values('month', 'project_type').annotate(
+        revenue=Coalesce(models.Sum('final_amount'), models.Value(0), output_field=models.DecimalField()),
+        completed_count=models.Count('id'),
+    )
+    MonthlyRevenue.objects.using(alias).bulk_create(
+        [MonthlyRevenue(**bucket) for bucket in buckets], batch_size=1000
+    )
+
+class Migration(migrations.Migration):
+    initial = True
+    
+    dependencies = [
+        ('projects', '0003_created_id_index'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyRevenue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month, in TIME_ZONE')),
+                ('project_type', models.CharField(choices=PROJECT_TYPE_CHOICES, max_length=30)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['month', 'project_type'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('month', 'project_type'), name='monthly_revenue_bucket_uniq'),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
+
+# reports/migrations/0002_valued_count.py
+from django.db import migrations, models
+from django.db.models.functions import TruncMonth
+
+def backfill(apps, schema_editor):
+    # Same buckets as reports.rollups.rebuild_revenue_rollup
+    alias = schema_editor.connection.alias
+    Project = apps.get_model('projects', 'Project')
+    MonthlyRevenue = apps.get_model('reports', 'MonthlyRevenue')
+    buckets = Project.objects.using(alias).filter(
+        status='completed', completed_at__isnull=False
+    ).order_by().annotate(
+        month=TruncMonth('completed_at', output_field=models.DateField())
+    ).values('month', 'project_type').annotate(valued_count=models.Count('final_amount'))
+    for bucket in buckets:
+        MonthlyRevenue.objects.using(alias).filter(
+            month=bucket['month'], project_type=bucket['project_type']
+        ).update(valued_count=bucket['valued_count'])
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('reports', '0001_initial'),
+        ('projects', '0001_initial'),
+    ]
+    
+    operations = [
+        migrations.AddField(
+            model_name='monthlyrevenue',
+            name='valued_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
+
+# reports/migrations/0003_pipelinesnapshot.py
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('reports', '0002_valued_count'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='PipelineSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('inquiry', 'Initial Inquiry'), ('quoted', 'Quote Sent'), ('approved', 'Quote Approved'), ('in_progress', 'In Progress'), ('review', 'Client Review'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('value', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'ordering': ['-date', 'status'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('date', 'status'), name='pipeline_snapshot_day_status_uniq'),
+                ],
+            },
+        ),
+    ]
+
+# jobs/migrations/0001_initial.py
+from django.db import migrations, models
+import django.utils.timezone
+
+class Migration(migrations.Migration):
+    initial = True
+    
+    dependencies = []
+    
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('args', models.JSONField(blank=True, default=list)),
+                ('kwargs', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=5)),
+                ('last_error', models.TextField(blank=True)),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('locked_by', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_ms', models.PositiveIntegerField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [
+                    models.Index(condition=models.Q(('status', 'queued')), fields=['run_at'], name='job_queued_run_at_idx'),
+                    models.Index(condition=models.Q(('status', 'running')), fields=['locked_at'], name='job_running_locked_at_idx'),
+                ],
+            },
+        ),
+    ]
+
+# ===== VIEWS =====
+
+# latex_services/urls.py
+from django.contrib import admin
+from django.urls import path, include
+from django.conf import settings
+from django.conf.urls.static import static
+from . import views
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('', views.dashboard, name='dashboard'),
+    path('dashboard/async/', views.dashboard_async, name='dashboard_async'),
+    path('dashboard/cache-stats/', views.dashboard_cache_stats, name='dashboard_cache_stats'),
+    path('debug/requests/', views.request_metrics, name='request_metrics'),
+    path('debug/db-pools/', views.db_pool_stats, name='db_pool_stats'),
+    path('clients/', include('clients.urls')),
+    path('projects/', include('projects.urls')),
+    path('communications/', include('communications.urls')),
+    path('reports/', include('reports.urls')),
+    path('api/', include('api.urls')),
+]
+
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+# latex_services/stats_cache.py
+import time
+from django.core.cache import cache
+
+# Bumped on every Client/Project write; cached stats are keyed on it, so a
+# write invalidates them immediately and a computation that raced a write
+# lands on a generation nobody reads any more. When evicted it is reseeded
+# from the clock, never restarted from 0, so it can't come back round to a
+# generation whose stats are still cached.
+GENERATION_KEY = 'dashboard:stats:generation'
+COUNTER_KEYS = {
+    'hits': 'dashboard:stats:hits',
+    'misses': 'dashboard:stats:misses',
+}
+
+def _incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key missing (first use or evicted)
+        cache.add(key, 0, timeout=None)
+        return cache.incr(key)
+
+def dashboard_stats_key(month_start):
+    generation = cache.get_or_set(GENERATION_KEY, time.time_ns, timeout=None)
+    return f'dashboard:stats:{generation}:{month_start:%Y-%m}'
+
+def invalidate_dashboard_stats():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # Evicted: a fresh seed is already a generation nobody has read
+        if not cache.add(GENERATION_KEY, time.time_ns(), timeout=None):
+            cache.incr(GENERATION_KEY)
+
+def record_lookup(hit):
+    _incr(COUNTER_KEYS['hits' if hit else 'misses'])
+
+def lookup_counters():
+    values = cache.get_many(COUNTER_KEYS.values())
+    counters = {name: values.get(key, 0) for name, key in COUNTER_KEYS.items()}
+    total = counters['hits'] + counters['misses']
+    counters['hit_rate'] = counters['hits'] / total if total else 0
+    counters['generation'] = cache.get(GENERATION_KEY, 0)
+    return counters
+
+# latex_services/clock.py
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils import timezone
+
+# One "now" per request, so every row, badge and filter agrees on the time
+_request_now = ContextVar('request_now', default=None)
+
+def now():
+    """The current request's timestamp, or the wall clock outside a request"""
+    return _request_now.get() or timezone.now()
+
+class RequestClockMiddleware:
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _request_now.set(timezone.now())
+        try:
+            return self.get_response(request)
+        finally:
+            _request_now.reset(token)
+    
+    async def __acall__(self, request):
+        token = _request_now.set(timezone.now())
+        try:
+            return await self.get_response(request)
+        finally:
+            _request_now.reset(token)
+
+# latex_services/replicas.py
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA = 'replica'
+
+# Set on a client's responses for REPLICA_PIN_SECONDS after it writes, so
+# its next pages read its own writes from the primary
+PIN_COOKIE = 'pin_primary'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+# Seconds of replay the replica is behind; 0 once it has replayed all it received
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+# Last lag check, shared by the process's threads
+_health = {'checked_at': None, 'healthy': False}
+_health_lock = threading.Lock()
+
+def replica_configured():
+    return REPLICA in settings.DATABASES and getattr(settings, 'REPLICA_READS', True)
+
+def is_pinned(request):
+    return request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Send ORM reads inside the block to the replica while it keeps up"""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+def read_from_replica(view):
+    """
+    Serve a read-only view (sync or async) from the replica, unless the
+    client wrote recently. Put it below the login decorator so session and
+    user lookups stay on the primary.
+    """
+    if asyncio.iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            with replica_reads(not is_pinned(request)):
+                return await view(request, *args, **kwargs)
+        return async_wrapper
+    
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with replica_reads(not is_pinned(request)):
+            return view(request, *args, **kwargs)
+    return wrapper
+
+class ReplicaChangelistMixin:
+    """ModelAdmin mixin serving changelist pages (not their POSTed actions) from the replica"""
+    
+    def changelist_view(self, request, extra_context=None):
+        with replica_reads(not is_pinned(request)):
+            response = super().changelist_view(request, extra_context)
+            # The results are read while rendering, so render inside the block
+            if hasattr(response, 'render'):
+                response.render()
+        return response
+
+def replica_lag():
+    """Seconds the replica is behind the primary, or None if it can't be reached"""
+    connection = connections[REPLICA]
+    if connection.vendor != 'postgresql':
+        # SQLite stand-ins have no replication to measure
+        return 0.0
+    # Not the request's query: keep it out of its metrics and query budget
+    wrappers, connection.execute_wrappers = connection.execute_wrappers, []
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_SQL)
+            return float(cursor.fetchone()[0] or 0)
+    except DatabaseError:
+        logger.warning('Replica lag check failed', exc_info=True)
+        return None
+    finally:
+        connection.execute_wrappers = wrappers
+
+def replica_healthy():
+    """Whether the replica is within REPLICA_MAX_LAG_SECONDS, rechecked every REPLICA_LAG_CHECK_INTERVAL"""
+    interval = getattr(settings, 'REPLICA_LAG_CHECK_INTERVAL', 5)
+    with _health_lock:
+        checked_at = _health['checked_at']
+        if checked_at is not None and time.monotonic() - checked_at < interval:
+            return _health['healthy']
+        # One thread checks; the others use the previous answer meanwhile
+        _health['checked_at'] = time.monotonic()
+    
+    lag = replica_lag()
+    healthy = lag is not None and lag <= getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 10)
+    if not healthy:
+        logger.warning(f'Replica unavailable or lagging ({lag}s), reading from the primary')
+    _health['healthy'] = healthy
+    return healthy
+
+class ReplicaRouter:
+    """
+    Reads inside replica_reads() go to the replica while it is healthy;
+    every other read and all writes go to the primary.
+    """
+    
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and replica_configured() and replica_healthy():
+            return REPLICA
+        return None
+    
+    def db_for_write(self, model, **hints):
+        # Whatever this request reads after a write must see it
+        _replica_reads.set(False)
+        return DEFAULT_DB_ALIAS
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema through replication
+        return db != REPLICA
+
+class ReplicaPinMiddleware:
+    """Pin a client to the primary for REPLICA_PIN_SECONDS after it writes"""
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.pin(request, self.get_response(request))
+    
+    async def __acall__(self, request):
+        return self.pin(request, await self.get_response(request))
+    
+    def pin(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400 and replica_configured():
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5),
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+# latex_services/query_shapes.py
+import logging
+import re
+import threading
+import traceback
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r'\bIN \([^()]*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+class NPlusOneDetected(AssertionError):
+    pass
+
+def query_shape(sql):
+    """SQL with literals and IN lists collapsed, so per-row lookups compare equal"""
+    sql = _LITERALS.sub('?', sql)
+    sql = _IN_LISTS.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+def app_stack(limit=8):
+    """The innermost frames from our own code, skipping Django and libraries"""
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(base_dir) and 'site-packages' not in frame.filename
+    ]
+    return ''.join(traceback.format_list(frames[-limit:]))
+
+class RepeatedQueryDetector:
+    """
+    Counts normalized query shapes. A shape that runs more than `threshold`
+    times is an offender; the stack is captured when it crosses the line.
+    """
+    
+    def __init__(self, threshold=None):
+        self.threshold = threshold or getattr(settings, 'NPLUSONE_THRESHOLD', 5)
+        self.counts = Counter()
+        self.stacks = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, sql):
+        shape = query_shape(sql)
+        with self._lock:
+            self.counts[shape] += 1
+            crossed = self.counts[shape] == self.threshold + 1
+        if crossed:
+            self.stacks[shape] = app_stack()
+    
+    def __call__(self, execute, sql, params, many, context):
+        # Standalone use as a connection.execute_wrapper()
+        self.observe(sql)
+        return execute(sql, params, many, context)
+    
+    def offenders(self):
+        return [
+            (shape, count, self.stacks.get(shape, ''))
+            for shape, count in self.counts.most_common() if count > self.threshold
+        ]
+    
+    def report(self, label, raise_errors=False):
+        """Raise NPlusOneDetected, or log a warning, if any shape repeated"""
+        offenders = self.offenders()
+        if not offenders:
+            return
+        message = '\n'.join(
+            f'{label}: same query ran {count} times (threshold {self.threshold}):\n'
+            f'    {shape}\n{stack}'
+            for shape, count, stack in offenders
+        )
+        if raise_errors:
+            raise NPlusOneDetected(message)
+        logger.warning(message)
+
+@contextmanager
+def detecting_repeated_queries(label, threshold=None, raise_errors=True):
+    """
+    Check a block of code outside the request cycle, e.g. in a test:
+
+        with detecting_repeated_queries('send_follow_up_emails'):
+            call_command('send_follow_up_emails', dry_run=True)
+    """
+    detector = RepeatedQueryDetector(threshold)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(detector))
+        yield detector
+    detector.report(label, raise_errors=raise_errors)
+
+# latex_services/query_plans.py
+import re
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+from clients.models import Client
+from projects.models import Project
+from communications.models import Communication
+from reports.rollups import month_bounds
+
+# Full table scans as each backend's EXPLAIN reports them
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (\w+)\s*$', re.MULTILINE),
+}
+
+def hot_queries():
+    """
+    (name, queryset, models that must not be scanned) for the hot filters,
+    in the shapes the views and commands run them.
+    """
+    now = timezone.now()
+    client_pk = Client.objects.order_by('-project_count').values_list('pk', flat=True).first()
+    # Last full month
+    month_start, month_end = month_bounds((now.date().replace(day=1) - timedelta(days=1)).replace(day=1))
+    return [
+        # project_list?status=
+        ('project_list?status',
+         Project.objects.filter(status='in_progress').order_by('-created_at', '-id')[:50], [Project]),
+        # refresh_revenue_buckets
+        ('revenue_month',
+         Project.objects.filter(status='completed', completed_at__gte=month_start, completed_at__lt=month_end),
+         [Project]),
+        # send_follow_up_emails
+        ('quote_follow_up',
+         Project.objects.filter(status='quoted', updated_at__lt=now - timedelta(days=7)), [Project]),
+        ('stale_leads',
+         Client.objects.filter(status='lead', created_at__lt=now - timedelta(days=3), last_contact__isnull=True),
+         [Client]),
+        # client_detail
+        ('client_communications',
+         Communication.objects.filter(client_id=client_pk).order_by('-created_at')[:5], [Communication]),
+        # The admin's lead_source filter, and the pipeline report's grouping
+        ('clients?lead_source',
+         Client.objects.filter(lead_source='bluesky').order_by('-created_at', '-id')[:100], [Client]),
+        ('lead_sources',
+         Client.objects.order_by().values('lead_source').annotate(count=Count('id')), [Client]),
+        # overdue queue and work queue
+        ('project_list?overdue', Project.objects.overdue(now), [Project]),
+        ('work_queue', Project.objects.work_queue().values_list('pk', flat=True)[:50], [Project]),
+    ]
+
+def seed_plan_data(projects, vacuum=False):
+    """
+    Top the database up to `projects` generated projects and refresh the
+    planner's statistics. VACUUM (which also gives PostgreSQL the visibility
+    map index-only scans need) can't run inside a transaction, so TestCase
+    callers get a plain ANALYZE. Returns how many projects were added.
+    """
+    missing = max(0, projects - Project.objects.count())
+    if missing:
+        call_command(
+            'generate_test_data', clients=max(1, missing // 5), projects=missing,
+            seed=projects, stdout=StringIO()
+        )
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM ANALYZE' if vacuum and connection.vendor == 'postgresql' else 'ANALYZE')
+    return missing
+
+def sequential_scans(queryset, models):
+    """(tables of `models` the plan scans in full, the plan itself)"""
+    plan = queryset.explain()
+    tables = {model._meta.db_table for model in models}
+    return sorted(tables & set(SEQ_SCAN_PATTERNS[connection.vendor].findall(plan))), plan
+
+# latex_services/instrumentation.py
+import logging
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends.django import Template as DjangoTemplate
+from django.utils import timezone
+from .query_shapes import RepeatedQueryDetector
+
+logger = logging.getLogger(__name__)
+
+# Recent requests, newest last. Per process: each worker keeps its own window.
+RECENT_REQUESTS = deque(maxlen=getattr(settings, 'REQUEST_METRICS_BUFFER', 500))
+_buffer_lock = threading.Lock()
+
+# Metrics recording in this context, innermost last: the request's, plus any
+# a caller wraps around it (run_benchmarks). Context variables follow the
+# request into sync_to_async and the query pool threads.
+_current = ContextVar('request_metrics', default=())
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+class RequestMetrics:
+    """Query count, DB time and render time for one request"""
+    
+    def __init__(self, detector=None):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.render_seconds = 0.0
+        # Optional RepeatedQueryDetector fed the same queries
+        self.detector = detector
+        # Async views run queries from several threads at once
+        self._lock = threading.Lock()
+    
+    def add_query(self, sql, seconds):
+        if self.detector is not None:
+            self.detector.observe(sql)
+        with self._lock:
+            self.queries += 1
+            self.db_seconds += seconds
+    
+    def add_render(self, seconds):
+        with self._lock:
+            self.render_seconds += seconds
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper on every connection, counting into whatever metrics the
+    calling context records into. Going by context rather than by thread
+    counts a request's queries wherever they run: in the request thread,
+    sync_to_async's thread under ASGI, or a query pool thread.
+    """
+    active = _current.get()
+    if not active:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        for metrics in active:
+            metrics.add_query(sql, elapsed)
+
+def _install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    _install_query_recorder(connection)
+
+@contextmanager
+def recording_queries(metrics=None):
+    """Count queries in this context into `metrics` too (default: just the current request's)"""
+    # Connections opened before this module was imported missed the signal
+    for connection in connections.all():
+        _install_query_recorder(connection)
+    active = _current.get()
+    token = _current.set(active + (metrics,) if metrics is not None else active)
+    try:
+        yield metrics if metrics is not None else (active[-1] if active else None)
+    finally:
+        _current.reset(token)
+
+def _timed_render(render):
+    @wraps(render)
+    def wrapper(self, *args, **kwargs):
+        active = _current.get()
+        started = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            for metrics in active:
+                metrics.add_render(time.perf_counter() - started)
+    wrapper.is_timed = True
+    return wrapper
+
+def _install_render_timer():
+    # render() and render_to_string() both go through the backend Template
+    if not getattr(DjangoTemplate.render, 'is_timed', False):
+        DjangoTemplate.render = _timed_render(DjangoTemplate.render)
+
+def check_budget(view_name, queries):
+    """Enforce settings.QUERY_BUDGETS: raise in strict mode (tests), else log"""
+    budget = getattr(settings, 'QUERY_BUDGETS', {}).get(view_name)
+    if budget is None or queries <= budget:
+        return
+    message = f'{view_name} ran {queries} queries, budget is {budget}'
+    if getattr(settings, 'QUERY_BUDGETS_STRICT', False):
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+class RequestMetricsMiddleware:
+    """
+    Record query count, DB time, template render time and total time per
+    resolved URL name. Listed first so session and auth queries count too.
+    Works under WSGI and ASGI; a streamed response is recorded once its
+    body has been sent, so queries made while streaming count as well.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        _install_render_timer()
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics(detector=self.repeated_query_detector())
+        started = time.perf_counter()
+        with recording_queries(metrics):
+            response = self.get_response(request)
+        return self.finish(request, response, metrics, started)
+    
+    async def __acall__(self, request):
+        metrics = RequestMetrics(detector=self.repeated_query_detector())
+        started = time.perf_counter()
+        with recording_queries(metrics):
+            response = await self.get_response(request)
+        return self.finish(request, response, metrics, started)
+    
+    def finish(self, request, response, metrics, started):
+        match = request.resolver_match
+        if match is None:
+            return response
+        if not response.streaming:
+            entry = self.record(match.view_name, request, response, metrics, started)
+            if settings.DEBUG:
+                response['X-Query-Count'] = str(metrics.queries)
+                response['Server-Timing'] = (
+                    f'db;dur={entry["db_ms"]}, render;dur={entry["render_ms"]}, total;dur={entry["total_ms"]}'
+                )
+            return response
+        
+        def done():
+            self.record(match.view_name, request, response, metrics, started)
+        if response.is_async:
+            response.streaming_content = self.async_stream(response.streaming_content, metrics, done)
+        else:
+            response.streaming_content = self.stream(response.streaming_content, metrics, done)
+        return response
+    
+    @staticmethod
+    def stream(content, metrics, done):
+        # The server iterates the body after this middleware has returned, so
+        # each step runs with the request's metrics current again
+        iterator = iter(content)
+        try:
+            while True:
+                with recording_queries(metrics):
+                    chunk = next(iterator, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            done()
+    
+    @staticmethod
+    async def async_stream(content, metrics, done):
+        iterator = content.__aiter__()
+        try:
+            while True:
+                with recording_queries(metrics):
+                    try:
+                        chunk = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        break
+                yield chunk
+        finally:
+            done()
+    
+    def record(self, view_name, request, response, metrics, started):
+        entry = {
+            'view': view_name,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_seconds * 1000, 1),
+            'render_ms': round(metrics.render_seconds * 1000, 1),
+            'total_ms': round((time.perf_counter() - started) * 1000, 1),
+            'at': timezone.now(),
+        }
+        with _buffer_lock:
+            RECENT_REQUESTS.append(entry)
+        
+        check_budget(view_name, metrics.queries)
+        if metrics.detector is not None:
+            metrics.detector.report(
+                view_name, raise_errors=getattr(settings, 'NPLUSONE_MODE', 'off') == 'raise'
+            )
+        return entry
+    
+    def repeated_query_detector(self):
+        # 'raise' checks every request (tests); 'log' a sample (production)
+        mode = getattr(settings, 'NPLUSONE_MODE', 'off')
+        if mode == 'raise' or (
+            mode == 'log' and random.random() < getattr(settings, 'NPLUSONE_SAMPLE_RATE', 0.05)
+        ):
+            return RepeatedQueryDetector()
+        return None
+
+def recent_requests():
+    with _buffer_lock:
+        return list(RECENT_REQUESTS)
+
+def summarize(entries):
+    """Per-view request count, query and timing stats, worst p95 first"""
+    by_view = defaultdict(list)
+    for entry in entries:
+        by_view[entry['view']].append(entry)
+    
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    summary = []
+    for view, rows in by_view.items():
+        queries = [row['queries'] for row in rows]
+        totals = sorted(row['total_ms'] for row in rows)
+        summary.append({
+            'view': view,
+            'requests': len(rows),
+            'avg_queries': sum(queries) / len(rows),
+            'max_queries': max(queries),
+            'budget': budgets.get(view),
+            'avg_db_ms': sum(row['db_ms'] for row in rows) / len(rows),
+            'avg_render_ms': sum(row['render_ms'] for row in rows) / len(rows),
+            'p50_ms': totals[len(totals) // 2],
+            'p95_ms': totals[min(len(totals) - 1, int(len(totals) * 0.95))],
+        })
+    return sorted(summary, key=lambda row: row['p95_ms'], reverse=True)
+
+# latex_services/concurrency.py
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.db import close_old_connections
+from .clock import _request_now
+from .instrumentation import _current, recording_queries
+from .replicas import _replica_reads
+
+# Django's async ORM still funnels every query through one thread per request,
+# so independent queries go to this pool instead. Each worker thread holds its
+# own connection; the pool size caps the extra connections a process opens.
+QUERY_POOL = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'ASYNC_QUERY_WORKERS', 8), thread_name_prefix='query'
+)
+
+# Where a streamed page's shell is split; everything before it is sent first
+WIDGETS_MARKER = '<!-- widgets -->'
+
+# The request-scoped variables a pool thread runs with: its query metrics,
+# replica routing and clock. Copying the whole context would also carry
+# asgiref Locals across, Django's connections among them, so the pool thread
+# could end up on the request thread's DatabaseWrapper.
+CARRIED_VARS = (_current, _replica_reads, _request_now)
+
+def _request_context():
+    context = contextvars.Context()
+    for var in CARRIED_VARS:
+        context.run(var.set, var.get())
+    return context
+
+def _run_query(func):
+    close_old_connections()
+    try:
+        with recording_queries():
+            return func()
+    finally:
+        close_old_connections()
+
+async def run_query(func):
+    """
+    Run a zero-argument callable on the query pool. It must fully evaluate
+    what it returns (lists, dicts), not hand back a lazy queryset.
+    """
+    loop = asyncio.get_running_loop()
+    context = _request_context()
+    return await loop.run_in_executor(QUERY_POOL, context.run, _run_query, func)
+
+async def gather_queries(**calls):
+    """Run the named callables concurrently: await gather_queries(stats=get_stats)"""
+    results = await asyncio.gather(*(run_query(func) for func in calls.values()))
+    return dict(zip(calls, results))
+
+async def stream_widgets(shell, widgets):
+    """
+    Yield the page shell up to WIDGETS_MARKER, then each widget's HTML as it
+    finishes (in completion order), then the rest of the shell. `widgets`
+    maps a name to a coroutine returning HTML for the #widget-<name> slot.
+    """
+    head, _, tail = shell.partition(WIDGETS_MARKER)
+    yield head
+    
+    async def named(name, coroutine):
+        return name, await coroutine
+    
+    for next_done in asyncio.as_completed([named(name, coro) for name, coro in widgets.items()]):
+        name, html = await next_done
+        yield f'<template data-widget="{name}">{html}</template><script>fillWidget("{name}")</script>\n'
+    yield tail
+
+def async_login_required(view):
+    """login_required for async views (Django 4.2's decorator is sync-only)"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+# latex_services/fragments.py
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+
+# Placeholder in a cached row for a value that depends on the current time
+# (e.g. "3 days ago"), filled in after the row comes out of the cache
+LIVE_MARKER = '<!--live:{}-->'
+
+_template_versions = {}
+
+def _template_version(template):
+    # Editing a row template changes its key, so deploys never serve old markup
+    name = template.origin.name
+    if name not in _template_versions:
+        _template_versions[name] = hashlib.md5(template.template.source.encode()).hexdigest()[:8]
+    return _template_versions[name]
+
+def row_cache_key(template, obj, *parts):
+    version = ':'.join(str(part) for part in parts)
+    return (
+        f'row:{_template_version(template)}:{obj._meta.label_lower}:{obj.pk}:'
+        f'{obj.updated_at.timestamp()}:{version}'
+    )
+
+def render_rows(objects, template_name, context_name, key_parts=None, live=None):
+    """
+    Render `template_name` for each object, reusing HTML cached under
+    (model, pk, updated_at, *key_parts(obj)). All rows are fetched with one
+    get_many and misses are stored with one set_many. Rows render without
+    the request, so fragments are shared between users. `live(obj)` returns
+    {name: html} for the template's LIVE_MARKER placeholders.
+    """
+    template = get_template(template_name)
+    keys = [row_cache_key(template, obj, *(key_parts(obj) if key_parts else ())) for obj in objects]
+    cached = cache.get_many(keys)
+    
+    rows, misses = [], {}
+    for obj, key in zip(objects, keys):
+        html = cached.get(key)
+        if html is None:
+            html = misses[key] = template.render({context_name: obj})
+        if live:
+            for name, value in live(obj).items():
+                html = html.replace(LIVE_MARKER.format(name), conditional_escape(value))
+        rows.append(mark_safe(html))
+    
+    if misses:
+        cache.set_many(misses, timeout=getattr(settings, 'ROW_CACHE_TIMEOUT', 86400))
+    return rows
+
+# latex_services/pagination.py
+import base64
+import json
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset plus its next/prev cursor tokens"""
+    
+    def __init__(self, object_list, next_cursor=None, prev_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+    
+    def __iter__(self):
+        return iter(self.object_list)
+    
+    def __len__(self):
+        return len(self.object_list)
+    
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+    
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+# Larger numbers fail in the database (bigint) instead of matching nothing
+CURSOR_INT_MAX = 2 ** 63 - 1
+
+def _encode(values):
+    payload = json.dumps(values)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def _decode(token):
+    padded = token + '=' * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+def encode_cursor(obj, direction):
+    return _encode([obj.created_at.isoformat(), obj.pk, direction])
+
+def decode_cursor(token):
+    """Return (created_at, pk, direction) or None for a missing/garbled token"""
+    if not token:
+        return None
+    try:
+        created_at, pk, direction = _decode(token)
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (ValueError, TypeError, OverflowError):
+        return None
+    if created_at is None or direction not in ('next', 'prev') or abs(pk) > CURSOR_INT_MAX:
+        return None
+    return created_at, pk, direction
+
+def encode_queue_cursor(project):
+    """The work queue position just after `project` (ProjectQuerySet.work_queue)"""
+    deadline = project.deadline.isoformat() if project.deadline else None
+    return _encode([project.priority_rank, deadline, project.pk])
+
+def decode_queue_cursor(token):
+    """Return (priority_rank, deadline or None, pk) or None for a missing/garbled token"""
+    if not token:
+        return None
+    try:
+        rank, deadline, pk = _decode(token)
+        rank, pk = int(rank), int(pk)
+        if deadline is not None:
+            deadline = parse_datetime(deadline)
+            if deadline is None:
+                return None
+    except (ValueError, TypeError, OverflowError):
+        return None
+    if max(abs(rank), abs(pk)) > CURSOR_INT_MAX:
+        return None
+    return rank, deadline, pk
+
+def paginate_keyset(queryset, cursor, per_page=None):
+    """
+    Slice a queryset ordered by (-created_at, -id) using the row at the
+    cursor as the boundary, so the database reads one page off the index
+    instead of counting and offsetting through the whole table.
+    """
+    per_page = per_page or getattr(settings, 'LIST_PAGE_SIZE', 50)
+    position = decode_cursor(cursor)
+    
+    if position is None:
+        rows = list(queryset.order_by('-created_at', '-id')[:per_page + 1])
+        has_more, rows = len(rows) > per_page, rows[:per_page]
+        next_cursor = encode_cursor(rows[-1], 'next') if has_more else None
+        return KeysetPage(rows, next_cursor=next_cursor)
+    
+    created_at, pk, direction = position
+    if direction == 'next':
+        rows = list(queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        ).order_by('-created_at', '-id')[:per_page + 1])
+        has_more, rows = len(rows) > per_page, rows[:per_page]
+        return KeysetPage(
+            rows,
+            next_cursor=encode_cursor(rows[-1], 'next') if has_more else None,
+            prev_cursor=encode_cursor(rows[0], 'prev') if rows else None,
+        )
+    
+    # Walking backwards: read ascending from the boundary, then flip
+    rows = list(queryset.filter(
+        Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+    ).order_by('created_at', 'id')[:per_page + 1])
+    has_more, rows = len(rows) > per_page, rows[:per_page][::-1]
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor(rows[-1], 'next') if rows else None,
+        prev_cursor=encode_cursor(rows[0], 'prev') if has_more else None,
+    )
+
+def cursor_querystring(request, cursor):
+    """Current GET filters with the cursor swapped in, for next/prev links"""
+    params = request.GET.copy()
+    params['cursor'] = cursor
+    return params.urlencode()
+
+# latex_services/search.py
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Func, IntegerField, Q, Value
+from clients.models import Client
+
+# Text search configs must match the ones used by the tsvector triggers in
+# clients/migrations/0002_search.py and projects/migrations/0002_search.py
+CLIENT_SEARCH_CONFIG = 'simple'
+PROJECT_SEARCH_CONFIG = 'english'
+
+def _uses_postgres(queryset):
+    return connections[queryset.db].vendor == 'postgresql'
+
+def search_clients(queryset, term, ranked=False):
+    """
+    Filter clients by name, email or institution.
+
+    On PostgreSQL the stored search_vector answers whole-word matches and the
+    pg_trgm GIN index over UPPER(col) answers the icontains substring matches,
+    combined with a BitmapOr; on SQLite (tests) this is plain icontains.
+    """
+    substring = client_substring(term)
+    if not _uses_postgres(queryset):
+        queryset = queryset.filter(substring)
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())) if ranked else queryset
+    
+    query = SearchQuery(term, config=CLIENT_SEARCH_CONFIG, search_type='websearch')
+    queryset = queryset.filter(Q(search_vector=query) | substring)
+    if ranked:
+        queryset = queryset.annotate(search_rank=SearchRank(F('search_vector'), query))
+    return queryset
+
+def client_substring(term):
+    return (
+        Q(first_name__icontains=term) |
+        Q(last_name__icontains=term) |
+        Q(email__icontains=term) |
+        Q(institution__icontains=term)
+    )
+
+def search_projects(queryset, term, ranked=False):
+    """Filter projects by title, description or client name (see search_clients)"""
+    if not _uses_postgres(queryset):
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(description__icontains=term) |
+            Q(client__first_name__icontains=term) | Q(client__last_name__icontains=term)
+        )
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())) if ranked else queryset
+    
+    # A join ORed into the WHERE clause forces a scan of both tables. Instead
+    # the matching client ids are collected once (an InitPlan using the client
+    # trigram index) and compared with client_id = ANY(...), which the
+    # client_id index answers inside the same BitmapOr as the title and
+    # tsvector indexes. description is only matched through the tsvector: a
+    # trigram index over free text is large and word matches are what people
+    # search it for.
+    client_ids = ArraySubquery(
+        Client.objects.filter(Q(first_name__icontains=term) | Q(last_name__icontains=term)).values('id')
+    )
+    query = SearchQuery(term, config=PROJECT_SEARCH_CONFIG, search_type='websearch')
+    queryset = queryset.filter(
+        Q(search_vector=query) |
+        Q(title__icontains=term) |
+        Q(client_id=Func(client_ids, function='ANY', output_field=IntegerField()))
+    )
+    if ranked:
+        queryset = queryset.annotate(search_rank=SearchRank(F('search_vector'), query))
+    return queryset
+
+# clients/views.py
+from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.db.models import Q, Sum, Count
+from django.utils import timezone
+from django.utils.timesince import timesince
+from latex_services.fragments import render_rows
+from latex_services.pagination import paginate_keyset, cursor_querystring
+from latex_services.search import search_clients
+from .models import Client
+from .forms import ClientForm
+from projects.models import Project
+
+@login_required
+def client_list(request):
+    clients = Client.objects.all()
+    
+    # Search functionality
+    search = request.GET.get('search')
+    if search:
+        clients = search_clients(clients, search)
+    
+    # Status filter
+    status = request.GET.get('status')
+    if status:
+        clients = clients.filter(status=status)
+    
+    page = paginate_keyset(clients, request.GET.get('cursor'))
+    
+    context = {
+        'clients': page,
+        'rows': render_rows(
+            page, 'clients/_client_row.html', 'client',
+            # Stored aggregates change without touching updated_at
+            key_parts=lambda client: (client.project_count, client.total_value),
+            live=lambda client: {'last_contact': last_contact_display(client)},
+        ),
+        'page': page,
+        'next_query': cursor_querystring(request, page.next_cursor) if page.has_next else None,
+        'prev_query': cursor_querystring(request, page.prev_cursor) if page.has_previous else None,
+        'search': search,
+        'status': status,
+        'status_choices': Client.STATUS_CHOICES,
+    }
+    return render(request, 'clients/client_list.html', context)
+
+def last_contact_display(client):
+    if not client.last_contact:
+        return 'Never'
+    return f'{timesince(client.last_contact)} ago'
+
+@login_required
+def client_detail(request, pk):
+    client = get_object_or_404(Client, pk=pk)
+    projects = client.projects.all()
+    recent_communications = client.communications.all()[:5]
+    
+    context = {
+        'client': client,
+        'projects': projects,
+        'recent_communications': recent_communications,
+    }
+    return render(request, 'clients/client_detail.html', context)
+
+@login_required
+def client_create(request):
+    if request.method == 'POST':
+        form = ClientForm(request.POST)
+        if form.is_valid():
+            client = form.save()
+            messages.success(request, f'Client {client.full_name} created successfully!')
+            return redirect('client_detail', pk=client.pk)
+    else:
+        form = ClientForm()
+    
+    return render(request, 'clients/client_form.html', {'form': form, 'title': 'Add New Client'})
+
+# clients/tests.py
+from decimal import Decimal
+from django.test import TestCase
+from projects.models import Project
+from .aggregates import recompute_clients
+from .models import Client
+
+class ClientAggregateTests(TestCase):
+    """The stored aggregates follow projects through every write path"""
+    
+    def setUp(self):
+        self.ada = Client.objects.create(first_name='Ada', last_name='Lovelace', email='ada@example.edu')
+        self.grace = Client.objects.create(first_name='Grace', last_name='Hopper', email='grace@example.edu')
+        self.done = self.project(self.ada, status='completed', final_amount=Decimal('400.00'))
+        self.open = self.project(self.ada, status='in_progress', final_amount=Decimal('200.00'))
+    
+    def project(self, client, **fields):
+        return Project.objects.create(
+            client=client, title='Thesis conversion', project_type='standard_conversion', description='', **fields
+        )
+    
+    def assertAggregates(self, client, project_count, total_value, lifetime_value):
+        client.refresh_from_db()
+        self.assertEqual(
+            (client.project_count, client.total_value, client.lifetime_value),
+            (project_count, Decimal(total_value), Decimal(lifetime_value)),
+        )
+        # Nothing for a full recompute to correct
+        self.assertEqual(recompute_clients(), 0)
+    
+    def test_create(self):
+        self.assertAggregates(self.ada, 2, '600', '400')
+        self.assertAggregates(self.grace, 0, '0', '0')
+    
+    def test_move_to_another_client_with_save(self):
+        self.done.client = self.grace
+        self.done.save()
+        self.assertAggregates(self.ada, 1, '200', '0')
+        self.assertAggregates(self.grace, 1, '400', '400')
+    
+    def test_move_to_another_client_with_update(self):
+        Project.objects.filter(pk__in=[self.done.pk, self.open.pk]).update(client=self.grace)
+        self.assertAggregates(self.ada, 0, '0', '0')
+        self.assertAggregates(self.grace, 2, '600', '400')
+    
+    def test_status_and_amount_changes(self):
+        Project.objects.filter(pk=self.open.pk).update(status='completed')
+        self.assertAggregates(self.ada, 2, '600', '600')
+        self.done.final_amount = Decimal('450.00')
+        self.done.save(update_fields=['final_amount'])
+        self.assertAggregates(self.ada, 2, '650', '650')
+    
+    def test_save_of_other_fields_leaves_aggregates(self):
+        Project.objects.filter(pk=self.open.pk).update(priority='urgent')
+        self.open.title = 'Renamed'
+        self.open.save()
+        self.assertAggregates(self.ada, 2, '600', '400')
+    
+    def test_delete(self):
+        self.done.delete()
+        self.assertAggregates(self.ada, 1, '200', '0')
+        Project.objects.filter(client=self.ada).delete()
+        self.assertAggregates(self.ada, 0, '0', '0')
+
+# projects/uploads.py
+import fcntl
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from .models import FileUpload, ProjectFile
+from .storage import HASH_BLOCK_SIZE
+
+# Bytes moved from the request to disk at a time
+BLOCK_SIZE = 64 * 1024
+
+# Each open upload's running SHA-256 between its chunks, as
+# {upload id: (received, hash object)}. hashlib can't serialise its state,
+# so a chunk landing in another process rebuilds it from the part file once
+# and checks it against FileUpload.digest.
+RUNNING_DIGESTS_MAX = 256
+_running_digests = OrderedDict()
+_running_lock = threading.Lock()
+
+class UploadError(ValueError):
+    def __init__(self, message, upload, status=400):
+        super().__init__(message)
+        self.upload = upload
+        self.status = status
+
+def start_upload(project, user, filename, size, file_type, description='', version=''):
+    upload = FileUpload.objects.create(
+        project=project, uploaded_by=user, filename=filename, size=size,
+        file_type=file_type, description=description, version=version,
+    )
+    os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+    open(upload.part_path, 'wb').close()
+    return upload
+
+def check_chunk(upload, offset, length):
+    if upload.status != 'open':
+        raise UploadError('Upload is already complete', upload, status=409)
+    if offset != upload.received:
+        raise UploadError(f'Expected a chunk at offset {upload.received}', upload, status=409)
+    if offset + length > upload.size:
+        raise UploadError('Chunk runs past the declared size', upload)
+
+def running_digest(upload, part):
+    """A SHA-256 of the upload's first `received` bytes, ready to extend"""
+    with _running_lock:
+        cached = _running_digests.get(upload.pk)
+    if cached and cached[0] == upload.received:
+        return cached[1].copy()
+    
+    digest = hashlib.sha256()
+    part.seek(0)
+    remaining = upload.received
+    while remaining:
+        block = part.read(min(HASH_BLOCK_SIZE, remaining))
+        if not block:
+            break
+        digest.update(block)
+        remaining -= len(block)
+    # Uploads begun before the digest was recorded have none to check against
+    if remaining or (upload.digest and digest.hexdigest() != upload.digest):
+        raise UploadError('Received data no longer matches its digest; restart the upload', upload, status=409)
+    return digest
+
+def remember_digest(upload, digest):
+    with _running_lock:
+        _running_digests.pop(upload.pk, None)
+        if upload.status == 'open':
+            _running_digests[upload.pk] = (upload.received, digest)
+            while len(_running_digests) > RUNNING_DIGESTS_MAX:
+                _running_digests.popitem(last=False)
+
+def write_chunk(upload_id, offset, stream, length, checksum):
+    """
+    Write `length` bytes read from `stream` at `offset` and check them against
+    the hex SHA-256 `checksum`. Chunks must arrive in order; a bad chunk is
+    dropped so the client can resend it. The final chunk completes the upload.
+
+    The body goes straight into the part file, hashed on the way in for both
+    the chunk's checksum and the upload's running digest. Chunks of one
+    upload are serialised by a lock on the part file, so however slow the
+    client, the upload's row is only locked to record the chunk.
+    """
+    upload = FileUpload.objects.get(pk=upload_id)
+    # Fail fast, before reading a body that can't be used
+    check_chunk(upload, offset, length)
+    
+    with open(upload.part_path, 'r+b') as part:
+        try:
+            fcntl.flock(part, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadError('Another chunk of this upload is being written', upload, status=409)
+        # `received` only moves while the lock is held; recheck now that it is
+        upload.refresh_from_db()
+        check_chunk(upload, offset, length)
+        
+        digest = running_digest(upload, part)
+        chunk_digest = hashlib.sha256()
+        part.seek(offset)
+        part.truncate()
+        written = 0
+        while written < length:
+            block = stream.read(min(BLOCK_SIZE, length - written))
+            if not block:
+                break
+            chunk_digest.update(block)
+            digest.update(block)
+            part.write(block)
+            written += len(block)
+        if written != length or chunk_digest.hexdigest() != checksum.strip().lower():
+            part.truncate(offset)
+            raise UploadError('Chunk was incomplete or failed its checksum', upload)
+        part.flush()
+        
+        with transaction.atomic():
+            upload = FileUpload.objects.select_for_update().get(pk=upload_id)
+            upload.received = offset + length
+            upload.digest = digest.hexdigest()
+            upload.save(update_fields=['received', 'digest', 'updated_at'])
+            if upload.received == upload.size:
+                complete_upload(upload)
+        remember_digest(upload, digest)
+    return upload
+
+def complete_upload(upload):
+    """
+    Create the upload's ProjectFile. The part file is only moved into place
+    once the transaction commits, so a rollback leaves it for a retry.
+    """
+    project_file = ProjectFile(
+        project_id=upload.project_id, uploaded_by_id=upload.uploaded_by_id,
+        file_type=upload.file_type, filename=upload.filename,
+        description=upload.description, version=upload.version,
+    )
+    field = project_file.file.field
+    storage = field.storage
+    if hasattr(storage, 'adopt'):
+        # Content-addressed: the name follows from the digest kept while the chunks came in
+        name = storage.blob_name(upload.digest)
+    else:
+        name = storage.get_available_name(field.generate_filename(project_file, upload.filename))
+    project_file.file.name = name
+    # Registered first, so the file is in place before anything the save queues
+    transaction.on_commit(lambda: place_part_file(upload, project_file))
+    
+    project_file.save()
+    upload.status = 'complete'
+    upload.project_file = project_file
+    upload.save(update_fields=['status', 'project_file', 'updated_at'])
+    return project_file
+
+def place_part_file(upload, project_file):
+    """Move a completed upload's part file to its ProjectFile's name"""
+    storage = project_file.file.storage
+    name = project_file.file.name
+    if hasattr(storage, 'adopt'):
+        # Renamed (or dropped as a duplicate) without hashing it again
+        storage.adopt(upload.part_path, upload.digest)
+        return
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        # Remote storage: stream the part file up, BLOCK_SIZE at a time
+        with open(upload.part_path, 'rb') as part:
+            saved = storage.save(name, File(part))
+        os.remove(upload.part_path)
+        if saved != name:
+            ProjectFile.objects.filter(pk=project_file.pk).update(file=saved)
+    else:
+        # Local storage on the same filesystem: a rename, no copy
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(upload.part_path, path)
+
+def discard_upload(upload):
+    try:
+        os.remove(upload.part_path)
+    except FileNotFoundError:
+        pass
+    upload.delete()
+
+# projects/previews.py
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Sum
+from django.db.models.functions import Right
+from django.utils import timezone
+from PIL import Image
+from .models import FilePreview
+
+# pdftoppm (poppler-utils) rasterises; Pillow resizes and encodes
+RENDER_DPI = 100
+RENDER_TIMEOUT = 120
+THUMBNAIL_WIDTH = 240
+PAGE_WIDTH = 900
+# Bump last_accessed at most this often per preview (seconds)
+TOUCH_INTERVAL = 3600
+# Queue a missing preview at most this often per content hash (seconds)
+REQUEST_INTERVAL = 600
+
+# Served in place of a thumbnail that is still being rendered
+PLACEHOLDER_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="240" height="310" viewBox="0 0 240 310">'
+    '<rect width="240" height="310" fill="#f1f3f5"/>'
+    '<text x="120" y="160" font-family="sans-serif" font-size="14" fill="#868e96" '
+    'text-anchor="middle">Preview pending</text></svg>'
+)
+
+def is_pdf(project_file):
+    return project_file.filename.lower().endswith('.pdf')
+
+def preview_dir(content_hash):
+    return os.path.join(settings.PREVIEW_CACHE_DIR, content_hash[:2], content_hash)
+
+def image_path(content_hash, page=None):
+    """The thumbnail, or low-resolution page `page` (1-based)"""
+    return os.path.join(preview_dir(content_hash), f'page-{page}.webp' if page else 'thumb.webp')
+
+def annotate_previews(queryset):
+    """Add has_preview to a ProjectFile queryset in the same query"""
+    # Blob names end in the content hash (see projects/storage.py)
+    return queryset.annotate(has_preview=Exists(
+        FilePreview.objects.filter(status='ready', content_hash=Right(OuterRef('file'), 64))
+    ))
+
+def render_pdf(source_path, out_dir, pages):
+    """
+    Write thumb.webp and page-N.webp for the first `pages` pages of a PDF
+    into out_dir; returns the number of pages rendered.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        subprocess.run(
+            ['pdftoppm', '-png', '-r', str(RENDER_DPI), '-f', '1', '-l', str(pages),
+             source_path, os.path.join(tmp, 'page')],
+            check=True, capture_output=True, timeout=RENDER_TIMEOUT,
+        )
+        # pdftoppm zero-pads page numbers to the width of the page count
+        rendered = sorted(
+            os.listdir(tmp), key=lambda name: int(re.search(r'(\d+)\.png$', name).group(1))
+        )
+        for number, name in enumerate(rendered, 1):
+            with Image.open(os.path.join(tmp, name)) as image:
+                image = image.convert('RGB')
+                if number == 1:
+                    thumbnail = image.copy()
+                    thumbnail.thumbnail((THUMBNAIL_WIDTH, THUMBNAIL_WIDTH * 2))
+                    thumbnail.save(os.path.join(out_dir, 'thumb.webp'), 'WEBP', quality=75)
+                image.thumbnail((PAGE_WIDTH, PAGE_WIDTH * 2))
+                image.save(os.path.join(out_dir, f'page-{number}.webp'), 'WEBP', quality=70)
+    return len(rendered)
+
+def local_copy(project_file):
+    """A path to the file's content (a temporary copy for remote storage)"""
+    storage = project_file.file.storage
+    try:
+        return storage.path(project_file.file.name), False
+    except NotImplementedError:
+        with storage.open(project_file.file.name, 'rb') as source, \
+                tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as copy:
+            shutil.copyfileobj(source, copy)
+        return copy.name, True
+
+def generate_preview(project_file):
+    """Render previews for the file's content once; shared by identical files"""
+    content_hash = project_file.content_hash
+    if not content_hash or not is_pdf(project_file):
+        return None
+    preview, created = FilePreview.objects.get_or_create(content_hash=content_hash)
+    if preview.status == 'ready' and os.path.exists(image_path(content_hash)):
+        return preview
+    
+    source, temporary = local_copy(project_file)
+    target = preview_dir(content_hash)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    work_dir = tempfile.mkdtemp(dir=os.path.dirname(target))
+    try:
+        pages = render_pdf(source, work_dir, settings.PREVIEW_PAGES)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(work_dir, target)
+    except (subprocess.SubprocessError, OSError) as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        preview.status = 'failed'
+        preview.error = str(e)[:2000]
+        preview.save(update_fields=['status', 'error'])
+        return preview
+    finally:
+        if temporary:
+            os.remove(source)
+    
+    preview.status = 'ready'
+    preview.pages = pages
+    preview.error = ''
+    preview.bytes = sum(entry.stat().st_size for entry in os.scandir(target))
+    preview.last_accessed = timezone.now()
+    preview.save()
+    evict()
+    return preview
+
+def request_preview(project_file):
+    """
+    Queue a render for a PDF whose preview is missing: never rendered,
+    evicted, or failed last time. Returns whether a preview is expected.
+    """
+    from .tasks import render_preview
+    
+    content_hash = project_file.content_hash
+    if not content_hash or not is_pdf(project_file):
+        return False
+    # One job per hash per interval, however many views ask for it meanwhile
+    if cache.add(f'preview-requested:{content_hash}', True, REQUEST_INTERVAL):
+        render_preview.enqueue(project_file.pk)
+    return True
+
+def touch(preview):
+    now = timezone.now()
+    if (now - preview.last_accessed).total_seconds() > TOUCH_INTERVAL:
+        FilePreview.objects.filter(pk=preview.pk).update(last_accessed=now)
+
+def evict(max_bytes=None):
+    """Drop the least recently viewed previews until the cache fits"""
+    max_bytes = max_bytes if max_bytes is not None else settings.PREVIEW_CACHE_MAX_BYTES
+    ready = FilePreview.objects.filter(status='ready')
+    total = ready.aggregate(total=Sum('bytes'))['total'] or 0
+    evicted = 0
+    for preview in ready.order_by('last_accessed').only('pk', 'content_hash', 'bytes').iterator():
+        if total <= max_bytes:
+            break
+        shutil.rmtree(preview_dir(preview.content_hash), ignore_errors=True)
+        preview.delete()
+        total -= preview.bytes
+        evicted += 1
+    return evicted
+
+# projects/downloads.py
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+from django.conf import settings
+from django.core.signing import BadSignature, TimestampSigner
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+signer = TimestampSigner(salt='projects.downloads')
+
+def signed_download_url(project_file):
+    """A link that works without logging in until DOWNLOAD_LINK_MAX_AGE runs out"""
+    token = signer.sign(str(project_file.pk))
+    return f"{reverse('download_file', args=[project_file.pk])}?token={token}"
+
+def valid_token(token, pk):
+    if not token:
+        return False
+    try:
+        return signer.unsign(token, max_age=settings.DOWNLOAD_LINK_MAX_AGE) == str(pk)
+    except BadSignature:
+        return False
+
+def parse_range(header, size):
+    """
+    Inclusive (start, end) for a single 'bytes=' range, or None to send the
+    whole file (no header, or one we don't handle such as multiple ranges).
+    Raises ValueError when the range can't be satisfied.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # bytes=-500: the last 500 bytes
+        if int(last) == 0:
+            raise ValueError('Empty suffix range')
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Range starts past the end of the file')
+    return start, end
+
+class FileRange:
+    """
+    Reads at most `length` bytes from `start`. Keeps fileno() so servers with
+    wsgi.file_wrapper can still sendfile() the range (bounded by the
+    response's Content-Length).
+    """
+    
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+    
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+    
+    def fileno(self):
+        return self.file.fileno()
+    
+    def close(self):
+        self.file.close()
+
+def serve(request, project_file, as_attachment=True):
+    """
+    Send a ProjectFile honouring If-None-Match/If-Modified-Since and Range.
+    With DOWNLOAD_OFFLOAD set, the front-end server does the transfer.
+    """
+    storage = project_file.file.storage
+    name = project_file.file.name
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        # Remote storage serves its own files (e.g. a pre-signed URL)
+        return HttpResponseRedirect(storage.url(name))
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404('File is missing from storage')
+    
+    # Blobs carry their content hash; other files fall back to size and mtime
+    version = project_file.content_hash or f'{stat.st_size:x}-{int(stat.st_mtime):x}'
+    etag = f'"{version}"'
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        content_type = mimetypes.guess_type(project_file.filename)[0] or 'application/octet-stream'
+        offload = getattr(settings, 'DOWNLOAD_OFFLOAD', '')
+        if offload == 'nginx':
+            # nginx serves the internal location itself, ranges included
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = quote(settings.DOWNLOAD_ACCEL_PREFIX + name)
+        elif offload == 'sendfile':
+            # Apache mod_xsendfile, lighttpd
+            response = HttpResponse(content_type=content_type)
+            response['X-Sendfile'] = path
+        else:
+            response = _file_response(request, path, stat.st_size, etag, content_type)
+        response['Content-Disposition'] = content_disposition_header(as_attachment, project_file.filename)
+    
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Accept-Ranges'] = 'bytes'
+    # Always revalidate; an unchanged file costs a 304
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+def _file_response(request, path, size, etag, content_type):
+    byte_range = None
+    # If-Range: only honour Range when the client's copy is still current
+    if request.headers.get('If-Range', etag) == etag:
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    
+    file = open(path, 'rb')
+    if byte_range is None:
+        return FileResponse(file, content_type=content_type)
+    
+    start, end = byte_range
+    response = FileResponse(FileRange(file, start, end - start + 1), content_type=content_type, status=206)
+    response['Content-Length'] = str(end - start + 1)
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+# projects/views.py
+from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.db.models import Q
+from django.utils import timezone
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.contrib.auth.views import redirect_to_login
+from django.views.decorators.http import require_GET, require_http_methods, require_POST, require_safe
+from latex_services.fragments import render_rows
+from latex_services.pagination import (
+    cursor_querystring, decode_queue_cursor, encode_queue_cursor, paginate_keyset
+)
+from django.utils.cache import get_conditional_response
+from django.utils.html import format_html
+from . import downloads, previews, uploads
+from .models import FilePreview, FileUpload, Project, ProjectFile
+from .forms import ProjectForm
+import json
+import os
+
+@login_required
+def project_list(request):
+    projects = Project.objects.select_related('client').with_deadline_state()
+    
+    # Status filter
+    status = request.GET.get('status')
+    if status:
+        projects = projects.filter(status=status)
+    
+    # Priority filter
+    priority = request.GET.get('priority')
+    if priority:
+        projects = projects.filter(priority=priority)
+    
+    # Overdue projects
+    show_overdue = request.GET.get('overdue')
+    if show_overdue:
+        projects = projects.overdue()
+    
+    page = paginate_keyset(projects, request.GET.get('cursor'))
+    
+    context = {
+        'projects': page,
+        'rows': render_rows(
+            page, 'projects/_project_row.html', 'project',
+            # The row shows the client's name
+            key_parts=lambda project: (project.client.updated_at.timestamp(),),
+            live=lambda project: {'deadline_badge': deadline_badge(project)},
+        ),
+        'page': page,
+        'next_query': cursor_querystring(request, page.next_cursor) if page.has_next else None,
+        'prev_query': cursor_querystring(request, page.prev_cursor) if page.has_previous else None,
         'status': status,
         'priority': priority,
         'show_overdue': show_overdue,
@@ -455,10 +3965,44 @@ def project_list(request):
     }
     return render(request, 'projects/project_list.html', context)
 
+def deadline_badge(project):
+    if not project.deadline:
+        return ''
+    if project.is_overdue:
+        return format_html('<br><span class="badge bg-danger">Overdue</span>')
+    if project.is_due_soon:
+        return format_html('<br><span class="badge bg-warning">Due Soon</span>')
+    return ''
+
+@login_required
+def work_queue(request):
+    """What to work on next: active projects by priority, then deadline"""
+    # Ids first, so ordering and limit are an index-only scan of
+    # project_work_queue_idx; then the page's rows by primary key
+    position = decode_queue_cursor(request.GET.get('cursor'))
+    ids = list(Project.objects.work_queue(after=position).values_list('pk', flat=True)[:settings.LIST_PAGE_SIZE + 1])
+    more, ids = len(ids) > settings.LIST_PAGE_SIZE, ids[:settings.LIST_PAGE_SIZE]
+    projects = Project.objects.select_related('client').with_deadline_state().in_bulk(ids)
+    page = [projects[pk] for pk in ids if pk in projects]
+    
+    context = {
+        'rows': render_rows(
+            page, 'projects/_project_row.html', 'project',
+            key_parts=lambda project: (project.client.updated_at.timestamp(),),
+            live=lambda project: {'deadline_badge': deadline_badge(project)},
+        ),
+        'continued': position is not None,
+        'next_query': cursor_querystring(request, encode_queue_cursor(page[-1])) if more and page else None,
+    }
+    return render(request, 'projects/work_queue.html', context)
+
 @login_required
 def project_detail(request, pk):
     project = get_object_or_404(Project, pk=pk)
-    files = project.files.all()
+    files = list(previews.annotate_previews(project.files.all()))
+    for project_file in files:
+        # Evicted or failed previews are only rebuilt when someone asks
+        project_file.preview_pending = not project_file.has_preview and previews.request_preview(project_file)
     communications = project.communications.all()
     
     context = {
@@ -468,6 +4012,373 @@ def project_detail(request, pk):
     }
     return render(request, 'projects/project_detail.html', context)
 
+@require_safe
+def download_file(request, file_pk):
+    """Staff download a file when logged in; clients with a signed link"""
+    project_file = get_object_or_404(ProjectFile, pk=file_pk)
+    if not (request.user.is_authenticated or downloads.valid_token(request.GET.get('token'), file_pk)):
+        return redirect_to_login(request.get_full_path())
+    return downloads.serve(request, project_file, as_attachment=not request.GET.get('inline'))
+
+@login_required
+@require_safe
+def file_preview(request, file_pk, page=None):
+    """A file's thumbnail, or a low-resolution page, from the preview cache"""
+    project_file = get_object_or_404(ProjectFile, pk=file_pk)
+    preview = FilePreview.objects.filter(content_hash=project_file.content_hash, status='ready').first()
+    if preview is not None and page and page > preview.pages:
+        raise Http404('No preview')
+    path = previews.image_path(preview.content_hash, page) if preview else None
+    if path is None or not os.path.exists(path):
+        if not previews.request_preview(project_file):
+            raise Http404('No preview')
+        response = HttpResponse(previews.PLACEHOLDER_SVG, content_type='image/svg+xml')
+        response['Cache-Control'] = 'no-store'
+        return response
+    previews.touch(preview)
+    
+    # Content-addressed, so a cached copy never goes stale
+    etag = f'"{preview.content_hash}-{page or "thumb"}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = FileResponse(open(path, 'rb'), content_type='image/webp')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=86400'
+    return response
+
+# Chunked uploads: POST the file's details to start_upload, then PUT each
+# chunk to upload_chunk with Upload-Offset and X-Chunk-SHA256 headers. After
+# a dropped connection, GET upload_status for the offset to resume from.
+
+FILE_TYPES = {value for value, label in ProjectFile.FILE_TYPE_CHOICES}
+
+def upload_state(upload):
+    return {
+        'id': str(upload.pk),
+        'offset': upload.received,
+        'size': upload.size,
+        'status': upload.status,
+        'chunk_size': settings.UPLOAD_CHUNK_SIZE,
+        'project_file': upload.project_file_id,
+    }
+
+@login_required
+@require_POST
+def start_upload(request, pk):
+    project = get_object_or_404(Project, pk=pk)
+    try:
+        data = json.loads(request.body)
+        filename = os.path.basename(data['filename'])[:255]
+        size = int(data['size'])
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'filename and size are required'}, status=400)
+    file_type = data.get('file_type', 'source')
+    if not filename or file_type not in FILE_TYPES:
+        return JsonResponse({'error': 'Invalid filename or file_type'}, status=400)
+    if not 0 < size <= settings.MAX_UPLOAD_SIZE:
+        return JsonResponse({'error': f'size must be 1-{settings.MAX_UPLOAD_SIZE} bytes'}, status=400)
+    
+    upload = uploads.start_upload(
+        project, request.user, filename, size, file_type,
+        description=(data.get('description') or '')[:500],
+        version=(data.get('version') or '')[:20],
+    )
+    return JsonResponse(upload_state(upload), status=201)
+
+@login_required
+@require_GET
+def upload_status(request, upload_id):
+    return JsonResponse(upload_state(get_object_or_404(FileUpload, pk=upload_id)))
+
+@login_required
+@require_http_methods(['PUT'])
+def upload_chunk(request, upload_id):
+    try:
+        offset = int(request.headers['Upload-Offset'])
+        length = int(request.headers['Content-Length'])
+        checksum = request.headers['X-Chunk-SHA256']
+    except (KeyError, ValueError):
+        return JsonResponse(
+            {'error': 'Upload-Offset, Content-Length and X-Chunk-SHA256 are required'}, status=400
+        )
+    if length > settings.UPLOAD_CHUNK_SIZE:
+        return JsonResponse({'error': f'Chunks are at most {settings.UPLOAD_CHUNK_SIZE} bytes'}, status=413)
+    
+    try:
+        # The body is streamed to disk before the upload row is locked
+        upload = uploads.write_chunk(upload_id, offset, request, length, checksum)
+    except FileUpload.DoesNotExist:
+        return JsonResponse({'error': 'Unknown upload'}, status=404)
+    except uploads.UploadError as e:
+        return JsonResponse({'error': str(e), **upload_state(e.upload)}, status=e.status)
+    return JsonResponse(upload_state(upload))
+
+# projects/tests.py
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.template.loader import get_template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from clients.models import Client
+from latex_services.fragments import LIVE_MARKER, row_cache_key
+from . import uploads
+from .models import PRIORITY_RANKS, Project, ProjectFile
+
+def make_project(client, **fields):
+    fields.setdefault('title', 'Thesis conversion')
+    fields.setdefault('project_type', 'standard_conversion')
+    fields.setdefault('description', '')
+    return Project.objects.create(client=client, **fields)
+
+class ProjectTestCase(TestCase):
+    def setUp(self):
+        self.client_record = Client.objects.create(first_name='Ada', last_name='Lovelace', email='ada@example.edu')
+        self.user = User.objects.create_user('staff', password='secret')
+        self.client.force_login(self.user)
+
+class WorkQueueTests(ProjectTestCase):
+    def test_update_priority_rewrites_rank_and_updated_at(self):
+        project = make_project(self.client_record, status='in_progress')
+        before = project.updated_at
+        Project.objects.filter(pk=project.pk).update(priority='urgent')
+        project.refresh_from_db()
+        self.assertEqual(project.priority_rank, PRIORITY_RANKS['urgent'])
+        self.assertGreater(project.updated_at, before)
+    
+    @override_settings(LIST_PAGE_SIZE=2)
+    def test_next_links_walk_the_whole_queue(self):
+        now = timezone.now()
+        for i, (priority, days) in enumerate([
+            ('urgent', 3), ('urgent', None), ('high', 1), ('high', 1), ('normal', None), ('low', 2),
+        ]):
+            deadline = now + timedelta(days=days) if days is not None else None
+            make_project(self.client_record, title=f'Project {i}', status='approved', priority=priority, deadline=deadline)
+        make_project(self.client_record, title='Finished', status='completed', priority='urgent')
+        
+        seen, query = [], ''
+        while True:
+            response = self.client.get(f"{reverse('work_queue')}?{query}")
+            self.assertEqual(response.status_code, 200)
+            seen += response.context['rows']
+            query = response.context['next_query']
+            if not query:
+                break
+        expected = list(Project.objects.work_queue())
+        self.assertEqual(len(seen), len(expected))
+        for project, row in zip(expected, seen):
+            self.assertIn(project.title, row)
+    
+    def test_garbled_cursor_starts_at_the_top(self):
+        response = self.client.get(reverse('work_queue'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['continued'])
+
+FIXED_NOW = datetime(2024, 5, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+@mock.patch('django.utils.timezone.now', return_value=FIXED_NOW)
+class DeadlineStateTests(ProjectTestCase):
+    # (status, deadline relative to now, overdue, due soon)
+    CASES = [
+        ('in_progress', timedelta(days=-1), True, False),
+        ('inquiry', timedelta(hours=-1), True, False),
+        ('cancelled', timedelta(days=-3), True, False),
+        ('completed', timedelta(days=-1), False, False),
+        ('review', timedelta(days=2), False, True),
+        ('quoted', timedelta(days=4), False, False),
+        ('completed', timedelta(days=1), False, False),
+        ('approved', None, False, False),
+    ]
+    
+    def test_annotations_and_properties_agree(self, now):
+        for status, offset, overdue, due_soon in self.CASES:
+            with self.subTest(status=status, offset=offset):
+                project = make_project(
+                    self.client_record, status=status, deadline=FIXED_NOW + offset if offset is not None else None
+                )
+                annotated = Project.objects.with_deadline_state().get(pk=project.pk)
+                self.assertEqual((annotated.is_overdue, annotated.is_due_soon), (overdue, due_soon))
+                self.assertEqual((project.is_overdue, project.is_due_soon), (overdue, due_soon))
+    
+    def test_overdue_queue_lists_active_projects(self, now):
+        late = make_project(self.client_record, status='in_progress', deadline=FIXED_NOW - timedelta(days=1))
+        make_project(self.client_record, status='inquiry', deadline=FIXED_NOW - timedelta(days=1))
+        make_project(self.client_record, status='completed', deadline=FIXED_NOW - timedelta(days=1))
+        make_project(self.client_record, status='review', deadline=FIXED_NOW + timedelta(days=1))
+        self.assertEqual(list(Project.objects.overdue()), [late])
+
+class CachedRowTests(ProjectTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        with mock.patch('django.utils.timezone.now', return_value=FIXED_NOW):
+            self.project = make_project(
+                self.client_record, title='Journal article', status='in_progress',
+                deadline=FIXED_NOW + timedelta(days=2),
+            )
+    
+    def row_at(self, now):
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            response = self.client.get(reverse('project_list'))
+        self.assertEqual(response.status_code, 200)
+        [row] = response.context['rows']
+        return row
+    
+    def cached_row(self):
+        key = row_cache_key(
+            get_template('projects/_project_row.html'), self.project, self.project.client.updated_at.timestamp()
+        )
+        return cache.get(key)
+    
+    def test_deadline_badge_is_live_inside_a_cached_row(self):
+        self.assertIn('Due Soon', self.row_at(FIXED_NOW))
+        cached = self.cached_row()
+        self.assertIn(LIVE_MARKER.format('deadline_badge'), cached)
+        self.assertNotIn('Due Soon', cached)
+        
+        # The same cached fragment, three days on
+        row = self.row_at(FIXED_NOW + timedelta(days=3))
+        self.assertEqual(self.cached_row(), cached)
+        self.assertIn('Overdue', row)
+        self.assertNotIn('Due Soon', row)
+        self.assertIn('Journal article', row)
+
+class MediaTestCase(ProjectTestCase):
+    """Files go to a throwaway MEDIA_ROOT"""
+    
+    DATA = os.urandom(3000)
+    
+    def setUp(self):
+        super().setUp()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        overrides = self.settings(MEDIA_ROOT=media, CHUNKED_UPLOAD_DIR=os.path.join(media, 'uploads'))
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.project = make_project(self.client_record)
+
+@override_settings(DOWNLOAD_OFFLOAD='')
+class DownloadTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.project_file = ProjectFile.objects.create(
+            project=self.project, file_type='output', filename='thesis.tex',
+            file=ContentFile(self.DATA, name='thesis.tex'),
+        )
+        self.url = reverse('download_file', args=[self.project_file.pk])
+        self.etag = f'"{self.project_file.content_hash}"'
+    
+    def get(self, **headers):
+        response = self.client.get(self.url, **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+    
+    def test_whole_file(self):
+        response, body = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.DATA)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['ETag'], self.etag)
+    
+    def test_satisfiable_ranges(self):
+        for header, start, end in [
+            ('bytes=0-99', 0, 99),
+            ('bytes=2900-', 2900, 2999),
+            ('bytes=-100', 2900, 2999),
+            ('bytes=-5000', 0, 2999),
+            ('bytes=2990-5000', 2990, 2999),
+            ('bytes=1500-1500', 1500, 1500),
+        ]:
+            with self.subTest(range=header):
+                response, body = self.get(HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(body, self.DATA[start:end + 1])
+                self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/3000')
+                self.assertEqual(response['Content-Length'], str(end - start + 1))
+    
+    def test_unsatisfiable_ranges(self):
+        for header in ('bytes=3000-', 'bytes=3000-3100', 'bytes=-0', 'bytes=500-100'):
+            with self.subTest(range=header):
+                response, body = self.get(HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response['Content-Range'], 'bytes */3000')
+    
+    def test_unsupported_ranges_send_the_whole_file(self):
+        for header in ('bytes=0-1,5-9', 'items=0-1', 'bytes=-'):
+            with self.subTest(range=header):
+                response, body = self.get(HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(body, self.DATA)
+    
+    def test_if_range(self):
+        response, body = self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=self.etag)
+        self.assertEqual((response.status_code, body), (206, self.DATA[:10]))
+        response, body = self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual((response.status_code, body), (200, self.DATA))
+    
+    def test_unchanged_file_revalidates(self):
+        response, body = self.get(HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(body, b'')
+
+class ChunkedUploadTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.upload = uploads.start_upload(self.project, self.user, 'thesis.tex', len(self.DATA), 'source')
+    
+    def send(self, offset, size=1000, checksum=None):
+        data = self.DATA[offset:offset + size]
+        return uploads.write_chunk(
+            self.upload.pk, offset, io.BytesIO(data), len(data), checksum or hashlib.sha256(data).hexdigest()
+        )
+    
+    def test_chunks_become_a_blob_named_by_their_content(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for offset in range(0, len(self.DATA), 1000):
+                upload = self.send(offset)
+        self.assertEqual(upload.status, 'complete')
+        self.assertEqual(upload.digest, hashlib.sha256(self.DATA).hexdigest())
+        self.assertEqual(upload.project_file.content_hash, upload.digest)
+        with upload.project_file.file.open('rb') as f:
+            self.assertEqual(f.read(), self.DATA)
+        self.assertFalse(os.path.exists(upload.part_path))
+    
+    def test_digest_is_rebuilt_in_another_process(self):
+        self.send(0)
+        uploads._running_digests.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.send(1000)
+            upload = self.send(2000)
+        self.assertEqual(upload.project_file.content_hash, hashlib.sha256(self.DATA).hexdigest())
+    
+    def test_bad_chunk_is_dropped_and_can_be_resent(self):
+        self.send(0)
+        with self.assertRaises(uploads.UploadError):
+            self.send(1000, checksum='0' * 64)
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.received, 1000)
+        self.assertEqual(self.send(1000).received, 2000)
+    
+    def test_part_file_stays_put_until_commit(self):
+        self.send(0)
+        self.send(1000)
+        with self.captureOnCommitCallbacks() as callbacks:
+            upload = self.send(2000)
+        self.assertTrue(os.path.exists(upload.part_path))
+        self.assertFalse(upload.project_file.file.storage.exists(upload.project_file.file.name))
+        for callback in callbacks:
+            callback()
+        self.assertFalse(os.path.exists(upload.part_path))
+        self.assertTrue(upload.project_file.file.storage.exists(upload.project_file.file.name))
+
 # ===== FORMS =====
 
 # clients/forms.py
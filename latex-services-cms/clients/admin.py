@@ -1,18 +1,19 @@
 # clients/admin.py
 from django.contrib import admin
-from django.db.models import Sum, Count
 from django.utils.html import format_html
+from latex_services.replicas import ReplicaChangelistMixin
+from latex_services.search import search_clients
 from .models import Client
 
 @admin.register(Client)
-class ClientAdmin(admin.ModelAdmin):
+class ClientAdmin(ReplicaChangelistMixin, admin.ModelAdmin):
     list_display = [
         'full_name', 'email', 'institution', 'status', 
         'lead_source', 'project_count', 'lifetime_value_display', 'created_at'
     ]
     list_filter = ['status', 'lead_source', 'created_at', 'institution']
     search_fields = ['first_name', 'last_name', 'email', 'institution']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['created_at', 'updated_at', 'project_count', 'total_value', 'lifetime_value']
     
     fieldsets = (
         ('Personal Information', {
@@ -22,7 +23,10 @@ class ClientAdmin(admin.ModelAdmin):
             'fields': ('institution', 'department', 'title', 'field_of_study')
         }),
         ('Business Information', {
-            'fields': ('status', 'lead_source', 'lifetime_value', 'notes')
+            'fields': ('status', 'lead_source', 'notes')
+        }),
+        ('Project Totals', {
+            'fields': ('project_count', 'total_value', 'lifetime_value')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at', 'last_contact'),
@@ -30,19 +34,19 @@ class ClientAdmin(admin.ModelAdmin):
         }),
     )
     
-    def get_queryset(self, request):
-        return super().get_queryset(request).annotate(
-            project_count=Count('projects'),
-            total_value=Sum('projects__final_amount')
-        )
+    def get_search_results(self, request, queryset, search_term):
+        # Indexed search instead of the icontains scan built from search_fields
+        if not search_term:
+            return queryset, False
+        return search_clients(queryset, search_term, ranked=True), False
     
-    def project_count(self, obj):
-        return obj.project_count
-    project_count.short_description = 'Projects'
-    project_count.admin_order_field = 'project_count'
+    def get_ordering(self, request):
+        if request.GET.get('q'):
+            return ['-search_rank', '-created_at']
+        return super().get_ordering(request)
     
     def lifetime_value_display(self, obj):
-        value = obj.total_value or 0
+        value = obj.total_value
         if value > 0:
             return format_html('<span style="color: green;">${:,.0f}</span>', value)
         return '$0'
@@ -0,0 +1,50 @@
+# clients/management/commands/check_query_plans.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from latex_services.query_plans import SEQ_SCAN_PATTERNS, hot_queries, seed_plan_data, sequential_scans
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot querysets against a seeded database and fail on sequential scans'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=50_000,
+                            help='Projects to seed; planners scan small tables whatever the indexes')
+        parser.add_argument('--only', help='Only check queries whose name contains this text')
+        parser.add_argument('--show-plans', action='store_true', help='Print every plan, not just failures')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Keep the seeded database between runs')
+    
+    def handle(self, *args, **options):
+        if connection.vendor not in SEQ_SCAN_PATTERNS:
+            raise CommandError(f'No sequential scan pattern for {connection.vendor}')
+        
+        # Seed a throwaway database, never the one the site runs on
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options['keepdb']
+        )
+        try:
+            seeded = seed_plan_data(options['projects'], vacuum=True)
+            if seeded:
+                self.stdout.write(f'Seeded {seeded} projects')
+            failures = self.check(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+        
+        if failures:
+            raise CommandError(f'Sequential scans in: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('No sequential scans on hot queries'))
+    
+    def check(self, options):
+        failures = []
+        for name, queryset, models in hot_queries():
+            if options['only'] and options['only'] not in name:
+                continue
+            scanned, plan = sequential_scans(queryset, models)
+            if scanned:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'{name}: sequential scan on {", ".join(scanned)}'))
+            else:
+                self.stdout.write(f'{name}: ok')
+            if scanned or options['show_plans']:
+                self.stdout.write(plan + '\n')
+        return failures
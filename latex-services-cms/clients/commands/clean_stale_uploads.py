@@ -0,0 +1,37 @@
+# clients/management/commands/clean_stale_uploads.py
+import os
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from projects.models import FileUpload
+from projects.uploads import discard_upload, place_part_file
+
+class Command(BaseCommand):
+    help = 'Delete chunked uploads that stopped receiving chunks, and finish moving completed ones'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=48, help='Idle time before an upload is abandoned')
+    
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = FileUpload.objects.filter(status='open', updated_at__lt=cutoff)
+        removed = 0
+        for upload in stale.iterator():
+            discard_upload(upload)
+            removed += 1
+        
+        # Part files of completed uploads are moved after their commit; one
+        # still here a while later means the process stopped in between
+        placed = 0
+        settled = timezone.now() - timedelta(minutes=10)
+        if os.path.isdir(settings.CHUNKED_UPLOAD_DIR):
+            with os.scandir(settings.CHUNKED_UPLOAD_DIR) as entries:
+                upload_ids = [entry.name[:-len('.part')] for entry in entries if entry.name.endswith('.part')]
+            completed = FileUpload.objects.filter(
+                pk__in=upload_ids, status='complete', project_file__isnull=False, updated_at__lt=settled
+            ).select_related('project_file')
+            for upload in completed:
+                place_part_file(upload, upload.project_file)
+                placed += 1
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} stale uploads; moved {placed} completed uploads into place'))
@@ -0,0 +1,78 @@
+# clients/management/commands/gc_project_files.py
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from projects.models import ProjectFile
+from projects.storage import BLOB_PREFIX
+
+class Command(BaseCommand):
+    help = 'Delete stored project files that no ProjectFile references'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default=BLOB_PREFIX,
+                            help='Storage directory to sweep (blobs, or project_files for pre-blob uploads)')
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help='Leave files younger than this (uploads still being saved)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Files checked per query')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted')
+    
+    def handle(self, *args, **options):
+        self.storage = ProjectFile._meta.get_field('file').storage
+        root = self.storage.path(options['prefix'])
+        if not os.path.isdir(root):
+            raise CommandError(f'{root} is not a directory')
+        self.cutoff = time.time() - options['grace_hours'] * 3600
+        
+        kept = removed = reclaimed = 0
+        for batch in self.batches(self.walk(root), options['batch_size']):
+            referenced = set(
+                ProjectFile.objects.filter(file__in=[name for name, path, size in batch])
+                .values_list('file', flat=True)
+            )
+            for name, path, size in batch:
+                if name in referenced:
+                    kept += 1
+                    continue
+                # An upload may have deduplicated onto this blob since the walk
+                # (ContentAddressedStorage._store touches it) and not yet
+                # committed its row: check the mtime again, after the query
+                try:
+                    if os.stat(path).st_mtime >= self.cutoff:
+                        kept += 1
+                        continue
+                except FileNotFoundError:
+                    continue
+                if not options['dry_run']:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        continue
+                removed += 1
+                reclaimed += size
+        
+        verb = 'Would remove' if options['dry_run'] else 'Removed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {removed} unreferenced files ({reclaimed / 1024 / 1024:.1f}MB), kept {kept}'
+        ))
+    
+    def walk(self, directory):
+        """Yield (name, path, size) of files past the grace period, one directory open at a time"""
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self.walk(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat()
+                    if stat.st_mtime < self.cutoff:
+                        name = os.path.relpath(entry.path, self.storage.location).replace(os.sep, '/')
+                        yield name, entry.path, stat.st_size
+    
+    def batches(self, rows, size):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
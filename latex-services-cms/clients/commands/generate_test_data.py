@@ -1,108 +1,273 @@
 # clients/management/commands/generate_test_data.py
+from array import array
+from contextlib import contextmanager
 from django.core.management.base import BaseCommand
-from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Max
 from django.utils import timezone
 from datetime import timedelta
+from decimal import Decimal
 import random
+import time
+from clients.aggregates import recompute_clients
 from clients.models import Client
-from projects.models import Project
+from projects.models import Project, ProjectFile
 from communications.models import Communication
+from latex_services.stats_cache import invalidate_dashboard_stats
+from reports.rollups import rebuild_revenue_rollup
+
+# Sample data
+INSTITUTIONS = [
+    'MIT', 'Stanford University', 'UC Berkeley', 'Harvard University',
+    'University of Chicago', 'Yale University', 'Princeton University',
+    'Columbia University', 'University of Michigan', 'Cornell University'
+]
+
+DEPARTMENTS = [
+    'Computer Science', 'Economics', 'Political Science', 'Psychology',
+    'Mathematics', 'Physics', 'Biology', 'Chemistry', 'Statistics',
+    'Public Policy', 'Sociology', 'Philosophy'
+]
+
+FIRST_NAMES = [
+    'James', 'Maria', 'John', 'Sarah', 'Michael', 'Jennifer', 'David',
+    'Lisa', 'Robert', 'Karen', 'William', 'Nancy', 'Richard', 'Betty'
+]
+
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller',
+    'Davis', 'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez'
+]
+
+PROJECT_TITLES = [
+    'Machine Learning in Healthcare Applications',
+    'Economic Impact of Climate Change Policies',
+    'Social Media Influence on Political Behavior',
+    'Quantum Computing Applications in Cryptography',
+    'Behavioral Economics and Consumer Decision Making',
+    'Neural Networks for Natural Language Processing',
+    'Public Policy Analysis Framework',
+    'Statistical Methods for Big Data Analysis'
+]
+
+JOURNALS = [
+    'Nature', 'Science', 'PNAS', 'American Economic Review',
+    'American Political Science Review', 'Journal of Marketing Research'
+]
+
+# (value, weight) pairs, roughly what the real pipeline looks like
+CLIENT_STATUSES = [('lead', 40), ('contacted', 20), ('active', 20), ('completed', 15), ('inactive', 5)]
+LEAD_SOURCES = [('website', 50), ('referral', 20), ('twitter', 10), ('bluesky', 5), ('conference', 10), ('email', 5)]
+PROJECT_STATUSES = [
+    ('inquiry', 20), ('quoted', 15), ('approved', 5), ('in_progress', 10),
+    ('review', 5), ('completed', 40), ('cancelled', 5)
+]
+PROJECT_TYPES = [('quick_fix', 35), ('standard_conversion', 40), ('premium_workflow', 20), ('custom', 5)]
+QUOTES = {
+    'quick_fix': [200],
+    'standard_conversion': [400, 500, 600],
+    'premium_workflow': [800, 1000, 1200],
+    'custom': [600, 1500, 2500],
+}
+PRIORITIES = [('low', 15), ('normal', 60), ('high', 20), ('urgent', 5)]
+COMMUNICATION_TYPES = [('email', 70), ('call', 10), ('meeting', 5), ('note', 15)]
+FILE_TYPES = [('source', 40), ('output', 30), ('reference', 15), ('revision', 15)]
+
+def weighted(choices):
+    values, weights = zip(*choices)
+    return values, weights
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created_at/uploaded_at values we generate"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
 
 class Command(BaseCommand):
-    help = 'Generate test data for development'
+    help = 'Generate test data for development and load testing'
     
     def add_arguments(self, parser):
         parser.add_argument('--clients', type=int, default=20, help='Number of clients to create')
         parser.add_argument('--projects', type=int, default=30, help='Number of projects to create')
+        parser.add_argument('--communications', type=float, default=2.0,
+                            help='Average communications per project')
+        parser.add_argument('--files', type=float, default=1.5, help='Average files per project')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT')
+        parser.add_argument('--seed', type=int, help='Random seed for a reproducible dataset')
     
     def handle(self, *args, **options):
-        # Sample data
-        institutions = [
-            'MIT', 'Stanford University', 'UC Berkeley', 'Harvard University',
-            'University of Chicago', 'Yale University', 'Princeton University',
-            'Columbia University', 'University of Michigan', 'Cornell University'
-        ]
-        
-        departments = [
-            'Computer Science', 'Economics', 'Political Science', 'Psychology',
-            'Mathematics', 'Physics', 'Biology', 'Chemistry', 'Statistics',
-            'Public Policy', 'Sociology', 'Philosophy'
-        ]
-        
-        first_names = [
-            'James', 'Maria', 'John', 'Sarah', 'Michael', 'Jennifer', 'David',
-            'Lisa', 'Robert', 'Karen', 'William', 'Nancy', 'Richard', 'Betty'
-        ]
-        
-        last_names = [
-            'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller',
-            'Davis', 'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez'
-        ]
-        
-        project_titles = [
-            'Machine Learning in Healthcare Applications',
-            'Economic Impact of Climate Change Policies',
-            'Social Media Influence on Political Behavior',
-            'Quantum Computing Applications in Cryptography',
-            'Behavioral Economics and Consumer Decision Making',
-            'Neural Networks for Natural Language Processing',
-            'Public Policy Analysis Framework',
-            'Statistical Methods for Big Data Analysis'
-        ]
-        
-        # Create clients
-        self.stdout.write('Creating clients...')
-        for i in range(options['clients']):
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
-            
-            client = Client.objects.create(
-                first_name=first_name,
-                last_name=last_name,
-                email=f"{first_name.lower()}.{last_name.lower()}{i}@university.edu",
-                institution=random.choice(institutions),
-                department=random.choice(departments),
-                title=random.choice(['PhD Candidate', 'Professor', 'Associate Professor', 'Postdoc']),
-                field_of_study=random.choice(departments),
-                status=random.choice(['lead', 'active', 'completed']),
-                lead_source=random.choice(['website', 'referral', 'twitter', 'conference']),
-                created_at=timezone.now() - timedelta(days=random.randint(1, 365))
-            )
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.batch_size = options['batch_size']
+        started = time.monotonic()
         
-        # Create projects
-        self.stdout.write('Creating projects...')
-        clients = list(Client.objects.all())
-        
-        for i in range(options['projects']):
-            client = random.choice(clients)
+        with explicit_timestamps(Client, Project, ProjectFile, Communication):
+            self.stdout.write('Creating clients...')
+            client_ids = self.create_clients(options['clients'])
             
-            project = Project.objects.create(
-                client=client,
-                title=random.choice(project_titles),
-                project_type=random.choice(['quick_fix', 'standard_conversion', 'premium_workflow']),
-                description=f"Academic project requiring LaTeX formatting and conversion services.",
-                status=random.choice(['inquiry', 'quoted', 'in_progress', 'completed']),
-                priority=random.choice(['low', 'normal', 'high', 'urgent']),
-                quoted_amount=random.choice([200, 400, 600, 800, 1200]),
-                deadline=timezone.now() + timedelta(days=random.randint(1, 30)),
-                source_format=random.choice(['Word', 'LaTeX', 'Markdown']),
-                target_journal=random.choice([
-                    'Nature', 'Science', 'PNAS', 'American Economic Review',
-                    'American Political Science Review', 'Journal of Marketing Research'
-                ]),
-                created_at=timezone.now() - timedelta(days=random.randint(1, 180))
+            self.stdout.write('Creating projects, communications and files...')
+            totals = self.create_projects(
+                client_ids, options['projects'], options['communications'], options['files']
             )
         
-        # Update client lifetime values
-        for client in Client.objects.all():
-            total_value = client.projects.filter(
-                status='completed'
-            ).aggregate(total=models.Sum('final_amount'))['total'] or 0
-            client.lifetime_value = total_value
-            client.save()
+        # bulk_create skips Project.save(), so derive the denormalized data set-based
+        self.stdout.write('Updating client aggregates and revenue rollup...')
+        recompute_clients()
+        rebuild_revenue_rollup()
+        invalidate_dashboard_stats()
         
         self.stdout.write(
             self.style.SUCCESS(
-                f'Successfully created {options["clients"]} clients and {options["projects"]} projects'
+                f'Successfully created {len(client_ids)} clients, {totals["projects"]} projects, '
+                f'{totals["communications"]} communications and {totals["files"]} files '
+                f'in {time.monotonic() - started:.1f}s'
             )
         )
+    
+    def batches(self, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def create_clients(self, count):
+        rng = self.rng
+        statuses, status_weights = weighted(CLIENT_STATUSES)
+        sources, source_weights = weighted(LEAD_SOURCES)
+        # Keep emails unique across repeated runs
+        offset = (Client.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+        
+        def rows():
+            for i in range(offset, offset + count):
+                first_name = rng.choice(FIRST_NAMES)
+                last_name = rng.choice(LAST_NAMES)
+                department = rng.choice(DEPARTMENTS)
+                created_at = self.now - timedelta(days=rng.randint(1, 730), seconds=rng.randint(0, 86399))
+                yield Client(
+                    first_name=first_name,
+                    last_name=last_name,
+                    email=f"{first_name.lower()}.{last_name.lower()}{i}@university.edu",
+                    institution=rng.choice(INSTITUTIONS),
+                    department=department,
+                    title=rng.choice(['PhD Candidate', 'Professor', 'Associate Professor', 'Postdoc']),
+                    field_of_study=department,
+                    status=rng.choices(statuses, status_weights)[0],
+                    lead_source=rng.choices(sources, source_weights)[0],
+                    created_at=created_at,
+                    last_contact=created_at + timedelta(days=rng.randint(0, 30)) if rng.random() < 0.6 else None,
+                )
+        
+        # Only the ids are kept (8 bytes per client) to assign projects
+        client_ids = array('q')
+        for batch in self.batches(rows()):
+            with transaction.atomic():
+                client_ids.extend(client.pk for client in Client.objects.bulk_create(batch))
+        return client_ids
+    
+    def create_projects(self, client_ids, count, communications_per_project, files_per_project):
+        totals = {'projects': 0, 'communications': 0, 'files': 0}
+        if not client_ids:
+            return totals
+        
+        rng = self.rng
+        statuses, status_weights = weighted(PROJECT_STATUSES)
+        types, type_weights = weighted(PROJECT_TYPES)
+        priorities, priority_weights = weighted(PRIORITIES)
+        
+        def rows():
+            for _ in range(count):
+                status = rng.choices(statuses, status_weights)[0]
+                project_type = rng.choices(types, type_weights)[0]
+                quoted_amount = Decimal(rng.choice(QUOTES[project_type]))
+                created_at = self.now - timedelta(days=rng.randint(1, 540), seconds=rng.randint(0, 86399))
+                started_at = completed_at = final_amount = None
+                if status in ('in_progress', 'review', 'completed'):
+                    started_at = created_at + timedelta(days=rng.randint(1, 14))
+                if status == 'completed':
+                    completed_at = min(started_at + timedelta(days=rng.randint(2, 30)), self.now)
+                    final_amount = quoted_amount + Decimal(rng.choice([0, 0, 0, 50, 100, -50]))
+                yield Project(
+                    client_id=rng.choice(client_ids),
+                    title=rng.choice(PROJECT_TITLES),
+                    project_type=project_type,
+                    description="Academic project requiring LaTeX formatting and conversion services.",
+                    status=status,
+                    priority=rng.choices(priorities, priority_weights)[0],
+                    quoted_amount=quoted_amount,
+                    final_amount=final_amount,
+                    paid=status == 'completed' and rng.random() < 0.9,
+                    deadline=created_at + timedelta(days=rng.randint(7, 60)),
+                    source_format=rng.choice(['Word', 'LaTeX', 'Markdown']),
+                    target_journal=rng.choice(JOURNALS),
+                    created_at=created_at,
+                    started_at=started_at,
+                    completed_at=completed_at,
+                )
+        
+        for batch in self.batches(rows()):
+            with transaction.atomic():
+                projects = Project.objects.bulk_create(batch)
+                communications = list(self.communication_rows(projects, communications_per_project))
+                files = list(self.file_rows(projects, files_per_project))
+                Communication.objects.bulk_create(communications, batch_size=self.batch_size)
+                ProjectFile.objects.bulk_create(files, batch_size=self.batch_size)
+            totals['projects'] += len(projects)
+            totals['communications'] += len(communications)
+            totals['files'] += len(files)
+            self.stdout.write(f'  {totals["projects"]}/{count} projects')
+        return totals
+    
+    def poisson(self, mean):
+        # Knuth's method; means here are small
+        limit, k, p = pow(2.718281828459045, -mean), 0, 1.0
+        while True:
+            p *= self.rng.random()
+            if p <= limit:
+                return k
+            k += 1
+    
+    def communication_rows(self, projects, mean):
+        rng = self.rng
+        types, type_weights = weighted(COMMUNICATION_TYPES)
+        for project in projects:
+            for n in range(self.poisson(mean)):
+                communication_type = rng.choices(types, type_weights)[0]
+                yield Communication(
+                    client_id=project.client_id,
+                    project_id=project.pk,
+                    communication_type=communication_type,
+                    direction='internal' if communication_type == 'note' else rng.choice(['inbound', 'outbound']),
+                    subject=f"{'Re: ' if n else ''}{project.title}",
+                    content="Discussed scope, formatting requirements and timeline.",
+                    created_at=min(project.created_at + timedelta(days=n * rng.randint(1, 7)), self.now),
+                )
+    
+    def file_rows(self, projects, mean):
+        rng = self.rng
+        types, type_weights = weighted(FILE_TYPES)
+        for project in projects:
+            for n in range(self.poisson(mean)):
+                file_type = rng.choices(types, type_weights)[0]
+                uploaded_at = min(project.created_at + timedelta(days=n * rng.randint(1, 5)), self.now)
+                filename = f"{file_type}_{project.pk}_{n + 1}.{'pdf' if file_type == 'output' else 'docx'}"
+                yield ProjectFile(
+                    project_id=project.pk,
+                    file_type=file_type,
+                    file=f"project_files/{uploaded_at:%Y/%m}/{filename}",
+                    filename=filename,
+                    version=f"v{n + 1}",
+                    uploaded_at=uploaded_at,
+                )
@@ -0,0 +1,25 @@
+# clients/management/commands/rebuild_revenue_rollup.py
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from reports.rollups import rebuild_revenue_rollup
+
+class Command(BaseCommand):
+    help = 'Rebuild the MonthlyRevenue rollup from completed projects'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only rebuild from this month onwards (YYYY-MM)')
+        parser.add_argument('--database', default='default', help='Database alias to update')
+    
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = datetime.strptime(options['since'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('--since must look like YYYY-MM')
+        
+        created = rebuild_revenue_rollup(since=since, using=options['database'])
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt revenue rollup: {created} month/type rows')
+        )
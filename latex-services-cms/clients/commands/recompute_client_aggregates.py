@@ -0,0 +1,20 @@
+# clients/management/commands/recompute_client_aggregates.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from clients.aggregates import recompute_clients
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized client project totals in a single UPDATE'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--client', type=int, action='append', dest='clients',
+                            help='Only recompute this client id (repeatable)')
+        parser.add_argument('--database', default='default', help='Database alias to update')
+    
+    def handle(self, *args, **options):
+        with transaction.atomic(using=options['database']):
+            updated = recompute_clients(options['clients'], using=options['database'])
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Corrected aggregates on {updated} clients')
+        )
@@ -0,0 +1,274 @@
+# clients/management/commands/run_benchmarks.py
+import json
+import time
+import tracemalloc
+from io import StringIO
+from itertools import count
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client as TestClient
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from clients.models import Client
+from projects.models import Project
+from latex_services.instrumentation import RECENT_REQUESTS, RequestMetrics, recording_queries
+
+# Dataset name -> projects. generate_test_data adds a client per five
+# projects plus its usual communications and files per project.
+DATASETS = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+# Commands write data on every run, so they get fewer repeats
+COMMAND_REPEAT = 5
+
+# Page size for the row fragment cache scenarios (latex_services/fragments.py)
+LONG_PAGE = 500
+
+class Command(BaseCommand):
+    help = 'Benchmark views, admin changelists and commands against seeded datasets'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10k', help='Comma-separated datasets (10k,100k,1m)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per scenario')
+        parser.add_argument('--only', help='Only run scenarios whose name contains this text')
+        parser.add_argument('--output', default='benchmarks.json', help='File to write results to')
+        parser.add_argument('--baseline', help='Earlier results file to compare against')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='p95 slowdown allowed before it counts as a regression (0.2 = 20%%)')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Keep the benchmark database (and its seeded rows) between runs')
+    
+    def handle(self, *args, **options):
+        sizes = [size.strip().lower() for size in options['sizes'].split(',')]
+        unknown = [size for size in sizes if size not in DATASETS]
+        if unknown:
+            raise CommandError(f'Unknown dataset size(s): {", ".join(unknown)}')
+        sizes.sort(key=DATASETS.get)
+        
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+        
+        # Seed a throwaway database, never the one the site runs on
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options['keepdb']
+        )
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=['*'],
+                EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+                QUERY_BUDGETS_STRICT=False,
+                NPLUSONE_MODE='off',
+                # The seeded test database exists on the primary only
+                REPLICA_READS=False,
+            ):
+                results = self.run(sizes, options)
+            vendor = connection.vendor
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+        
+        report = {
+            'created': timezone.now().isoformat(),
+            'database': vendor,
+            'repeat': options['repeat'],
+            'results': results,
+        }
+        # Sorted keys keep successive result files diffable
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+        
+        if baseline:
+            regressions = self.compare(results, baseline['results'], options['tolerance'], options['only'])
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(line))
+            if regressions:
+                raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}')
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+    
+    def run(self, sizes, options):
+        User = get_user_model()
+        user = User.objects.filter(username='benchmark').first() or User.objects.create_superuser(
+            'benchmark', 'benchmark@example.com', 'benchmark'
+        )
+        browser = TestClient()
+        browser.force_login(user)
+        
+        results = {}
+        for size in sizes:
+            self.seed(DATASETS[size])
+            self.stdout.write(f'Dataset {size}:')
+            results[size] = {}
+            for name, func in self.scenarios(browser):
+                if options['only'] and options['only'] not in name:
+                    continue
+                repeat = options['repeat']
+                if name.startswith('command:'):
+                    repeat = min(repeat, COMMAND_REPEAT)
+                try:
+                    result = self.measure(func, repeat)
+                except Exception as e:
+                    result = {'error': f'{type(e).__name__}: {e}'}
+                    self.stdout.write(self.style.WARNING(f'  {name}: {result["error"]}'))
+                else:
+                    self.stdout.write(
+                        f'  {name}: p50 {result["p50_ms"]}ms, p95 {result["p95_ms"]}ms, '
+                        f'{result["queries"]} queries, peak {result["peak_kb"]}KB'
+                        + (f', render p50 {result["render_p50_ms"]}ms' if 'render_p50_ms' in result else '')
+                    )
+                results[size][name] = result
+            self.report_row_cache(results[size])
+        return results
+    
+    def report_row_cache(self, results):
+        # Pair each :cold scenario with its :warm run
+        for name, cold in results.items():
+            warm = results.get(name.replace(':cold', ':warm'))
+            if not name.endswith(':cold') or not warm or 'render_p50_ms' not in cold or 'render_p50_ms' not in warm:
+                continue
+            saved = cold['render_p50_ms'] - warm['render_p50_ms']
+            percent = saved / cold['render_p50_ms'] * 100 if cold['render_p50_ms'] else 0
+            self.stdout.write(
+                f'  {name[:-len(":cold")]}: cached rows save {saved:.1f}ms of render time ({percent:.0f}%)'
+            )
+    
+    def seed(self, projects):
+        # Datasets are cumulative: 100k tops up the 10k rows already there
+        missing = projects - Project.objects.count()
+        if missing <= 0:
+            return
+        self.stdout.write(f'Seeding {missing} projects...')
+        call_command(
+            'generate_test_data', clients=max(1, missing // 5), projects=missing,
+            seed=projects, stdout=StringIO()
+        )
+    
+    def scenarios(self, browser):
+        def get(url):
+            return lambda: browser.get(url)
+        
+        def long_page(url, warm):
+            # Cold renders every row; warm serves them from the fragment cache
+            def run():
+                if not warm:
+                    cache.clear()
+                with override_settings(LIST_PAGE_SIZE=LONG_PAGE):
+                    return browser.get(url)
+            return run
+        
+        client_pk = Client.objects.order_by('-project_count').values_list('pk', flat=True).first()
+        project_pk = Project.objects.order_by('-created_at').values_list('pk', flat=True).first()
+        client_list = reverse('client_list')
+        project_list = reverse('project_list')
+        
+        scenarios = [
+            ('view:client_list', get(client_list)),
+            ('view:client_list?search', get(f'{client_list}?search=smith')),
+            ('view:project_list', get(project_list)),
+        ]
+        for status, label in Project.STATUS_CHOICES:
+            scenarios.append((f'view:project_list?status={status}', get(f'{project_list}?status={status}')))
+        for priority, label in Project.PRIORITY_CHOICES:
+            scenarios.append((f'view:project_list?priority={priority}', get(f'{project_list}?priority={priority}')))
+        scenarios += [
+            ('view:project_list?overdue', get(f'{project_list}?overdue=1')),
+            ('view:work_queue', get(reverse('work_queue'))),
+            ('view:client_detail', get(reverse('client_detail', args=[client_pk]))),
+            ('view:project_detail', get(reverse('project_detail', args=[project_pk]))),
+            ('view:dashboard', get(reverse('dashboard'))),
+            ('view:revenue_report', get(reverse('revenue_report'))),
+            ('view:pipeline_report', get(reverse('pipeline_report'))),
+        ]
+        for view, url in (('client_list', client_list), ('project_list', project_list)):
+            scenarios += [
+                (f'view:{view}?rows={LONG_PAGE}:cold', long_page(url, warm=False)),
+                (f'view:{view}?rows={LONG_PAGE}:warm', long_page(url, warm=True)),
+            ]
+        for model in admin.site._registry:
+            url_name = f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist'
+            scenarios.append((url_name, get(reverse(url_name))))
+        
+        inquiry = count()
+        run_id = int(time.time())
+        
+        def contact_form():
+            return browser.post(reverse('webhook_contact'), data=json.dumps({
+                'name': 'Bench Mark',
+                'email': f'bench{run_id}-{next(inquiry)}@example.com',
+                'project_type': 'quick_fix',
+                'description': 'Benchmark inquiry',
+            }), content_type='application/json')
+        
+        scenarios += [
+            ('view:webhook_contact_form', contact_form),
+            ('command:send_follow_up_emails',
+             lambda: call_command('send_follow_up_emails', dry_run=True, stdout=StringIO())),
+            ('command:generate_test_data',
+             lambda: call_command('generate_test_data', clients=20, projects=100, stdout=StringIO())),
+        ]
+        return scenarios
+    
+    def measure(self, func, repeat):
+        func()  # warm up caches and the connection
+        timings, queries, renders = [], [], []
+        for _ in range(repeat):
+            metrics = RequestMetrics()
+            last_request = RECENT_REQUESTS[-1] if RECENT_REQUESTS else None
+            started = time.perf_counter()
+            with recording_queries(metrics):
+                response = func()
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(metrics.queries)
+            # Views also leave their template render time in the request log
+            if RECENT_REQUESTS and RECENT_REQUESTS[-1] is not last_request:
+                renders.append(RECENT_REQUESTS[-1]['render_ms'])
+            status = getattr(response, 'status_code', 200)
+            if status >= 400:
+                raise CommandError(f'HTTP {status}')
+        
+        # Separate pass: tracing allocations would skew the timings
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        
+        timings.sort()
+        result = {
+            'p50_ms': round(timings[len(timings) // 2], 2),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+            'queries': max(queries),
+            'peak_kb': peak // 1024,
+        }
+        if renders:
+            renders.sort()
+            result['render_p50_ms'] = renders[len(renders) // 2]
+        return result
+    
+    def compare(self, results, baseline, tolerance, only=None):
+        regressions = []
+        for size, scenarios in results.items():
+            # Scenarios that stopped running count too, unless --only skipped them
+            for name in sorted(baseline.get(size, {}).keys() - scenarios.keys()):
+                if not only or only in name:
+                    regressions.append(f'{size} {name}: in the baseline but missing from this run')
+            for name, current in scenarios.items():
+                previous = baseline.get(size, {}).get(name)
+                if not previous or 'error' in previous:
+                    continue
+                if 'error' in current:
+                    regressions.append(f'{size} {name}: now fails ({current["error"]})')
+                    continue
+                slower = current['p95_ms'] > previous['p95_ms'] * (1 + tolerance)
+                if slower or current['queries'] > previous['queries']:
+                    regressions.append(
+                        f'{size} {name}: p95 {previous["p95_ms"]} -> {current["p95_ms"]}ms, '
+                        f'queries {previous["queries"]} -> {current["queries"]}'
+                    )
+        return regressions
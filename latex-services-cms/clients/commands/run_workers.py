@@ -0,0 +1,62 @@
+# clients/management/commands/run_workers.py
+import multiprocessing
+import signal
+import threading
+from django.core.management.base import BaseCommand
+from django.db import connections
+from jobs.worker import worker_process
+
+class Command(BaseCommand):
+    help = 'Run background job workers (processes x threads claiming from the jobs table)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2, help='Worker processes to fork')
+        parser.add_argument('--threads', type=int, default=4, help='Claiming threads per process')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds an idle thread waits before polling again')
+        parser.add_argument('--batch', type=int, default=1, help='Jobs claimed per poll')
+    
+    def handle(self, *args, **options):
+        worker_args = (options['threads'], options['poll_interval'], options['batch'])
+        stop = threading.Event()
+        
+        def shutdown(signum, frame):
+            stop.set()
+        
+        if options['processes'] <= 1:
+            signal.signal(signal.SIGTERM, shutdown)
+            signal.signal(signal.SIGINT, shutdown)
+            self.stdout.write(f'Running {options["threads"]} worker threads')
+            worker_process(*worker_args, stop=stop)
+            return
+        
+        # Children must not inherit the parent's database connections
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=run_child, args=worker_args, daemon=False)
+            for _ in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(
+            f'Running {options["processes"]} worker processes x {options["threads"]} threads'
+        )
+        
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+        while not stop.is_set() and any(process.is_alive() for process in processes):
+            stop.wait(1)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+        
+        self.stdout.write(self.style.SUCCESS('Workers stopped'))
+
+def run_child(threads, poll_interval, batch):
+    stop = threading.Event()
+    # terminate() sends SIGTERM: finish the jobs in hand, then exit
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    worker_process(threads, poll_interval, batch, stop=stop)
@@ -1,69 +1,157 @@
 # clients/management/commands/send_follow_up_emails.py
+from contextlib import nullcontext
+from django.conf import settings
+from django.core.mail import EmailMessage
 from django.core.management.base import BaseCommand
-from django.core.mail import send_mail
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
+from textwrap import dedent
 from clients.models import Client
 from projects.models import Project
+from communications.delivery import Delivery
+from communications.models import EmailLog
 
 class Command(BaseCommand):
     help = 'Send automated follow-up emails'
     
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be sent without sending')
+        parser.add_argument('--batch-size', type=int, default=200, help='Messages built and logged per batch')
+        parser.add_argument('--per-domain-rate', type=int, default=30,
+                            help='Max messages per recipient domain per minute (0 = unlimited)')
+        parser.add_argument('--backend', help='Email backend path (defaults to settings.EMAIL_BACKEND)')
+        parser.add_argument('--enqueue', action='store_true', help='Queue the run for run_workers and return')
+    
     def handle(self, *args, **options):
+        if options['enqueue']:
+            from clients.tasks import send_follow_up_emails
+            job = send_follow_up_emails.enqueue(
+                dry_run=options['dry_run'], batch_size=options['batch_size'],
+                per_domain_rate=options['per_domain_rate'], backend=options['backend'],
+            )
+            self.stdout.write(self.style.SUCCESS(f'Queued follow-up run as job {job.pk if job else "(eager)"}'))
+            return
+        
+        self.dry_run = options['dry_run']
+        self.batch_size = options['batch_size']
+        
         # Follow up on leads after 3 days
         three_days_ago = timezone.now() - timedelta(days=3)
         stale_leads = Client.objects.filter(
             status='lead',
             created_at__lt=three_days_ago,
             last_contact__isnull=True
-        )
-        
-        for client in stale_leads:
-            subject = f"Follow-up: LaTeX Services for {client.institution}"
-            message = f"""
-            Hi {client.first_name},
-            
-            I wanted to follow up on your inquiry about LaTeX services. 
-            
-            I'd love to help you with your project. Would you like to schedule 
-            a quick 15-minute call to discuss your needs?
-            
-            Best regards,
-            David Adams
-            latex@dadams.cc
-            """
-            
-            # In production, you'd actually send the email:
-            # send_mail(subject, message, 'latex@dadams.cc', [client.email])
-            
-            self.stdout.write(f"Would send follow-up to {client.email}")
+        ).only('id', 'first_name', 'email', 'institution')
         
         # Follow up on quotes after 7 days
         week_ago = timezone.now() - timedelta(days=7)
         pending_quotes = Project.objects.filter(
             status='quoted',
             updated_at__lt=week_ago
+        ).select_related('client').only(
+            'id', 'title', 'updated_at', 'client__id', 'client__first_name', 'client__email'
         )
         
-        for project in pending_quotes:
-            subject = f"Quote follow-up: {project.title}"
-            message = f"""
-            Hi {project.client.first_name},
-            
-            I wanted to check if you had any questions about the quote 
-            for "{project.title}".
-            
-            I'm happy to adjust the scope or timeline if needed.
-            
-            Best regards,
-            David Adams
-            """
-            
-            self.stdout.write(f"Would send quote follow-up to {project.client.email}")
+        # Dry runs never open a connection to the mail server
+        delivery = nullcontext() if self.dry_run else Delivery(
+            options['backend'], per_domain_per_minute=options['per_domain_rate']
+        )
+        with delivery:
+            self.delivery = delivery
+            lead_counts = self.process(stale_leads, self.lead_message, mark_contacted=True)
+            quote_counts = self.process(pending_quotes, self.quote_message)
         
+        verb = 'Would send' if self.dry_run else 'Sent'
         self.stdout.write(
             self.style.SUCCESS(
-                f'Processed {stale_leads.count()} lead follow-ups and '
-                f'{pending_quotes.count()} quote follow-ups'
+                f'{verb} {lead_counts["sent"]} lead follow-ups and {quote_counts["sent"]} quote follow-ups '
+                f'({lead_counts["skipped"] + quote_counts["skipped"]} already sent, '
+                f'{lead_counts["failed"] + quote_counts["failed"]} failed)'
             )
         )
+    
+    def lead_message(self, client):
+        subject = f"Follow-up: LaTeX Services for {client.institution}"
+        body = dedent(f"""\
+            Hi {client.first_name},
+
+            I wanted to follow up on your inquiry about LaTeX services.
+
+            I'd love to help you with your project. Would you like to schedule
+            a quick 15-minute call to discuss your needs?
+
+            Best regards,
+            David Adams
+            latex@dadams.cc
+            """)
+        log = EmailLog(
+            kind='lead_follow_up', dedupe_key=f'lead:{client.pk}',
+            client=client, recipient=client.email, subject=subject
+        )
+        return log, body
+    
+    def quote_message(self, project):
+        client = project.client
+        subject = f"Quote follow-up: {project.title}"
+        body = dedent(f"""\
+            Hi {client.first_name},
+
+            I wanted to check if you had any questions about the quote
+            for "{project.title}".
+
+            I'm happy to adjust the scope or timeline if needed.
+
+            Best regards,
+            David Adams
+            """)
+        # Keyed on the quote's last update so a re-sent quote gets its own follow-up
+        log = EmailLog(
+            kind='quote_follow_up', dedupe_key=f'quote:{project.pk}:{project.updated_at.isoformat()}',
+            client=client, project=project, recipient=client.email, subject=subject
+        )
+        return log, body
+    
+    def process(self, queryset, build, mark_contacted=False):
+        counts = {'sent': 0, 'skipped': 0, 'failed': 0}
+        batch = []
+        for obj in queryset.iterator(chunk_size=self.batch_size):
+            batch.append(build(obj))
+            if len(batch) >= self.batch_size:
+                self.send_batch(batch, counts, mark_contacted)
+                batch = []
+        if batch:
+            self.send_batch(batch, counts, mark_contacted)
+        return counts
+    
+    def send_batch(self, batch, counts, mark_contacted):
+        already_sent = set(EmailLog.objects.filter(
+            dedupe_key__in=[log.dedupe_key for log, body in batch], status='sent'
+        ).values_list('dedupe_key', flat=True))
+        pending = [(log, body) for log, body in batch if log.dedupe_key not in already_sent]
+        counts['skipped'] += len(batch) - len(pending)
+        
+        if self.dry_run:
+            for log, body in pending:
+                self.stdout.write(f"Would send {log.get_kind_display().lower()} to {log.recipient}")
+            counts['sent'] += len(pending)
+            return
+        
+        outgoing = [
+            EmailMessage(log.subject, body, settings.DEFAULT_FROM_EMAIL, [log.recipient])
+            for log, body in pending
+        ]
+        
+        logs = []
+        for (log, body), (message, error) in zip(pending, self.delivery.send(outgoing)):
+            log.status = 'failed' if error else 'sent'
+            log.error = str(error) if error else ''
+            counts['failed' if error else 'sent'] += 1
+            logs.append(log)
+        
+        with transaction.atomic():
+            EmailLog.objects.bulk_create(logs)
+            if mark_contacted:
+                Client.objects.filter(
+                    pk__in=[log.client_id for log in logs if log.status == 'sent']
+                ).update(last_contact=timezone.now())
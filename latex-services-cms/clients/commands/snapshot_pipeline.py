@@ -0,0 +1,28 @@
+# clients/management/commands/snapshot_pipeline.py
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from reports.rollups import take_pipeline_snapshot
+
+class Command(BaseCommand):
+    help = 'Record today\'s pipeline stage counts (run daily from cron)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Record the snapshot under this date (YYYY-MM-DD)')
+        parser.add_argument('--database', default='default', help='Database alias to update')
+    
+    def handle(self, *args, **options):
+        date = None
+        if options['date']:
+            try:
+                date = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--date must look like YYYY-MM-DD')
+        
+        snapshots = take_pipeline_snapshot(date=date, using=options['database'])
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Recorded pipeline snapshot for {snapshots[0].date}: '
+                f'{sum(snapshot.count for snapshot in snapshots)} projects across {len(snapshots)} stages'
+            )
+        )
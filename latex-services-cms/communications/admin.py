@@ -1,9 +1,11 @@
 # communications/admin.py
 from django.contrib import admin
+from latex_services.replicas import ReplicaChangelistMixin
+from projects.models import Project
 from .models import Communication
 
 @admin.register(Communication)
-class CommunicationAdmin(admin.ModelAdmin):
+class CommunicationAdmin(ReplicaChangelistMixin, admin.ModelAdmin):
     list_display = [
         'subject', 'client', 'project', 'communication_type', 
         'direction', 'created_at'
@@ -16,6 +18,8 @@ class CommunicationAdmin(admin.ModelAdmin):
         'client__last_name', 'project__title'
     ]
     readonly_fields = ['created_at']
+    # str(project) includes the client's name
+    list_select_related = ['client', 'project__client']
     
     fieldsets = (
         ('Communication Details', {
@@ -29,3 +33,8 @@ class CommunicationAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+    
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'project':
+            kwargs['queryset'] = Project.objects.select_related('client')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
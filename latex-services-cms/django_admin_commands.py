@@ -1,18 +1,19 @@
 # clients/admin.py
 from django.contrib import admin
-from django.db.models import Sum, Count
 from django.utils.html import format_html
+from latex_services.replicas import ReplicaChangelistMixin
+from latex_services.search import search_clients
 from .models import Client
 
 @admin.register(Client)
-class ClientAdmin(admin.ModelAdmin):
+class ClientAdmin(ReplicaChangelistMixin, admin.ModelAdmin):
     list_display = [
         'full_name', 'email', 'institution', 'status', 
         'lead_source', 'project_count', 'lifetime_value_display', 'created_at'
     ]
     list_filter = ['status', 'lead_source', 'created_at', 'institution']
     search_fields = ['first_name', 'last_name', 'email', 'institution']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['created_at', 'updated_at', 'project_count', 'total_value', 'lifetime_value']
     
     fieldsets = (
         ('Personal Information', {
@@ -22,7 +23,10 @@ class ClientAdmin(admin.ModelAdmin):
             'fields': ('institution', 'department', 'title', 'field_of_study')
         }),
         ('Business Information', {
-            'fields': ('status', 'lead_source', 'lifetime_value', 'notes')
+            'fields': ('status', 'lead_source', 'notes')
+        }),
+        ('Project Totals', {
+            'fields': ('project_count', 'total_value', 'lifetime_value')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at', 'last_contact'),
@@ -30,19 +34,19 @@ class ClientAdmin(admin.ModelAdmin):
         }),
     )
     
-    def get_queryset(self, request):
-        return super().get_queryset(request).annotate(
-            project_count=Count('projects'),
-            total_value=Sum('projects__final_amount')
-        )
+    def get_search_results(self, request, queryset, search_term):
+        # Indexed search instead of the icontains scan built from search_fields
+        if not search_term:
+            return queryset, False
+        return search_clients(queryset, search_term, ranked=True), False
     
-    def project_count(self, obj):
-        return obj.project_count
-    project_count.short_description = 'Projects'
-    project_count.admin_order_field = 'project_count'
+    def get_ordering(self, request):
+        if request.GET.get('q'):
+            return ['-search_rank', '-created_at']
+        return super().get_ordering(request)
     
     def lifetime_value_display(self, obj):
-        value = obj.total_value or 0
+        value = obj.total_value
         if value > 0:
             return format_html('<span style="color: green;">${:,.0f}</span>', value)
         return '$0'
@@ -51,17 +55,33 @@ class ClientAdmin(admin.ModelAdmin):
 
 # projects/admin.py
 from django.contrib import admin
+from django.urls import reverse
 from django.utils.html import format_html
 from django.utils import timezone
+from latex_services.replicas import ReplicaChangelistMixin
+from latex_services.search import search_projects
 from .models import Project, ProjectFile
+from .previews import annotate_previews
 
 class ProjectFileInline(admin.TabularInline):
     model = ProjectFile
     extra = 0
-    readonly_fields = ['uploaded_at']
+    readonly_fields = ['preview', 'uploaded_at']
+    
+    def get_queryset(self, request):
+        return annotate_previews(super().get_queryset(request))
+    
+    def preview(self, obj):
+        # Thumbnail from the preview cache, linking to the download
+        if not getattr(obj, 'has_preview', False):
+            return '—'
+        return format_html(
+            '<a href="{}"><img src="{}" alt="Preview of {}" style="max-height: 80px;"></a>',
+            obj.get_absolute_url(), reverse('file_preview', args=[obj.pk]), obj.filename
+        )
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(ReplicaChangelistMixin, admin.ModelAdmin):
     list_display = [
         'title', 'client', 'project_type', 'status_display', 
         'priority_display', 'deadline_display', 'quoted_amount', 'created_at'
@@ -98,6 +118,20 @@ class ProjectAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_deadline_state()
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Indexed search instead of the icontains scan built from search_fields
+        if not search_term:
+            return queryset, False
+        return search_projects(queryset, search_term, ranked=True), False
+    
+    def get_ordering(self, request):
+        if request.GET.get('q'):
+            return ['-search_rank', '-created_at']
+        return super().get_ordering(request)
+    
     def status_display(self, obj):
         colors = {
             'inquiry': 'gray',
@@ -128,17 +162,18 @@ class ProjectAdmin(admin.ModelAdmin):
             color, obj.get_priority_display()
         )
     priority_display.short_description = 'Priority'
+    priority_display.admin_order_field = 'priority_rank'
     
     def deadline_display(self, obj):
         if not obj.deadline:
             return 'No deadline'
         
-        if obj.deadline < timezone.now():
+        if obj.is_overdue:
             return format_html(
                 '<span style="color: red; font-weight: bold;">{} (OVERDUE)</span>',
                 obj.deadline.strftime('%Y-%m-%d')
             )
-        elif (obj.deadline - timezone.now()).days <= 3:
+        elif obj.is_due_soon:
             return format_html(
                 '<span style="color: orange; font-weight: bold;">{} (DUE SOON)</span>',
                 obj.deadline.strftime('%Y-%m-%d')
@@ -146,19 +181,29 @@ class ProjectAdmin(admin.ModelAdmin):
         else:
             return obj.deadline.strftime('%Y-%m-%d')
     deadline_display.short_description = 'Deadline'
+    deadline_display.admin_order_field = 'deadline'
 
 @admin.register(ProjectFile)
-class ProjectFileAdmin(admin.ModelAdmin):
+class ProjectFileAdmin(ReplicaChangelistMixin, admin.ModelAdmin):
     list_display = ['filename', 'project', 'file_type', 'version', 'uploaded_at']
     list_filter = ['file_type', 'uploaded_at']
     search_fields = ['filename', 'description', 'project__title']
+    # str(project) includes the client's name
+    list_select_related = ['project__client']
+    
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'project':
+            kwargs['queryset'] = Project.objects.select_related('client')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 # communications/admin.py
 from django.contrib import admin
+from latex_services.replicas import ReplicaChangelistMixin
+from projects.models import Project
 from .models import Communication
 
 @admin.register(Communication)
-class CommunicationAdmin(admin.ModelAdmin):
+class CommunicationAdmin(ReplicaChangelistMixin, admin.ModelAdmin):
     list_display = [
         'subject', 'client', 'project', 'communication_type', 
         'direction', 'created_at'
@@ -171,6 +216,8 @@ class CommunicationAdmin(admin.ModelAdmin):
         'client__last_name', 'project__title'
     ]
     readonly_fields = ['created_at']
+    # str(project) includes the client's name
+    list_select_related = ['client', 'project__client']
     
     fieldsets = (
         ('Communication Details', {
@@ -184,6 +231,11 @@ class CommunicationAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+    
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'project':
+            kwargs['queryset'] = Project.objects.select_related('client')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 # ===== MANAGEMENT COMMANDS =====
 
@@ -194,223 +246,1458 @@ class CommunicationAdmin(admin.ModelAdmin):
 # (empty file)
 
 # clients/management/commands/generate_test_data.py
+from array import array
+from contextlib import contextmanager
 from django.core.management.base import BaseCommand
-from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Max
 from django.utils import timezone
 from datetime import timedelta
+from decimal import Decimal
 import random
+import time
+from clients.aggregates import recompute_clients
 from clients.models import Client
-from projects.models import Project
+from projects.models import Project, ProjectFile
 from communications.models import Communication
+from latex_services.stats_cache import invalidate_dashboard_stats
+from reports.rollups import rebuild_revenue_rollup
+
+# Sample data
+INSTITUTIONS = [
+    'MIT', 'Stanford University', 'UC Berkeley', 'Harvard University',
+    'University of Chicago', 'Yale University', 'Princeton University',
+    'Columbia University', 'University of Michigan', 'Cornell University'
+]
+
+DEPARTMENTS = [
+    'Computer Science', 'Economics', 'Political Science', 'Psychology',
+    'Mathematics', 'Physics', 'Biology', 'Chemistry', 'Statistics',
+    'Public Policy', 'Sociology', 'Philosophy'
+]
+
+FIRST_NAMES = [
+    'James', 'Maria', 'John', 'Sarah', 'Michael', 'Jennifer', 'David',
+    'Lisa', 'Robert', 'Karen', 'William', 'Nancy', 'Richard', 'Betty'
+]
+
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller',
+    'Davis', 'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez'
+]
+
+PROJECT_TITLES = [
+    'Machine Learning in Healthcare Applications',
+    'Economic Impact of Climate Change Policies',
+    'Social Media Influence on Political Behavior',
+    'Quantum Computing Applications in Cryptography',
+    'Behavioral Economics and Consumer Decision Making',
+    'Neural Networks for Natural Language Processing',
+    'Public Policy Analysis Framework',
+    'Statistical Methods for Big Data Analysis'
+]
+
+JOURNALS = [
+    'Nature', 'Science', 'PNAS', 'American Economic Review',
+    'American Political Science Review', 'Journal of Marketing Research'
+]
+
+# (value, weight) pairs, roughly what the real pipeline looks like
+CLIENT_STATUSES = [('lead', 40), ('contacted', 20), ('active', 20), ('completed', 15), ('inactive', 5)]
+LEAD_SOURCES = [('website', 50), ('referral', 20), ('twitter', 10), ('bluesky', 5), ('conference', 10), ('email', 5)]
+PROJECT_STATUSES = [
+    ('inquiry', 20), ('quoted', 15), ('approved', 5), ('in_progress', 10),
+    ('review', 5), ('completed', 40), ('cancelled', 5)
+]
+PROJECT_TYPES = [('quick_fix', 35), ('standard_conversion', 40), ('premium_workflow', 20), ('custom', 5)]
+QUOTES = {
+    'quick_fix': [200],
+    'standard_conversion': [400, 500, 600],
+    'premium_workflow': [800, 1000, 1200],
+    'custom': [600, 1500, 2500],
+}
+PRIORITIES = [('low', 15), ('normal', 60), ('high', 20), ('urgent', 5)]
+COMMUNICATION_TYPES = [('email', 70), ('call', 10), ('meeting', 5), ('note', 15)]
+FILE_TYPES = [('source', 40), ('output', 30), ('reference', 15), ('revision', 15)]
+
+def weighted(choices):
+    values, weights = zip(*choices)
+    return values, weights
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created_at/uploaded_at values we generate"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
 
 class Command(BaseCommand):
-    help = 'Generate test data for development'
+    help = 'Generate test data for development and load testing'
     
     def add_arguments(self, parser):
         parser.add_argument('--clients', type=int, default=20, help='Number of clients to create')
         parser.add_argument('--projects', type=int, default=30, help='Number of projects to create')
+        parser.add_argument('--communications', type=float, default=2.0,
+                            help='Average communications per project')
+        parser.add_argument('--files', type=float, default=1.5, help='Average files per project')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT')
+        parser.add_argument('--seed', type=int, help='Random seed for a reproducible dataset')
     
     def handle(self, *args, **options):
-        # Sample data
-        institutions = [
-            'MIT', 'Stanford University', 'UC Berkeley', 'Harvard University',
-            'University of Chicago', 'Yale University', 'Princeton University',
-            'Columbia University', 'University of Michigan', 'Cornell University'
-        ]
-        
-        departments = [
-            'Computer Science', 'Economics', 'Political Science', 'Psychology',
-            'Mathematics', 'Physics', 'Biology', 'Chemistry', 'Statistics',
-            'Public Policy', 'Sociology', 'Philosophy'
-        ]
-        
-        first_names = [
-            'James', 'Maria', 'John', 'Sarah', 'Michael', 'Jennifer', 'David',
-            'Lisa', 'Robert', 'Karen', 'William', 'Nancy', 'Richard', 'Betty'
-        ]
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.batch_size = options['batch_size']
+        started = time.monotonic()
         
-        last_names = [
-            'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller',
-            'Davis', 'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez'
-        ]
-        
-        project_titles = [
-            'Machine Learning in Healthcare Applications',
-            'Economic Impact of Climate Change Policies',
-            'Social Media Influence on Political Behavior',
-            'Quantum Computing Applications in Cryptography',
-            'Behavioral Economics and Consumer Decision Making',
-            'Neural Networks for Natural Language Processing',
-            'Public Policy Analysis Framework',
-            'Statistical Methods for Big Data Analysis'
-        ]
-        
-        # Create clients
-        self.stdout.write('Creating clients...')
-        for i in range(options['clients']):
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
-            
-            client = Client.objects.create(
-                first_name=first_name,
-                last_name=last_name,
-                email=f"{first_name.lower()}.{last_name.lower()}{i}@university.edu",
-                institution=random.choice(institutions),
-                department=random.choice(departments),
-                title=random.choice(['PhD Candidate', 'Professor', 'Associate Professor', 'Postdoc']),
-                field_of_study=random.choice(departments),
-                status=random.choice(['lead', 'active', 'completed']),
-                lead_source=random.choice(['website', 'referral', 'twitter', 'conference']),
-                created_at=timezone.now() - timedelta(days=random.randint(1, 365))
-            )
-        
-        # Create projects
-        self.stdout.write('Creating projects...')
-        clients = list(Client.objects.all())
-        
-        for i in range(options['projects']):
-            client = random.choice(clients)
+        with explicit_timestamps(Client, Project, ProjectFile, Communication):
+            self.stdout.write('Creating clients...')
+            client_ids = self.create_clients(options['clients'])
             
-            project = Project.objects.create(
-                client=client,
-                title=random.choice(project_titles),
-                project_type=random.choice(['quick_fix', 'standard_conversion', 'premium_workflow']),
-                description=f"Academic project requiring LaTeX formatting and conversion services.",
-                status=random.choice(['inquiry', 'quoted', 'in_progress', 'completed']),
-                priority=random.choice(['low', 'normal', 'high', 'urgent']),
-                quoted_amount=random.choice([200, 400, 600, 800, 1200]),
-                deadline=timezone.now() + timedelta(days=random.randint(1, 30)),
-                source_format=random.choice(['Word', 'LaTeX', 'Markdown']),
-                target_journal=random.choice([
-                    'Nature', 'Science', 'PNAS', 'American Economic Review',
-                    'American Political Science Review', 'Journal of Marketing Research'
-                ]),
-                created_at=timezone.now() - timedelta(days=random.randint(1, 180))
+            self.stdout.write('Creating projects, communications and files...')
+            totals = self.create_projects(
+                client_ids, options['projects'], options['communications'], options['files']
             )
         
-        # Update client lifetime values
-        for client in Client.objects.all():
-            total_value = client.projects.filter(
-                status='completed'
-            ).aggregate(total=models.Sum('final_amount'))['total'] or 0
-            client.lifetime_value = total_value
-            client.save()
+        # bulk_create skips Project.save(), so derive the denormalized data set-based
+        self.stdout.write('Updating client aggregates and revenue rollup...')
+        recompute_clients()
+        rebuild_revenue_rollup()
+        invalidate_dashboard_stats()
         
         self.stdout.write(
             self.style.SUCCESS(
-                f'Successfully created {options["clients"]} clients and {options["projects"]} projects'
+                f'Successfully created {len(client_ids)} clients, {totals["projects"]} projects, '
+                f'{totals["communications"]} communications and {totals["files"]} files '
+                f'in {time.monotonic() - started:.1f}s'
             )
         )
+    
+    def batches(self, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def create_clients(self, count):
+        rng = self.rng
+        statuses, status_weights = weighted(CLIENT_STATUSES)
+        sources, source_weights = weighted(LEAD_SOURCES)
+        # Keep emails unique across repeated runs
+        offset = (Client.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+        
+        def rows():
+            for i in range(offset, offset + count):
+                first_name = rng.choice(FIRST_NAMES)
+                last_name = rng.choice(LAST_NAMES)
+                department = rng.choice(DEPARTMENTS)
+                created_at = self.now - timedelta(days=rng.randint(1, 730), seconds=rng.randint(0, 86399))
+                yield Client(
+                    first_name=first_name,
+                    last_name=last_name,
+                    email=f"{first_name.lower()}.{last_name.lower()}{i}@university.edu",
+                    institution=rng.choice(INSTITUTIONS),
+                    department=department,
+                    title=rng.choice(['PhD Candidate', 'Professor', 'Associate Professor', 'Postdoc']),
+                    field_of_study=department,
+                    status=rng.choices(statuses, status_weights)[0],
+                    lead_source=rng.choices(sources, source_weights)[0],
+                    created_at=created_at,
+                    last_contact=created_at + timedelta(days=rng.randint(0, 30)) if rng.random() < 0.6 else None,
+                )
+        
+        # Only the ids are kept (8 bytes per client) to assign projects
+        client_ids = array('q')
+        for batch in self.batches(rows()):
+            with transaction.atomic():
+                client_ids.extend(client.pk for client in Client.objects.bulk_create(batch))
+        return client_ids
+    
+    def create_projects(self, client_ids, count, communications_per_project, files_per_project):
+        totals = {'projects': 0, 'communications': 0, 'files': 0}
+        if not client_ids:
+            return totals
+        
+        rng = self.rng
+        statuses, status_weights = weighted(PROJECT_STATUSES)
+        types, type_weights = weighted(PROJECT_TYPES)
+        priorities, priority_weights = weighted(PRIORITIES)
+        
+        def rows():
+            for _ in range(count):
+                status = rng.choices(statuses, status_weights)[0]
+                project_type = rng.choices(types, type_weights)[0]
+                quoted_amount = Decimal(rng.choice(QUOTES[project_type]))
+                created_at = self.now - timedelta(days=rng.randint(1, 540), seconds=rng.randint(0, 86399))
+                started_at = completed_at = final_amount = None
+                if status in ('in_progress', 'review', 'completed'):
+                    started_at = created_at + timedelta(days=rng.randint(1, 14))
+                if status == 'completed':
+                    completed_at = min(started_at + timedelta(days=rng.randint(2, 30)), self.now)
+                    final_amount = quoted_amount + Decimal(rng.choice([0, 0, 0, 50, 100, -50]))
+                yield Project(
+                    client_id=rng.choice(client_ids),
+                    title=rng.choice(PROJECT_TITLES),
+                    project_type=project_type,
+                    description="Academic project requiring LaTeX formatting and conversion services.",
+                    status=status,
+                    priority=rng.choices(priorities, priority_weights)[0],
+                    quoted_amount=quoted_amount,
+                    final_amount=final_amount,
+                    paid=status == 'completed' and rng.random() < 0.9,
+                    deadline=created_at + timedelta(days=rng.randint(7, 60)),
+                    source_format=rng.choice(['Word', 'LaTeX', 'Markdown']),
+                    target_journal=rng.choice(JOURNALS),
+                    created_at=created_at,
+                    started_at=started_at,
+                    completed_at=completed_at,
+                )
+        
+        for batch in self.batches(rows()):
+            with transaction.atomic():
+                projects = Project.objects.bulk_create(batch)
+                communications = list(self.communication_rows(projects, communications_per_project))
+                files = list(self.file_rows(projects, files_per_project))
+                Communication.objects.bulk_create(communications, batch_size=self.batch_size)
+                ProjectFile.objects.bulk_create(files, batch_size=self.batch_size)
+            totals['projects'] += len(projects)
+            totals['communications'] += len(communications)
+            totals['files'] += len(files)
+            self.stdout.write(f'  {totals["projects"]}/{count} projects')
+        return totals
+    
+    def poisson(self, mean):
+        # Knuth's method; means here are small
+        limit, k, p = pow(2.718281828459045, -mean), 0, 1.0
+        while True:
+            p *= self.rng.random()
+            if p <= limit:
+                return k
+            k += 1
+    
+    def communication_rows(self, projects, mean):
+        rng = self.rng
+        types, type_weights = weighted(COMMUNICATION_TYPES)
+        for project in projects:
+            for n in range(self.poisson(mean)):
+                communication_type = rng.choices(types, type_weights)[0]
+                yield Communication(
+                    client_id=project.client_id,
+                    project_id=project.pk,
+                    communication_type=communication_type,
+                    direction='internal' if communication_type == 'note' else rng.choice(['inbound', 'outbound']),
+                    subject=f"{'Re: ' if n else ''}{project.title}",
+                    content="Discussed scope, formatting requirements and timeline.",
+                    created_at=min(project.created_at + timedelta(days=n * rng.randint(1, 7)), self.now),
+                )
+    
+    def file_rows(self, projects, mean):
+        rng = self.rng
+        types, type_weights = weighted(FILE_TYPES)
+        for project in projects:
+            for n in range(self.poisson(mean)):
+                file_type = rng.choices(types, type_weights)[0]
+                uploaded_at = min(project.created_at + timedelta(days=n * rng.randint(1, 5)), self.now)
+                filename = f"{file_type}_{project.pk}_{n + 1}.{'pdf' if file_type == 'output' else 'docx'}"
+                yield ProjectFile(
+                    project_id=project.pk,
+                    file_type=file_type,
+                    file=f"project_files/{uploaded_at:%Y/%m}/{filename}",
+                    filename=filename,
+                    version=f"v{n + 1}",
+                    uploaded_at=uploaded_at,
+                )
 
 # clients/management/commands/send_follow_up_emails.py
+from contextlib import nullcontext
+from django.conf import settings
+from django.core.mail import EmailMessage
 from django.core.management.base import BaseCommand
-from django.core.mail import send_mail
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
+from textwrap import dedent
 from clients.models import Client
 from projects.models import Project
+from communications.delivery import Delivery
+from communications.models import EmailLog
 
 class Command(BaseCommand):
     help = 'Send automated follow-up emails'
     
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be sent without sending')
+        parser.add_argument('--batch-size', type=int, default=200, help='Messages built and logged per batch')
+        parser.add_argument('--per-domain-rate', type=int, default=30,
+                            help='Max messages per recipient domain per minute (0 = unlimited)')
+        parser.add_argument('--backend', help='Email backend path (defaults to settings.EMAIL_BACKEND)')
+        parser.add_argument('--enqueue', action='store_true', help='Queue the run for run_workers and return')
+    
     def handle(self, *args, **options):
+        if options['enqueue']:
+            from clients.tasks import send_follow_up_emails
+            job = send_follow_up_emails.enqueue(
+                dry_run=options['dry_run'], batch_size=options['batch_size'],
+                per_domain_rate=options['per_domain_rate'], backend=options['backend'],
+            )
+            self.stdout.write(self.style.SUCCESS(f'Queued follow-up run as job {job.pk if job else "(eager)"}'))
+            return
+        
+        self.dry_run = options['dry_run']
+        self.batch_size = options['batch_size']
+        
         # Follow up on leads after 3 days
         three_days_ago = timezone.now() - timedelta(days=3)
         stale_leads = Client.objects.filter(
             status='lead',
             created_at__lt=three_days_ago,
             last_contact__isnull=True
-        )
-        
-        for client in stale_leads:
-            subject = f"Follow-up: LaTeX Services for {client.institution}"
-            message = f"""
-            Hi {client.first_name},
-            
-            I wanted to follow up on your inquiry about LaTeX services. 
-            
-            I'd love to help you with your project. Would you like to schedule 
-            a quick 15-minute call to discuss your needs?
-            
-            Best regards,
-            David Adams
-            latex@dadams.cc
-            """
-            
-            # In production, you'd actually send the email:
-            # send_mail(subject, message, 'latex@dadams.cc', [client.email])
-            
-            self.stdout.write(f"Would send follow-up to {client.email}")
+        ).only('id', 'first_name', 'email', 'institution')
         
         # Follow up on quotes after 7 days
         week_ago = timezone.now() - timedelta(days=7)
         pending_quotes = Project.objects.filter(
             status='quoted',
             updated_at__lt=week_ago
+        ).select_related('client').only(
+            'id', 'title', 'updated_at', 'client__id', 'client__first_name', 'client__email'
         )
         
-        for project in pending_quotes:
-            subject = f"Quote follow-up: {project.title}"
-            message = f"""
-            Hi {project.client.first_name},
-            
-            I wanted to check if you had any questions about the quote 
+        # Dry runs never open a connection to the mail server
+        delivery = nullcontext() if self.dry_run else Delivery(
+            options['backend'], per_domain_per_minute=options['per_domain_rate']
+        )
+        with delivery:
+            self.delivery = delivery
+            lead_counts = self.process(stale_leads, self.lead_message, mark_contacted=True)
+            quote_counts = self.process(pending_quotes, self.quote_message)
+        
+        verb = 'Would send' if self.dry_run else 'Sent'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{verb} {lead_counts["sent"]} lead follow-ups and {quote_counts["sent"]} quote follow-ups '
+                f'({lead_counts["skipped"] + quote_counts["skipped"]} already sent, '
+                f'{lead_counts["failed"] + quote_counts["failed"]} failed)'
+            )
+        )
+    
+    def lead_message(self, client):
+        subject = f"Follow-up: LaTeX Services for {client.institution}"
+        body = dedent(f"""\
+            Hi {client.first_name},
+
+            I wanted to follow up on your inquiry about LaTeX services.
+
+            I'd love to help you with your project. Would you like to schedule
+            a quick 15-minute call to discuss your needs?
+
+            Best regards,
+            David Adams
+            latex@dadams.cc
+            """)
+        log = EmailLog(
+            kind='lead_follow_up', dedupe_key=f'lead:{client.pk}',
+            client=client, recipient=client.email, subject=subject
+        )
+        return log, body
+    
+    def quote_message(self, project):
+        client = project.client
+        subject = f"Quote follow-up: {project.title}"
+        body = dedent(f"""\
+            Hi {client.first_name},
+
+            I wanted to check if you had any questions about the quote
             for "{project.title}".
-            
+
             I'm happy to adjust the scope or timeline if needed.
-            
+
             Best regards,
             David Adams
-            """
-            
-            self.stdout.write(f"Would send quote follow-up to {project.client.email}")
+            """)
+        # Keyed on the quote's last update so a re-sent quote gets its own follow-up
+        log = EmailLog(
+            kind='quote_follow_up', dedupe_key=f'quote:{project.pk}:{project.updated_at.isoformat()}',
+            client=client, project=project, recipient=client.email, subject=subject
+        )
+        return log, body
+    
+    def process(self, queryset, build, mark_contacted=False):
+        counts = {'sent': 0, 'skipped': 0, 'failed': 0}
+        batch = []
+        for obj in queryset.iterator(chunk_size=self.batch_size):
+            batch.append(build(obj))
+            if len(batch) >= self.batch_size:
+                self.send_batch(batch, counts, mark_contacted)
+                batch = []
+        if batch:
+            self.send_batch(batch, counts, mark_contacted)
+        return counts
+    
+    def send_batch(self, batch, counts, mark_contacted):
+        already_sent = set(EmailLog.objects.filter(
+            dedupe_key__in=[log.dedupe_key for log, body in batch], status='sent'
+        ).values_list('dedupe_key', flat=True))
+        pending = [(log, body) for log, body in batch if log.dedupe_key not in already_sent]
+        counts['skipped'] += len(batch) - len(pending)
+        
+        if self.dry_run:
+            for log, body in pending:
+                self.stdout.write(f"Would send {log.get_kind_display().lower()} to {log.recipient}")
+            counts['sent'] += len(pending)
+            return
+        
+        outgoing = [
+            EmailMessage(log.subject, body, settings.DEFAULT_FROM_EMAIL, [log.recipient])
+            for log, body in pending
+        ]
+        
+        logs = []
+        for (log, body), (message, error) in zip(pending, self.delivery.send(outgoing)):
+            log.status = 'failed' if error else 'sent'
+            log.error = str(error) if error else ''
+            counts['failed' if error else 'sent'] += 1
+            logs.append(log)
+        
+        with transaction.atomic():
+            EmailLog.objects.bulk_create(logs)
+            if mark_contacted:
+                Client.objects.filter(
+                    pk__in=[log.client_id for log in logs if log.status == 'sent']
+                ).update(last_contact=timezone.now())
+
+# clients/management/commands/recompute_client_aggregates.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from clients.aggregates import recompute_clients
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized client project totals in a single UPDATE'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--client', type=int, action='append', dest='clients',
+                            help='Only recompute this client id (repeatable)')
+        parser.add_argument('--database', default='default', help='Database alias to update')
+    
+    def handle(self, *args, **options):
+        with transaction.atomic(using=options['database']):
+            updated = recompute_clients(options['clients'], using=options['database'])
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Corrected aggregates on {updated} clients')
+        )
+
+# clients/management/commands/rebuild_revenue_rollup.py
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from reports.rollups import rebuild_revenue_rollup
+
+class Command(BaseCommand):
+    help = 'Rebuild the MonthlyRevenue rollup from completed projects'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only rebuild from this month onwards (YYYY-MM)')
+        parser.add_argument('--database', default='default', help='Database alias to update')
+    
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = datetime.strptime(options['since'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('--since must look like YYYY-MM')
+        
+        created = rebuild_revenue_rollup(since=since, using=options['database'])
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt revenue rollup: {created} month/type rows')
+        )
+
+# clients/management/commands/snapshot_pipeline.py
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from reports.rollups import take_pipeline_snapshot
+
+class Command(BaseCommand):
+    help = 'Record today\'s pipeline stage counts (run daily from cron)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Record the snapshot under this date (YYYY-MM-DD)')
+        parser.add_argument('--database', default='default', help='Database alias to update')
+    
+    def handle(self, *args, **options):
+        date = None
+        if options['date']:
+            try:
+                date = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--date must look like YYYY-MM-DD')
+        
+        snapshots = take_pipeline_snapshot(date=date, using=options['database'])
         
         self.stdout.write(
             self.style.SUCCESS(
-                f'Processed {stale_leads.count()} lead follow-ups and '
-                f'{pending_quotes.count()} quote follow-ups'
+                f'Recorded pipeline snapshot for {snapshots[0].date}: '
+                f'{sum(snapshot.count for snapshot in snapshots)} projects across {len(snapshots)} stages'
+            )
+        )
+
+# clients/management/commands/run_workers.py
+import multiprocessing
+import signal
+import threading
+from django.core.management.base import BaseCommand
+from django.db import connections
+from jobs.worker import worker_process
+
+class Command(BaseCommand):
+    help = 'Run background job workers (processes x threads claiming from the jobs table)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2, help='Worker processes to fork')
+        parser.add_argument('--threads', type=int, default=4, help='Claiming threads per process')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds an idle thread waits before polling again')
+        parser.add_argument('--batch', type=int, default=1, help='Jobs claimed per poll')
+    
+    def handle(self, *args, **options):
+        worker_args = (options['threads'], options['poll_interval'], options['batch'])
+        stop = threading.Event()
+        
+        def shutdown(signum, frame):
+            stop.set()
+        
+        if options['processes'] <= 1:
+            signal.signal(signal.SIGTERM, shutdown)
+            signal.signal(signal.SIGINT, shutdown)
+            self.stdout.write(f'Running {options["threads"]} worker threads')
+            worker_process(*worker_args, stop=stop)
+            return
+        
+        # Children must not inherit the parent's database connections
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=run_child, args=worker_args, daemon=False)
+            for _ in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(
+            f'Running {options["processes"]} worker processes x {options["threads"]} threads'
+        )
+        
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+        while not stop.is_set() and any(process.is_alive() for process in processes):
+            stop.wait(1)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+        
+        self.stdout.write(self.style.SUCCESS('Workers stopped'))
+
+def run_child(threads, poll_interval, batch):
+    stop = threading.Event()
+    # terminate() sends SIGTERM: finish the jobs in hand, then exit
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    worker_process(threads, poll_interval, batch, stop=stop)
+
+# clients/management/commands/clean_stale_uploads.py
+import os
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from projects.models import FileUpload
+from projects.uploads import discard_upload, place_part_file
+
+class Command(BaseCommand):
+    help = 'Delete chunked uploads that stopped receiving chunks, and finish moving completed ones'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=48, help='Idle time before an upload is abandoned')
+    
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = FileUpload.objects.filter(status='open', updated_at__lt=cutoff)
+        removed = 0
+        for upload in stale.iterator():
+            discard_upload(upload)
+            removed += 1
+        
+        # Part files of completed uploads are moved after their commit; one
+        # still here a while later means the process stopped in between
+        placed = 0
+        settled = timezone.now() - timedelta(minutes=10)
+        if os.path.isdir(settings.CHUNKED_UPLOAD_DIR):
+            with os.scandir(settings.CHUNKED_UPLOAD_DIR) as entries:
+                upload_ids = [entry.name[:-len('.part')] for entry in entries if entry.name.endswith('.part')]
+            completed = FileUpload.objects.filter(
+                pk__in=upload_ids, status='complete', project_file__isnull=False, updated_at__lt=settled
+            ).select_related('project_file')
+            for upload in completed:
+                place_part_file(upload, upload.project_file)
+                placed += 1
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} stale uploads; moved {placed} completed uploads into place'))
+
+# clients/management/commands/gc_project_files.py
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from projects.models import ProjectFile
+from projects.storage import BLOB_PREFIX
+
+class Command(BaseCommand):
+    help = 'Delete stored project files that no ProjectFile references'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default=BLOB_PREFIX,
+                            help='Storage directory to sweep (blobs, or project_files for pre-blob uploads)')
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help='Leave files younger than this (uploads still being saved)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Files checked per query')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted')
+    
+    def handle(self, *args, **options):
+        self.storage = ProjectFile._meta.get_field('file').storage
+        root = self.storage.path(options['prefix'])
+        if not os.path.isdir(root):
+            raise CommandError(f'{root} is not a directory')
+        self.cutoff = time.time() - options['grace_hours'] * 3600
+        
+        kept = removed = reclaimed = 0
+        for batch in self.batches(self.walk(root), options['batch_size']):
+            referenced = set(
+                ProjectFile.objects.filter(file__in=[name for name, path, size in batch])
+                .values_list('file', flat=True)
             )
+            for name, path, size in batch:
+                if name in referenced:
+                    kept += 1
+                    continue
+                # An upload may have deduplicated onto this blob since the walk
+                # (ContentAddressedStorage._store touches it) and not yet
+                # committed its row: check the mtime again, after the query
+                try:
+                    if os.stat(path).st_mtime >= self.cutoff:
+                        kept += 1
+                        continue
+                except FileNotFoundError:
+                    continue
+                if not options['dry_run']:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        continue
+                removed += 1
+                reclaimed += size
+        
+        verb = 'Would remove' if options['dry_run'] else 'Removed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {removed} unreferenced files ({reclaimed / 1024 / 1024:.1f}MB), kept {kept}'
+        ))
+    
+    def walk(self, directory):
+        """Yield (name, path, size) of files past the grace period, one directory open at a time"""
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self.walk(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat()
+                    if stat.st_mtime < self.cutoff:
+                        name = os.path.relpath(entry.path, self.storage.location).replace(os.sep, '/')
+                        yield name, entry.path, stat.st_size
+    
+    def batches(self, rows, size):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+# clients/management/commands/run_benchmarks.py
+import json
+import time
+import tracemalloc
+from io import StringIO
+from itertools import count
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client as TestClient
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from clients.models import Client
+from projects.models import Project
+from latex_services.instrumentation import RECENT_REQUESTS, RequestMetrics, recording_queries
+
+# Dataset name -> projects. generate_test_data adds a client per five
+# projects plus its usual communications and files per project.
+DATASETS = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+# Commands write data on every run, so they get fewer repeats
+COMMAND_REPEAT = 5
+
+# Page size for the row fragment cache scenarios (latex_services/fragments.py)
+LONG_PAGE = 500
+
+class Command(BaseCommand):
+    help = 'Benchmark views, admin changelists and commands against seeded datasets'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10k', help='Comma-separated datasets (10k,100k,1m)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per scenario')
+        parser.add_argument('--only', help='Only run scenarios whose name contains this text')
+        parser.add_argument('--output', default='benchmarks.json', help='File to write results to')
+        parser.add_argument('--baseline', help='Earlier results file to compare against')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='p95 slowdown allowed before it counts as a regression (0.2 = 20%%)')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Keep the benchmark database (and its seeded rows) between runs')
+    
+    def handle(self, *args, **options):
+        sizes = [size.strip().lower() for size in options['sizes'].split(',')]
+        unknown = [size for size in sizes if size not in DATASETS]
+        if unknown:
+            raise CommandError(f'Unknown dataset size(s): {", ".join(unknown)}')
+        sizes.sort(key=DATASETS.get)
+        
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+        
+        # Seed a throwaway database, never the one the site runs on
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options['keepdb']
         )
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=['*'],
+                EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+                QUERY_BUDGETS_STRICT=False,
+                NPLUSONE_MODE='off',
+                # The seeded test database exists on the primary only
+                REPLICA_READS=False,
+            ):
+                results = self.run(sizes, options)
+            vendor = connection.vendor
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+        
+        report = {
+            'created': timezone.now().isoformat(),
+            'database': vendor,
+            'repeat': options['repeat'],
+            'results': results,
+        }
+        # Sorted keys keep successive result files diffable
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+        
+        if baseline:
+            regressions = self.compare(results, baseline['results'], options['tolerance'], options['only'])
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(line))
+            if regressions:
+                raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}')
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+    
+    def run(self, sizes, options):
+        User = get_user_model()
+        user = User.objects.filter(username='benchmark').first() or User.objects.create_superuser(
+            'benchmark', 'benchmark@example.com', 'benchmark'
+        )
+        browser = TestClient()
+        browser.force_login(user)
+        
+        results = {}
+        for size in sizes:
+            self.seed(DATASETS[size])
+            self.stdout.write(f'Dataset {size}:')
+            results[size] = {}
+            for name, func in self.scenarios(browser):
+                if options['only'] and options['only'] not in name:
+                    continue
+                repeat = options['repeat']
+                if name.startswith('command:'):
+                    repeat = min(repeat, COMMAND_REPEAT)
+                try:
+                    result = self.measure(func, repeat)
+                except Exception as e:
+                    result = {'error': f'{type(e).__name__}: {e}'}
+                    self.stdout.write(self.style.WARNING(f'  {name}: {result["error"]}'))
+                else:
+                    self.stdout.write(
+                        f'  {name}: p50 {result["p50_ms"]}ms, p95 {result["p95_ms"]}ms, '
+                        f'{result["queries"]} queries, peak {result["peak_kb"]}KB'
+                        + (f', render p50 {result["render_p50_ms"]}ms' if 'render_p50_ms' in result else '')
+                    )
+                results[size][name] = result
+            self.report_row_cache(results[size])
+        return results
+    
+    def report_row_cache(self, results):
+        # Pair each :cold scenario with its :warm run
+        for name, cold in results.items():
+            warm = results.get(name.replace(':cold', ':warm'))
+            if not name.endswith(':cold') or not warm or 'render_p50_ms' not in cold or 'render_p50_ms' not in warm:
+                continue
+            saved = cold['render_p50_ms'] - warm['render_p50_ms']
+            percent = saved / cold['render_p50_ms'] * 100 if cold['render_p50_ms'] else 0
+            self.stdout.write(
+                f'  {name[:-len(":cold")]}: cached rows save {saved:.1f}ms of render time ({percent:.0f}%)'
+            )
+    
+    def seed(self, projects):
+        # Datasets are cumulative: 100k tops up the 10k rows already there
+        missing = projects - Project.objects.count()
+        if missing <= 0:
+            return
+        self.stdout.write(f'Seeding {missing} projects...')
+        call_command(
+            'generate_test_data', clients=max(1, missing // 5), projects=missing,
+            seed=projects, stdout=StringIO()
+        )
+    
+    def scenarios(self, browser):
+        def get(url):
+            return lambda: browser.get(url)
+        
+        def long_page(url, warm):
+            # Cold renders every row; warm serves them from the fragment cache
+            def run():
+                if not warm:
+                    cache.clear()
+                with override_settings(LIST_PAGE_SIZE=LONG_PAGE):
+                    return browser.get(url)
+            return run
+        
+        client_pk = Client.objects.order_by('-project_count').values_list('pk', flat=True).first()
+        project_pk = Project.objects.order_by('-created_at').values_list('pk', flat=True).first()
+        client_list = reverse('client_list')
+        project_list = reverse('project_list')
+        
+        scenarios = [
+            ('view:client_list', get(client_list)),
+            ('view:client_list?search', get(f'{client_list}?search=smith')),
+            ('view:project_list', get(project_list)),
+        ]
+        for status, label in Project.STATUS_CHOICES:
+            scenarios.append((f'view:project_list?status={status}', get(f'{project_list}?status={status}')))
+        for priority, label in Project.PRIORITY_CHOICES:
+            scenarios.append((f'view:project_list?priority={priority}', get(f'{project_list}?priority={priority}')))
+        scenarios += [
+            ('view:project_list?overdue', get(f'{project_list}?overdue=1')),
+            ('view:work_queue', get(reverse('work_queue'))),
+            ('view:client_detail', get(reverse('client_detail', args=[client_pk]))),
+            ('view:project_detail', get(reverse('project_detail', args=[project_pk]))),
+            ('view:dashboard', get(reverse('dashboard'))),
+            ('view:revenue_report', get(reverse('revenue_report'))),
+            ('view:pipeline_report', get(reverse('pipeline_report'))),
+        ]
+        for view, url in (('client_list', client_list), ('project_list', project_list)):
+            scenarios += [
+                (f'view:{view}?rows={LONG_PAGE}:cold', long_page(url, warm=False)),
+                (f'view:{view}?rows={LONG_PAGE}:warm', long_page(url, warm=True)),
+            ]
+        for model in admin.site._registry:
+            url_name = f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist'
+            scenarios.append((url_name, get(reverse(url_name))))
+        
+        inquiry = count()
+        run_id = int(time.time())
+        
+        def contact_form():
+            return browser.post(reverse('webhook_contact'), data=json.dumps({
+                'name': 'Bench Mark',
+                'email': f'bench{run_id}-{next(inquiry)}@example.com',
+                'project_type': 'quick_fix',
+                'description': 'Benchmark inquiry',
+            }), content_type='application/json')
+        
+        scenarios += [
+            ('view:webhook_contact_form', contact_form),
+            ('command:send_follow_up_emails',
+             lambda: call_command('send_follow_up_emails', dry_run=True, stdout=StringIO())),
+            ('command:generate_test_data',
+             lambda: call_command('generate_test_data', clients=20, projects=100, stdout=StringIO())),
+        ]
+        return scenarios
+    
+    def measure(self, func, repeat):
+        func()  # warm up caches and the connection
+        timings, queries, renders = [], [], []
+        for _ in range(repeat):
+            metrics = RequestMetrics()
+            last_request = RECENT_REQUESTS[-1] if RECENT_REQUESTS else None
+            started = time.perf_counter()
+            with recording_queries(metrics):
+                response = func()
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(metrics.queries)
+            # Views also leave their template render time in the request log
+            if RECENT_REQUESTS and RECENT_REQUESTS[-1] is not last_request:
+                renders.append(RECENT_REQUESTS[-1]['render_ms'])
+            status = getattr(response, 'status_code', 200)
+            if status >= 400:
+                raise CommandError(f'HTTP {status}')
+        
+        # Separate pass: tracing allocations would skew the timings
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        
+        timings.sort()
+        result = {
+            'p50_ms': round(timings[len(timings) // 2], 2),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+            'queries': max(queries),
+            'peak_kb': peak // 1024,
+        }
+        if renders:
+            renders.sort()
+            result['render_p50_ms'] = renders[len(renders) // 2]
+        return result
+    
+    def compare(self, results, baseline, tolerance, only=None):
+        regressions = []
+        for size, scenarios in results.items():
+            # Scenarios that stopped running count too, unless --only skipped them
+            for name in sorted(baseline.get(size, {}).keys() - scenarios.keys()):
+                if not only or only in name:
+                    regressions.append(f'{size} {name}: in the baseline but missing from this run')
+            for name, current in scenarios.items():
+                previous = baseline.get(size, {}).get(name)
+                if not previous or 'error' in previous:
+                    continue
+                if 'error' in current:
+                    regressions.append(f'{size} {name}: now fails ({current["error"]})')
+                    continue
+                slower = current['p95_ms'] > previous['p95_ms'] * (1 + tolerance)
+                if slower or current['queries'] > previous['queries']:
+                    regressions.append(
+                        f'{size} {name}: p95 {previous["p95_ms"]} -> {current["p95_ms"]}ms, '
+                        f'queries {previous["queries"]} -> {current["queries"]}'
+                    )
+        return regressions
+
+# clients/management/commands/check_query_plans.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from latex_services.query_plans import SEQ_SCAN_PATTERNS, hot_queries, seed_plan_data, sequential_scans
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot querysets against a seeded database and fail on sequential scans'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=50_000,
+                            help='Projects to seed; planners scan small tables whatever the indexes')
+        parser.add_argument('--only', help='Only check queries whose name contains this text')
+        parser.add_argument('--show-plans', action='store_true', help='Print every plan, not just failures')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Keep the seeded database between runs')
+    
+    def handle(self, *args, **options):
+        if connection.vendor not in SEQ_SCAN_PATTERNS:
+            raise CommandError(f'No sequential scan pattern for {connection.vendor}')
+        
+        # Seed a throwaway database, never the one the site runs on
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options['keepdb']
+        )
+        try:
+            seeded = seed_plan_data(options['projects'], vacuum=True)
+            if seeded:
+                self.stdout.write(f'Seeded {seeded} projects')
+            failures = self.check(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+        
+        if failures:
+            raise CommandError(f'Sequential scans in: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('No sequential scans on hot queries'))
+    
+    def check(self, options):
+        failures = []
+        for name, queryset, models in hot_queries():
+            if options['only'] and options['only'] not in name:
+                continue
+            scanned, plan = sequential_scans(queryset, models)
+            if scanned:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'{name}: sequential scan on {", ".join(scanned)}'))
+            else:
+                self.stdout.write(f'{name}: ok')
+            if scanned or options['show_plans']:
+                self.stdout.write(plan + '\n')
+        return failures
+
+# ===== BACKGROUND JOBS =====
+
+# jobs/queue.py
+import random
+import time
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .models import Job
+
+# Seconds a job may stay 'running' before another worker may reclaim it
+VISIBILITY_TIMEOUT = getattr(settings, 'JOBS_VISIBILITY_TIMEOUT', 600)
+BACKOFF_BASE = getattr(settings, 'JOBS_BACKOFF_BASE', 10)
+BACKOFF_MAX = getattr(settings, 'JOBS_BACKOFF_MAX', 3600)
+
+def task(func):
+    """
+    Mark a module-level function as runnable by the queue and give it an
+    enqueue() helper: send_digest.enqueue(client_id).
+    """
+    name = f'{func.__module__}.{func.__qualname__}'
+    func.is_job_task = True
+    func.enqueue = lambda *args, **kwargs: enqueue(name, *args, **kwargs)
+    return func
+
+def enqueue(name, *args, run_at=None, max_attempts=5, **kwargs):
+    """
+    Queue a call to the task at dotted path `name`. The row is written in the
+    caller's transaction, so the job only exists if the caller commits. With
+    JOBS_EAGER set (tests, local dev) the task runs immediately instead.
+    """
+    if getattr(settings, 'JOBS_EAGER', False):
+        resolve_task(name)(*args, **kwargs)
+        return None
+    return Job.objects.create(
+        name=name, args=list(args), kwargs=kwargs,
+        run_at=run_at or timezone.now(), max_attempts=max_attempts,
+    )
+
+def resolve_task(name):
+    func = import_string(name)
+    if not getattr(func, 'is_job_task', False):
+        raise ValueError(f'{name} is not a registered task')
+    return func
+
+def claim_jobs(worker_id, limit=1):
+    """Lock up to `limit` due jobs for this worker, skipping rows others hold"""
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True).filter(
+                Q(status='queued', run_at__lte=now) |
+                Q(status='running', locked_at__lt=now - timedelta(seconds=VISIBILITY_TIMEOUT))
+            ).order_by('run_at')[:limit]
+        )
+        # A reclaimed job whose worker died on its last attempt has none left
+        exhausted = [job.pk for job in jobs if job.status == 'running' and job.attempts >= job.max_attempts]
+        if exhausted:
+            Job.objects.filter(pk__in=exhausted).update(
+                status='failed', locked_at=None, locked_by='', finished_at=now,
+                last_error=f'Still running after {VISIBILITY_TIMEOUT}s on the final attempt',
+            )
+            jobs = [job for job in jobs if job.pk not in exhausted]
+        if jobs:
+            Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                status='running', locked_at=now, locked_by=worker_id,
+                started_at=now, attempts=F('attempts') + 1,
+            )
+    for job in jobs:
+        job.attempts += 1
+        job.started_at = now
+        job.locked_by = worker_id
+    return jobs
+
+def backoff(attempts):
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+def execute_job(job):
+    """
+    Run one claimed job and record its outcome and timing. Returns 'lost'
+    when the job was reclaimed meanwhile: the other worker's run is the one
+    that counts, so this outcome is dropped.
+    """
+    started = time.monotonic()
+    try:
+        resolve_task(job.name)(*job.args, **job.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        retry = job.attempts < job.max_attempts
+        update = {
+            'status': 'queued' if retry else 'failed',
+            'last_error': error,
+            'run_at': timezone.now() + backoff(job.attempts) if retry else job.run_at,
+        }
+    else:
+        update = {'status': 'succeeded', 'last_error': ''}
+    duration_ms = int((time.monotonic() - started) * 1000)
+    updated = Job.objects.filter(pk=job.pk, status='running', locked_by=job.locked_by).update(
+        locked_at=None, locked_by='', finished_at=timezone.now(), duration_ms=duration_ms, **update
+    )
+    return update['status'] if updated else 'lost', duration_ms
+
+# jobs/worker.py
+import logging
+import os
+import socket
+import threading
+from django.db import close_old_connections, connections
+from .queue import claim_jobs, execute_job
+
+logger = logging.getLogger(__name__)
+
+def worker_thread(stop, poll_interval, batch):
+    worker_id = f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            jobs = claim_jobs(worker_id, limit=batch)
+            if not jobs:
+                stop.wait(poll_interval)
+                continue
+            for job in jobs:
+                status, duration_ms = execute_job(job)
+                logger.info(
+                    f"job {job.pk} {job.name} attempt {job.attempts}: {status} in {duration_ms}ms "
+                    f"(waited {job.wait_ms}ms)"
+                )
+    finally:
+        connections.close_all()
+
+def worker_process(threads, poll_interval, batch, stop=None):
+    """Run `threads` claiming threads until `stop` is set (or forever)"""
+    stop = stop or threading.Event()
+    pool = [
+        threading.Thread(target=worker_thread, args=(stop, poll_interval, batch), daemon=True)
+        for _ in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+# clients/tasks.py
+from django.core.management import call_command
+from jobs.queue import task
+
+@task
+def send_follow_up_emails(**options):
+    call_command('send_follow_up_emails', **options)
+
+# projects/tasks.py
+from jobs.queue import task
+from .models import ProjectFile
+from .previews import generate_preview
+
+@task
+def render_preview(project_file_id):
+    project_file = ProjectFile.objects.filter(pk=project_file_id).first()
+    if project_file:
+        generate_preview(project_file)
+
+# reports/tasks.py
+from datetime import date
+from jobs.queue import task
+from .rollups import rebuild_revenue_rollup, refresh_revenue_buckets, take_pipeline_snapshot
+
+@task
+def refresh_revenue(buckets, using='default'):
+    # Buckets arrive JSON-encoded as [['2024-05-01', 'quick_fix'], ...]
+    refresh_revenue_buckets(
+        {(date.fromisoformat(month), project_type) for month, project_type in buckets}, using=using
+    )
+
+@task
+def rebuild_revenue(since=None):
+    rebuild_revenue_rollup(since=date.fromisoformat(since) if since else None)
+
+@task
+def snapshot_pipeline():
+    take_pipeline_snapshot()
+
+# api/tasks.py
+from jobs.queue import task
+from .intake import record_inquiries
+
+@task
+def store_inquiries(submissions):
+    record_inquiries(submissions)
+
+# jobs/admin.py
+from django.contrib import admin
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = [
+        'name', 'status', 'attempts', 'run_at', 'started_at',
+        'duration_ms', 'wait_ms', 'locked_by'
+    ]
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'last_error']
+    readonly_fields = ['created_at', 'started_at', 'finished_at', 'duration_ms', 'locked_at', 'locked_by']
+
+# jobs/tests.py
+import threading
+from datetime import timedelta
+from unittest import skipUnless
+from django.db import connection, connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from .models import Job
+from .queue import VISIBILITY_TIMEOUT, claim_jobs, execute_job, task
+
+CALLS = []
+
+@task
+def record_call(value):
+    CALLS.append(value)
+
+@task
+def always_fail():
+    raise RuntimeError('boom')
+
+@override_settings(JOBS_EAGER=False)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+    
+    def expire_leases(self):
+        Job.objects.filter(status='running').update(
+            locked_at=timezone.now() - timedelta(seconds=VISIBILITY_TIMEOUT + 1)
+        )
+    
+    def test_claim_takes_due_jobs_only(self):
+        due = record_call.enqueue(1)
+        record_call.enqueue(2, run_at=timezone.now() + timedelta(hours=1))
+        jobs = claim_jobs('worker-1', limit=5)
+        self.assertEqual([job.pk for job in jobs], [due.pk])
+        due.refresh_from_db()
+        self.assertEqual((due.status, due.attempts, due.locked_by), ('running', 1, 'worker-1'))
+        self.assertEqual(claim_jobs('worker-2', limit=5), [])
+    
+    def test_expired_lease_is_reclaimed_and_the_old_run_dropped(self):
+        record_call.enqueue(1)
+        [first] = claim_jobs('worker-1')
+        self.assertEqual(claim_jobs('worker-2'), [])
+        
+        self.expire_leases()
+        [second] = claim_jobs('worker-2')
+        self.assertEqual((second.pk, second.attempts), (first.pk, 2))
+        self.assertEqual(execute_job(first)[0], 'lost')
+        self.assertEqual(execute_job(second)[0], 'succeeded')
+        self.assertEqual(CALLS, [1, 1])
+    
+    def test_expired_lease_on_the_final_attempt_fails_the_job(self):
+        job = record_call.enqueue(1, max_attempts=1)
+        claim_jobs('worker-1')
+        self.expire_leases()
+        self.assertEqual(claim_jobs('worker-2'), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('final attempt', job.last_error)
+    
+    def test_failures_retry_with_backoff_then_fail(self):
+        job = always_fail.enqueue(max_attempts=2)
+        [claimed] = claim_jobs('worker-1')
+        self.assertEqual(execute_job(claimed)[0], 'queued')
+        job.refresh_from_db()
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('boom', job.last_error)
+        
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        [claimed] = claim_jobs('worker-1')
+        self.assertEqual(execute_job(claimed)[0], 'failed')
+
+@override_settings(JOBS_EAGER=False)
+@skipUnless(connection.features.has_select_for_update_skip_locked, 'needs SELECT ... FOR UPDATE SKIP LOCKED')
+class SkipLockedClaimTests(TransactionTestCase):
+    def test_claim_skips_rows_another_transaction_holds(self):
+        held = record_call.enqueue(1, run_at=timezone.now() - timedelta(minutes=1))
+        free = record_call.enqueue(2)
+        locked, release = threading.Event(), threading.Event()
+        
+        def hold_row():
+            try:
+                with transaction.atomic():
+                    Job.objects.select_for_update().get(pk=held.pk)
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connections.close_all()
+        
+        holder = threading.Thread(target=hold_row)
+        holder.start()
+        try:
+            self.assertTrue(locked.wait(10))
+            self.assertEqual([job.pk for job in claim_jobs('worker-1', limit=5)], [free.pk])
+        finally:
+            release.set()
+            holder.join()
+        self.assertEqual([job.pk for job in claim_jobs('worker-1', limit=5)], [held.pk])
 
 # ===== DASHBOARD VIEWS =====
 
-# Add to main urls.py views
+# latex_services/views.py
+import asyncio
+import os
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
+from django.http import JsonResponse, StreamingHttpResponse
 from django.contrib.auth.decorators import login_required
-from django.db.models import Sum, Count, Q
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import cache
+from django.db import connection
+from django.template.loader import render_to_string
 from django.utils import timezone
 from datetime import timedelta
 from clients.models import Client
 from projects.models import Project
 from communications.models import Communication
+from latex_services.concurrency import (
+    WIDGETS_MARKER, async_login_required, gather_queries, run_query, stream_widgets
+)
+from latex_services.db.pooled.base import pool_stats
+from latex_services.instrumentation import recent_requests, summarize
+from latex_services.replicas import read_from_replica
+from latex_services.stats_cache import dashboard_stats_key, record_lookup, lookup_counters
+
+# All four dashboard counters in one pass over projects
+DASHBOARD_STATS_SQL = """
+    SELECT
+        COUNT(CASE WHEN p.status IN ({active}) THEN 1 END),
+        COALESCE(SUM(CASE WHEN p.status = 'completed' AND p.completed_at >= %s
+                          THEN p.final_amount END), 0),
+        COUNT(CASE WHEN p.status = 'quoted' THEN 1 END),
+        (SELECT COUNT(*) FROM {client_table})
+    FROM {project_table} p
+"""
+
+def compute_dashboard_stats(month_start):
+    sql = DASHBOARD_STATS_SQL.format(
+        active=', '.join(['%s'] * len(Project.ACTIVE_STATUSES)),
+        client_table=Client._meta.db_table,
+        project_table=Project._meta.db_table,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*Project.ACTIVE_STATUSES, month_start])
+        active_projects, monthly_revenue, pending_quotes, total_clients = cursor.fetchone()
+    return {
+        'active_projects': active_projects,
+        'monthly_revenue': monthly_revenue,
+        'pending_quotes': pending_quotes,
+        'total_clients': total_clients,
+    }
+
+def get_dashboard_stats():
+    """Dashboard counters, cached until the next Client/Project write"""
+    month_start = timezone.localtime().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    key = dashboard_stats_key(month_start)
+    stats = cache.get(key)
+    record_lookup(hit=stats is not None)
+    if stats is None:
+        stats = compute_dashboard_stats(month_start)
+        cache.set(key, stats, timeout=None)
+    return stats
+
+def recent_projects():
+    return list(Project.objects.select_related('client').with_deadline_state().order_by('-created_at')[:10])
+
+def recent_communications():
+    return list(Communication.objects.select_related('client').order_by('-created_at')[:5])
+
+# Independent dashboard queries: context name -> (query, widget template)
+DASHBOARD_WIDGETS = {
+    'stats': (get_dashboard_stats, 'dashboard/_stats.html'),
+    'recent_projects': (recent_projects, 'dashboard/_recent_projects.html'),
+    'recent_communications': (recent_communications, 'dashboard/_recent_communications.html'),
+}
 
 @login_required
+@read_from_replica
 def dashboard(request):
-    # Calculate statistics
-    stats = {
-        'active_projects': Project.objects.filter(
-            status__in=['quoted', 'approved', 'in_progress', 'review']
-        ).count(),
-        'monthly_revenue': Project.objects.filter(
-            completed_at__gte=timezone.now().replace(day=1),
-            status='completed'
-        ).aggregate(total=Sum('final_amount'))['total'] or 0,
-        'pending_quotes': Project.objects.filter(status='quoted').count(),
-        'total_clients': Client.objects.count(),
-    }
-    
-    # Recent projects
-    recent_projects = Project.objects.select_related('client').order_by('-created_at')[:10]
-    
-    # Recent communications
-    recent_communications = Communication.objects.select_related('client').order_by('-created_at')[:5]
+    context = {name: query() for name, (query, template) in DASHBOARD_WIDGETS.items()}
+    return render(request, 'dashboard.html', context)
+
+@async_login_required
+@read_from_replica
+async def dashboard_async(request):
+    """
+    The dashboard with its queries run concurrently, so it takes about as long
+    as the slowest one. ?stream=1 sends the page shell straight away and fills
+    each widget in as its query finishes.
+    """
+    if request.GET.get('stream'):
+        # Started here, not when the response is streamed, so the queries
+        # run in this request's context (and on its database)
+        widgets = {name: asyncio.ensure_future(_render_widget(request, name)) for name in DASHBOARD_WIDGETS}
+        return StreamingHttpResponse(
+            stream_widgets(await _dashboard_shell(request), widgets),
+            content_type='text/html; charset=utf-8',
+        )
     
+    context = await gather_queries(**{name: query for name, (query, template) in DASHBOARD_WIDGETS.items()})
+    return await sync_to_async(render)(request, 'dashboard.html', context)
+
+async def _dashboard_shell(request):
+    context = {'streaming': True, 'widgets_marker': WIDGETS_MARKER}
+    return await sync_to_async(render_to_string)('dashboard.html', context, request)
+
+async def _render_widget(request, name):
+    query, template = DASHBOARD_WIDGETS[name]
+    data = await run_query(query)
+    return await sync_to_async(render_to_string)(template, {name: data}, request)
+
+@staff_member_required
+def dashboard_cache_stats(request):
+    return JsonResponse(lookup_counters())
+
+@staff_member_required
+def request_metrics(request):
+    """Per-view query counts and timings from this process's recent requests"""
+    entries = recent_requests()
     context = {
-        'stats': stats,
-        'recent_projects': recent_projects,
-        'recent_communications': recent_communications,
+        'summary': summarize(entries),
+        'recent': entries[::-1][:100],
+        'buffered': len(entries),
+        'db_pools': pool_stats(),
     }
-    return render(request, 'dashboard.html', context)
+    return render(request, 'debug/request_metrics.html', context)
+
+@staff_member_required
+def db_pool_stats(request):
+    # This process's pools, for monitoring to scrape (empty unless DB_CONN_MODE=pool)
+    return JsonResponse({'pid': os.getpid(), 'pools': pool_stats()})
 
 # .env file template
 """
@@ -420,6 +1707,14 @@ DB_USER=postgres
 DB_PASSWORD=your_password_here
 DB_HOST=localhost
 DB_PORT=5432
+# close, persistent or pool (see settings.py)
+DB_CONN_MODE=close
+DB_POOL_SIZE=10
+
+# Background jobs: keep `manage.py run_workers` running, or set this to True
+# to run them inline in the request (the revenue rollup, follow-up emails
+# and PDF previews otherwise never happen)
+JOBS_EAGER=False
 
 # Django Configuration  
 SECRET_KEY=your-secret-key-here
@@ -479,7 +1774,6 @@ def main():
     activate = "latex_env\\Scripts\\activate" if os.name == 'nt' else "source latex_env/bin/activate"
     
     commands = [
-        "python manage.py makemigrations",
         "python manage.py migrate", 
         "python manage.py collectstatic --noinput",
         "python manage.py createsuperuser --noinput --username admin --email admin@example.com" 
@@ -496,25 +1790,609 @@ def main():
     print("1. Copy .env.example to .env and fill in your settings")
     print("2. Run: python manage.py generate_test_data")
     print("3. Run: python manage.py runserver")
-    print("4. Visit http://localhost:8000")
+    print("4. In another terminal, run: python manage.py run_workers")
+    print("5. Visit http://localhost:8000")
 
 if __name__ == "__main__":
     main()
 """
 
+# latex_services/tests.py
+import base64
+import json
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from clients.models import Client
+from communications.models import Communication
+from projects.models import Project
+from latex_services.concurrency import run_query
+from latex_services.db.pooled.base import ConnectionPool, PoolTimeout, extensions
+from latex_services.instrumentation import RequestMetrics, recent_requests, recording_queries
+from latex_services.query_plans import SEQ_SCAN_PATTERNS, hot_queries, seed_plan_data, sequential_scans
+from latex_services.replicas import PIN_COOKIE, REPLICA, _health, replica_reads
+from latex_services.stats_cache import GENERATION_KEY, invalidate_dashboard_stats, lookup_counters
+from latex_services.views import get_dashboard_stats
+
+def seed(clients=3, projects_each=3):
+    """A few clients with projects and communications, so per-row queries would show"""
+    for i in range(clients):
+        client = Client.objects.create(first_name=f'Client{i}', last_name='Test', email=f'client{i}@example.edu')
+        for j in range(projects_each):
+            project = Project.objects.create(
+                client=client, title=f'Project {i}-{j}', project_type='quick_fix', description='',
+                status='in_progress', priority='high',
+            )
+            Communication.objects.create(
+                client=client, project=project, communication_type='note', direction='internal',
+                subject='Kickoff', content='',
+            )
+
+@override_settings(QUERY_BUDGETS_STRICT=True)
+class QueryBudgetTests(TestCase):
+    VIEWS = ['client_list', 'project_list', 'dashboard', 'work_queue']
+    
+    @classmethod
+    def setUpTestData(cls):
+        seed()
+        cls.user = User.objects.create_user('staff', password='secret')
+    
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+    
+    def test_views_stay_within_budget(self):
+        for view_name in self.VIEWS:
+            # Cold and warm caches: a cache miss must fit the budget too
+            for attempt in ('cold', 'warm'):
+                with self.subTest(view=view_name, cache=attempt):
+                    response = self.client.get(reverse(view_name))
+                    self.assertEqual(response.status_code, 200)
+                    entry = recent_requests()[-1]
+                    self.assertEqual(entry['view'], view_name)
+                    self.assertLessEqual(entry['queries'], settings.QUERY_BUDGETS[view_name])
+    
+    def test_pages_past_the_first_stay_within_budget(self):
+        with self.settings(LIST_PAGE_SIZE=2):
+            for view_name in ('client_list', 'project_list', 'work_queue'):
+                with self.subTest(view=view_name):
+                    first = self.client.get(reverse(view_name))
+                    response = self.client.get(f"{reverse(view_name)}?{first.context['next_query']}")
+                    self.assertEqual(response.status_code, 200)
+                    self.assertLessEqual(recent_requests()[-1]['queries'], settings.QUERY_BUDGETS[view_name])
+
+class DashboardStatsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        seed(clients=2, projects_each=1)
+    
+    def test_repeat_reads_are_hits(self):
+        first = get_dashboard_stats()
+        self.assertEqual(get_dashboard_stats(), first)
+        counters = lookup_counters()
+        self.assertEqual((counters['hits'], counters['misses']), (1, 1))
+    
+    def test_committed_writes_invalidate(self):
+        self.assertEqual(get_dashboard_stats()['total_clients'], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            client = Client.objects.create(first_name='Ada', last_name='Lovelace', email='ada@example.edu')
+        self.assertEqual(get_dashboard_stats()['total_clients'], 3)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(client=client, title='Thesis', project_type='quick_fix', description='', status='quoted')
+        self.assertEqual(get_dashboard_stats()['pending_quotes'], 1)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.filter(client=client).delete()
+        self.assertEqual(get_dashboard_stats()['pending_quotes'], 0)
+    
+    def test_uncommitted_writes_keep_the_cached_stats(self):
+        before = get_dashboard_stats()
+        with self.captureOnCommitCallbacks(execute=False):
+            Client.objects.create(first_name='Ada', last_name='Lovelace', email='ada@example.edu')
+        self.assertEqual(get_dashboard_stats(), before)
+    
+    def test_evicted_generation_does_not_revive_old_stats(self):
+        self.assertEqual(get_dashboard_stats()['total_clients'], 2)
+        Client.objects.create(first_name='Ada', last_name='Lovelace', email='ada@example.edu')
+        cache.delete(GENERATION_KEY)
+        invalidate_dashboard_stats()
+        self.assertEqual(get_dashboard_stats()['total_clients'], 3)
+
+def cursor_token(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+@override_settings(LIST_PAGE_SIZE=2)
+class GarbledCursorTests(TestCase):
+    """A cursor that doesn't decode to a position starts the list over"""
+    
+    GARBLED = [
+        'not-a-cursor',
+        '%%%',
+        cursor_token('abc'),
+        cursor_token({'created_at': '2024-05-01T12:00:00+00:00', 'id': 1}),
+        cursor_token(['yesterday', 1, 'next']),
+        cursor_token(['2024-05-01T12:00:00+00:00', 1, 'sideways']),
+        cursor_token(['2024-05-01T12:00:00+00:00', 'one', 'next']),
+        cursor_token([['2024'], 1, 'prev']),
+        cursor_token(['2024-05-01T12:00:00+00:00', 2 ** 70, 'next']),
+        cursor_token([3, None, 2 ** 70]),
+    ]
+    
+    @classmethod
+    def setUpTestData(cls):
+        seed()
+        cls.user = User.objects.create_user('staff', password='secret')
+    
+    def setUp(self):
+        self.client.force_login(self.user)
+    
+    def test_lists_fall_back_to_the_first_page(self):
+        for view_name in ('client_list', 'project_list'):
+            first = self.client.get(reverse(view_name))
+            for token in self.GARBLED:
+                with self.subTest(view=view_name, cursor=token):
+                    response = self.client.get(reverse(view_name), {'cursor': token})
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(response.context['rows'], first.context['rows'])
+                    self.assertIsNone(response.context['prev_query'])
+    
+    def test_work_queue_falls_back_to_the_top(self):
+        for token in self.GARBLED:
+            with self.subTest(cursor=token):
+                response = self.client.get(reverse('work_queue'), {'cursor': token})
+                self.assertEqual(response.status_code, 200)
+                self.assertFalse(response.context['continued'])
+
+class QueryPlanTests(TestCase):
+    """The hot filters are answered from indexes (manage.py check_query_plans at full size)"""
+    
+    # Enough rows that the planner prefers an index where one applies
+    PROJECTS = 20_000
+    
+    @classmethod
+    def setUpTestData(cls):
+        if connection.vendor in SEQ_SCAN_PATTERNS:
+            seed_plan_data(cls.PROJECTS)
+    
+    def test_no_sequential_scans_on_indexed_tables(self):
+        if connection.vendor not in SEQ_SCAN_PATTERNS:
+            self.skipTest(f'No sequential scan pattern for {connection.vendor}')
+        for name, queryset, models in hot_queries():
+            with self.subTest(query=name):
+                scanned, plan = sequential_scans(queryset, models)
+                self.assertEqual(scanned, [], plan)
+
+@override_settings(REPLICA_READS=True, REPLICA_LAG_CHECK_INTERVAL=60, REPLICA_MAX_LAG_SECONDS=10)
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Against the test database's mirror under the replica alias: committed
+    rows, since the replica connection can't see a test transaction.
+    """
+    
+    databases = {'default', REPLICA}
+    
+    def setUp(self):
+        _health.update(checked_at=None, healthy=False)
+        self.addCleanup(_health.update, checked_at=None, healthy=False)
+        # In step with the primary; the lag query itself would count as a replica read
+        lag = mock.patch('latex_services.replicas.replica_lag', return_value=0.0)
+        lag.start()
+        self.addCleanup(lag.stop)
+        seed(clients=1, projects_each=1)
+        self.user = User.objects.create_user('staff', password='secret')
+        self.client.force_login(self.user)
+    
+    def reads(self, read):
+        """The number of queries `read` sends to the primary and to the replica"""
+        with CaptureQueriesContext(connections['default']) as primary:
+            with CaptureQueriesContext(connections[REPLICA]) as replica:
+                read()
+        return len(primary), len(replica)
+    
+    def count_clients(self):
+        with replica_reads():
+            self.assertEqual(Client.objects.count(), 1)
+    
+    def test_reads_go_to_a_healthy_replica(self):
+        self.assertEqual(self.reads(self.count_clients), (0, 1))
+        self.assertEqual(self.reads(Client.objects.count), (1, 0))
+    
+    def test_lagging_or_unreachable_replica_falls_back_to_the_primary(self):
+        for lag in (30.0, None):
+            with self.subTest(lag=lag):
+                _health.update(checked_at=None)
+                with mock.patch('latex_services.replicas.replica_lag', return_value=lag):
+                    self.assertEqual(self.reads(self.count_clients), (1, 0))
+    
+    def test_lag_is_checked_once_per_interval(self):
+        with mock.patch('latex_services.replicas.replica_lag', return_value=0.0) as lag:
+            self.count_clients()
+            self.count_clients()
+        self.assertEqual(lag.call_count, 1)
+    
+    def test_reads_after_a_write_stay_on_the_primary(self):
+        def write_then_read():
+            with replica_reads():
+                Client.objects.create(first_name='Ada', last_name='Lovelace', email='ada@example.edu')
+                self.assertEqual(Client.objects.count(), 2)
+        primary, replica = self.reads(write_then_read)
+        self.assertEqual(replica, 0)
+    
+    def test_pin_cookie_keeps_the_next_page_on_the_primary(self):
+        primary, replica = self.reads(lambda: self.client.get(reverse('revenue_report')))
+        self.assertGreater(replica, 0)
+        
+        response = self.client.post(reverse('client_create'), {
+            'first_name': 'Ada', 'last_name': 'Lovelace', 'email': 'ada@example.edu',
+            'status': 'lead', 'lead_source': 'website',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(PIN_COOKIE, response.cookies)
+        
+        primary, replica = self.reads(lambda: self.client.get(reverse('revenue_report')))
+        self.assertEqual(replica, 0)
+        
+        # Expired, the pin no longer applies
+        del self.client.cookies[PIN_COOKIE]
+        primary, replica = self.reads(lambda: self.client.get(reverse('revenue_report')))
+        self.assertGreater(replica, 0)
+
+class FakeConnection:
+    """The parts of a psycopg2 connection ConnectionPool uses"""
+    
+    def __init__(self, healthy=True):
+        self.closed = False
+        self.autocommit = False
+        self.healthy = healthy
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+    
+    def get_transaction_status(self):
+        return self.status
+    
+    def rollback(self):
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+    
+    def close(self):
+        self.closed = True
+    
+    def cursor(self):
+        if not self.healthy:
+            raise OSError('server closed the connection unexpectedly')
+        return mock.MagicMock()
+
+class ConnectionPoolTests(SimpleTestCase):
+    def pool(self, size=2, timeout=0.05, recycle=3600, check_idle=60):
+        return ConnectionPool(size=size, timeout=timeout, recycle=recycle, check_idle=check_idle)
+    
+    def test_released_connection_is_reused(self):
+        pool = self.pool()
+        connection = pool.checkout(FakeConnection)
+        pool.release(connection)
+        self.assertIs(pool.checkout(FakeConnection), connection)
+        stats = pool.stats()
+        self.assertEqual((stats['created'], stats['checkouts'], stats['in_use'], stats['idle']), (1, 2, 1, 0))
+    
+    def test_open_transaction_is_rolled_back_before_reuse(self):
+        pool = self.pool()
+        connection = pool.checkout(FakeConnection)
+        connection.status = extensions.TRANSACTION_STATUS_INTRANS
+        pool.release(connection)
+        self.assertIs(pool.checkout(FakeConnection), connection)
+        self.assertEqual(connection.status, extensions.TRANSACTION_STATUS_IDLE)
+        self.assertTrue(connection.autocommit)
+    
+    def test_unusable_connections_are_replaced(self):
+        cases = [
+            ('released without reuse', {}, dict(reuse=False)),
+            ('past its recycle age', dict(recycle=-1), {}),
+        ]
+        for name, options, release in cases:
+            with self.subTest(name):
+                pool = self.pool(**options)
+                connection = pool.checkout(FakeConnection)
+                pool.release(connection, **release)
+                self.assertTrue(connection.closed)
+                self.assertIsNot(pool.checkout(FakeConnection), connection)
+                self.assertEqual(pool.stats()['discarded'], 1)
+    
+    def test_dead_idle_connection_is_replaced(self):
+        pool = self.pool(check_idle=0)
+        connection = pool.checkout(lambda: FakeConnection(healthy=False))
+        pool.release(connection)
+        self.assertIsNot(pool.checkout(FakeConnection), connection)
+        self.assertEqual(pool.stats()['created'], 2)
+    
+    def test_exhausted_pool_times_out(self):
+        pool = self.pool(size=1)
+        connection = pool.checkout(FakeConnection)
+        with self.assertRaises(PoolTimeout):
+            pool.checkout(FakeConnection)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+        pool.release(connection)
+        self.assertIs(pool.checkout(FakeConnection), connection)
+
+@skipUnless(settings.DATABASES['default']['ENGINE'] == 'latex_services.db.pooled', 'needs DB_CONN_MODE=pool')
+class PooledBackendTests(TransactionTestCase):
+    def test_closed_connection_goes_back_to_the_pool(self):
+        db = connections['default']
+        db.ensure_connection()
+        raw = db.connection
+        checkouts = db.pool.stats()['checkouts']
+        db.close()
+        self.assertIsNone(db.connection)
+        
+        self.assertEqual(Client.objects.count(), 0)
+        self.assertIs(db.connection, raw)
+        self.assertEqual(db.pool.stats()['checkouts'], checkouts + 1)
+
+class AsyncDashboardTests(TransactionTestCase):
+    """
+    Through the ASGI handler, with committed rows: the pool threads read
+    over their own connections, so they can't see a test transaction.
+    """
+    
+    def setUp(self):
+        client = Client.objects.create(first_name='Ada', last_name='Lovelace', email='ada@example.edu')
+        Project.objects.create(client=client, title='Thesis conversion', project_type='quick_fix', description='')
+        self.user = User.objects.create_user('staff', password='secret')
+        self.async_client.force_login(self.user)
+    
+    async def test_dashboard_renders(self):
+        response = await self.async_client.get(reverse('dashboard_async'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Thesis conversion')
+    
+    async def test_streamed_dashboard_fills_every_widget(self):
+        response = await self.async_client.get(reverse('dashboard_async'), {'stream': 1})
+        self.assertEqual(response.status_code, 200)
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        for name in ('stats', 'recent_projects', 'recent_communications'):
+            self.assertIn(f'data-widget="{name}"', body)
+        self.assertIn('Thesis conversion', body)
+    
+    async def test_pool_threads_use_their_own_connections(self):
+        request_connection = connections['default']
+        self.assertIsNot(await run_query(lambda: connections['default']), request_connection)
+    
+    async def test_pool_queries_count_toward_the_request(self):
+        metrics = RequestMetrics()
+        with recording_queries(metrics):
+            self.assertEqual(await run_query(Client.objects.count), 1)
+        self.assertEqual(metrics.queries, 1)
+
 # ===== API ENDPOINTS FOR WEBSITE INTEGRATION =====
 
+# api/intake.py
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+from clients.aggregates import recompute_clients
+from clients.models import Client
+from projects.models import Project
+from communications.models import Communication
+from latex_services.stats_cache import invalidate_dashboard_stats
+
+PROJECT_TYPES = {value for value, label in Project.PROJECT_TYPE_CHOICES}
+
+class InvalidSubmission(ValueError):
+    pass
+
+def text_field(data, key):
+    """A string field of the payload; missing or null reads as ''"""
+    value = data.get(key)
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise InvalidSubmission(f'{key} must be a string')
+    return value
+
+def parse_submission(data):
+    """Validate one contact-form payload into the fields the intake needs"""
+    if not isinstance(data, dict):
+        raise InvalidSubmission('Expected a JSON object')
+    email = text_field(data, 'email').strip()
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise InvalidSubmission('A valid email is required')
+    if len(email) > Client._meta.get_field('email').max_length:
+        raise InvalidSubmission('A valid email is required')
+    
+    name = text_field(data, 'name').split(' ')
+    project_label = text_field(data, 'project_type')
+    return {
+        'email': email,
+        'first_name': name[0][:100],
+        'last_name': ' '.join(name[1:])[:100],
+        'institution': text_field(data, 'institution')[:200],
+        'description': text_field(data, 'description'),
+        'project_type': project_label if project_label in PROJECT_TYPES else 'custom',
+        'project_label': project_label or None,
+        'priority': 'urgent' if text_field(data, 'timeline') == 'rush' else 'normal',
+    }
+
+def build_rows(submission):
+    """Unsaved Client, Project and Communication for one submission"""
+    client = Client(
+        first_name=submission['first_name'],
+        last_name=submission['last_name'],
+        email=submission['email'],
+        institution=submission['institution'],
+        # A new website lead has been contacted by the inquiry itself
+        status='contacted',
+        lead_source='website',
+        notes=f"Initial inquiry: {submission['description']}",
+        project_count=1,
+    )
+    project = Project(
+        client=client,
+        title=f"Project Inquiry - {submission['project_label'] or 'Unknown'}"[:200],
+        project_type=submission['project_type'],
+        description=submission['description'],
+        status='inquiry',
+        priority=submission['priority'],
+    )
+    communication = Communication(
+        client=client,
+        project=project,
+        communication_type='email',
+        direction='inbound',
+        subject=f"Website inquiry - {submission['project_label'] or 'Project'}"[:200],
+        content=submission['description']
+    )
+    return client, project, communication
+
+def insert_columns(instance, overrides=None):
+    """
+    Quoted column names, SQL value expressions and params for inserting an
+    unsaved instance, taken from its concrete fields so new model fields and
+    defaults are picked up automatically. `overrides` maps attnames to SQL.
+    """
+    overrides = overrides or {}
+    columns, expressions, params = [], [], []
+    for field in instance._meta.local_concrete_fields:
+        if field.primary_key:
+            continue
+        columns.append(connection.ops.quote_name(field.column))
+        if field.attname in overrides:
+            expressions.append(overrides[field.attname])
+        else:
+            expressions.append('%s')
+            params.append(field.get_db_prep_save(field.pre_save(instance, True), connection))
+    return ', '.join(columns), ', '.join(expressions), params
+
+# One statement: upsert the client (bumping a 'lead' to 'contacted' and its
+# project count), then insert the project and its inbound communication
+INTAKE_SQL = """
+    WITH client_row AS (
+        INSERT INTO {client_table} ({client_columns}) VALUES ({client_values})
+        ON CONFLICT ({email}) DO UPDATE SET
+            {status} = CASE WHEN {client_table}.{status} = 'lead' THEN 'contacted'
+                            ELSE {client_table}.{status} END,
+            {project_count} = {client_table}.{project_count} + 1,
+            {updated_at} = EXCLUDED.{updated_at}
+        RETURNING id, (xmax = 0) AS created
+    ), project_row AS (
+        INSERT INTO {project_table} ({project_columns})
+        SELECT {project_values} FROM client_row
+        RETURNING id, client_id
+    ), communication_row AS (
+        INSERT INTO {communication_table} ({communication_columns})
+        SELECT {communication_values} FROM project_row
+        RETURNING id
+    )
+    SELECT project_row.id, client_row.created FROM project_row, client_row
+"""
+
+def record_inquiry(submission):
+    """Store one submission; returns (project_id, client_created)"""
+    client, project, communication = build_rows(submission)
+    
+    if connection.vendor != 'postgresql':
+        return _record_inquiry_orm(client, project, communication)
+    
+    quote = connection.ops.quote_name
+    client_columns, client_values, client_params = insert_columns(client)
+    project_columns, project_values, project_params = insert_columns(
+        project, {'client_id': 'client_row.id'}
+    )
+    communication_columns, communication_values, communication_params = insert_columns(
+        communication, {'client_id': 'project_row.client_id', 'project_id': 'project_row.id'}
+    )
+    sql = INTAKE_SQL.format(
+        client_table=quote(Client._meta.db_table),
+        project_table=quote(Project._meta.db_table),
+        communication_table=quote(Communication._meta.db_table),
+        email=quote('email'),
+        status=quote('status'),
+        project_count=quote('project_count'),
+        updated_at=quote('updated_at'),
+        client_columns=client_columns, client_values=client_values,
+        project_columns=project_columns, project_values=project_values,
+        communication_columns=communication_columns, communication_values=communication_values,
+    )
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, client_params + project_params + communication_params)
+            project_id, client_created = cursor.fetchone()
+        transaction.on_commit(invalidate_dashboard_stats)
+    return project_id, client_created
+
+def _record_inquiry_orm(client, project, communication):
+    # Portable path for SQLite test databases: same result, several round trips
+    with transaction.atomic():
+        existing = Client.objects.select_for_update().filter(email=client.email).first()
+        if existing:
+            if existing.status == 'lead':
+                Client.objects.filter(pk=existing.pk).update(status='contacted')
+            client = existing
+        else:
+            client.project_count = 0
+            client.save()
+        project.client = client
+        project.save()
+        communication.client = client
+        communication.project = project
+        communication.save()
+    return project.pk, existing is None
+
+def record_inquiries(submissions):
+    """
+    Store a chunk of submissions with bulk inserts and return their project
+    ids in order. A fixed number of queries per chunk regardless of its size.
+    """
+    rows = [build_rows(submission) for submission in submissions]
+    emails = {client.email for client, project, communication in rows}
+    
+    with transaction.atomic():
+        existing = dict(Client.objects.filter(email__in=emails).values_list('email', 'status'))
+        new_clients = {}
+        for client, project, communication in rows:
+            if client.email not in existing and client.email not in new_clients:
+                client.project_count = 0
+                new_clients[client.email] = client
+        # ignore_conflicts: a concurrent webhook may have created the same email
+        Client.objects.bulk_create(new_clients.values(), ignore_conflicts=True)
+        Client.objects.filter(
+            email__in=[email for email, status in existing.items() if status == 'lead']
+        ).update(status='contacted')
+        client_ids = dict(Client.objects.filter(email__in=emails).values_list('email', 'id'))
+        
+        for client, project, communication in rows:
+            project.client_id = client_ids[client.email]
+        Project.objects.bulk_create([project for client, project, communication in rows])
+        
+        for client, project, communication in rows:
+            communication.client_id = project.client_id
+            communication.project_id = project.pk
+        Communication.objects.bulk_create([communication for client, project, communication in rows])
+        
+        # bulk_create skips Project.save(), so refresh the touched clients' totals
+        recompute_clients(client_ids.values())
+        transaction.on_commit(invalidate_dashboard_stats)
+    
+    return [project.pk for client, project, communication in rows]
+
 # api/views.py
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 from django.views import View
+import hmac
 import json
 import logging
-from clients.models import Client
-from projects.models import Project
-from communications.models import Communication
+from .intake import InvalidSubmission, parse_submission, record_inquiries, record_inquiry
+from .tasks import store_inquiries
+
+INTAKE_BATCH_SIZE = 1000
 
 logger = logging.getLogger(__name__)
 
@@ -525,60 +2403,106 @@ def webhook_contact_form(request):
     Webhook endpoint for website contact form submissions
     """
     try:
-        data = json.loads(request.body)
-        
-        # Create or get client
-        client, created = Client.objects.get_or_create(
-            email=data['email'],
-            defaults={
-                'first_name': data.get('name', '').split(' ')[0],
-                'last_name': ' '.join(data.get('name', '').split(' ')[1:]),
-                'institution': data.get('institution', ''),
-                'status': 'lead',
-                'lead_source': 'website',
-                'notes': f"Initial inquiry: {data.get('description', '')}"
-            }
-        )
-        
-        # Create project inquiry
-        project = Project.objects.create(
-            client=client,
-            title=f"Project Inquiry - {data.get('project_type', 'Unknown')}",
-            project_type=data.get('project_type', 'custom'),
-            description=data.get('description', ''),
-            status='inquiry',
-            priority='normal' if data.get('timeline') != 'rush' else 'urgent',
-        )
-        
-        # Log communication
-        Communication.objects.create(
-            client=client,
-            project=project,
-            communication_type='email',
-            direction='inbound',
-            subject=f"Website inquiry - {data.get('project_type', 'Project')}",
-            content=data.get('description', '')
-        )
-        
-        # Update client status if it was just a lead
-        if client.status == 'lead':
-            client.status = 'contacted'
-            client.save()
-        
-        logger.info(f"New inquiry from {client.email}: {project.title}")
-        
+        submission = parse_submission(json.loads(request.body))
+    except (ValueError, InvalidSubmission) as e:
         return JsonResponse({
-            'status': 'success',
-            'project_id': project.id,
-            'message': 'Inquiry received successfully'
-        })
-        
+            'status': 'error',
+            'message': str(e) if isinstance(e, InvalidSubmission) else 'Invalid JSON'
+        }, status=400)
+    
+    try:
+        # Client upsert, project and communication in one transaction
+        project_id, client_created = record_inquiry(submission)
     except Exception as e:
         logger.error(f"Webhook error: {str(e)}")
         return JsonResponse({
             'status': 'error',
             'message': 'Failed to process inquiry'
         }, status=500)
+    
+    logger.info(f"New inquiry from {submission['email']}: project {project_id}")
+    
+    return JsonResponse({
+        'status': 'success',
+        'project_id': project_id,
+        'message': 'Inquiry received successfully'
+    })
+
+def has_intake_token(request):
+    token = settings.INTAKE_API_TOKEN
+    supplied = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+    return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def webhook_contact_form_batch(request):
+    """
+    Bulk intake of newline-delimited JSON contact-form submissions.
+    
+    The body is read line by line and written in chunks of INTAKE_BATCH_SIZE,
+    so it is never held in memory whole. The response is NDJSON with one
+    result per input line followed by a summary. With ?defer=1 chunks are
+    queued for run_workers and lines report their job id instead.
+    """
+    if not has_intake_token(request):
+        return JsonResponse({'status': 'error', 'message': 'Invalid token'}, status=403)
+    
+    defer = request.GET.get('defer') == '1'
+    
+    # (line number, project or job id, error or None)
+    results = []
+    pending = []
+    
+    def flush():
+        if defer:
+            job = store_inquiries.enqueue([submission for line_number, submission in pending])
+            results.extend((line_number, job.pk if job else None, None) for line_number, submission in pending)
+            pending.clear()
+            return
+        try:
+            project_ids = record_inquiries([submission for line_number, submission in pending])
+        except Exception as e:
+            logger.error(f"Batch intake error: {str(e)}")
+            results.extend((line_number, None, 'Failed to store inquiry') for line_number, submission in pending)
+        else:
+            results.extend(
+                (line_number, project_id, None)
+                for (line_number, submission), project_id in zip(pending, project_ids)
+            )
+        pending.clear()
+    
+    for line_number, line in enumerate(request, start=1):
+        if not line.strip():
+            continue
+        try:
+            pending.append((line_number, parse_submission(json.loads(line))))
+        except (ValueError, InvalidSubmission) as e:
+            results.append((line_number, None, str(e) if isinstance(e, InvalidSubmission) else 'Invalid JSON'))
+            continue
+        except Exception as e:
+            # Earlier chunks are already stored: report the line, don't fail the batch
+            logger.error(f"Batch intake line {line_number}: {str(e)}")
+            results.append((line_number, None, 'Invalid submission'))
+            continue
+        if len(pending) >= INTAKE_BATCH_SIZE:
+            flush()
+    if pending:
+        flush()
+    
+    stored = sum(1 for line_number, project_id, error in results if error is None)
+    logger.info(f"Batch intake: {stored} stored, {len(results) - stored} rejected")
+    
+    def report():
+        for line_number, project_id, error in results:
+            if error is None and defer:
+                yield json.dumps({'line': line_number, 'status': 'queued', 'job_id': project_id}) + '\n'
+            elif error is None:
+                yield json.dumps({'line': line_number, 'status': 'success', 'project_id': project_id}) + '\n'
+            else:
+                yield json.dumps({'line': line_number, 'status': 'error', 'message': error}) + '\n'
+        yield json.dumps({'status': 'done', 'stored': stored, 'rejected': len(results) - stored}) + '\n'
+    
+    return StreamingHttpResponse(report(), content_type='application/x-ndjson')
 
 # api/urls.py
 from django.urls import path
@@ -586,129 +2510,277 @@ from . import views
 
 urlpatterns = [
     path('webhook/contact/', views.webhook_contact_form, name='webhook_contact'),
+    path('webhook/contact/batch/', views.webhook_contact_form_batch, name='webhook_contact_batch'),
+]
+
+# api/tests.py
+import json
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from clients.models import Client
+
+VALID = {'email': 'ada@example.edu', 'name': 'Ada Lovelace', 'project_type': 'quick_fix'}
+
+# Each is a JSON object with one field of the wrong type
+WRONG_TYPES = [
+    {**VALID, 'email': 5},
+    {**VALID, 'email': ['ada@example.edu']},
+    {**VALID, 'name': 42},
+    {**VALID, 'institution': {'name': 'MIT'}},
+    {**VALID, 'project_type': ['quick_fix']},
+    {**VALID, 'description': 3.5},
+    {**VALID, 'timeline': True},
 ]
 
+class WebhookContactFormTests(TestCase):
+    def post(self, payload):
+        return self.client.post(reverse('webhook_contact'), json.dumps(payload), content_type='application/json')
+    
+    def test_valid_submission(self):
+        response = self.post(VALID)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Client.objects.filter(email='ada@example.edu').exists())
+    
+    def test_non_string_fields_are_rejected(self):
+        for payload in WRONG_TYPES:
+            with self.subTest(payload=payload):
+                response = self.post(payload)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['status'], 'error')
+        self.assertFalse(Client.objects.exists())
+    
+    def test_non_object_payload_is_rejected(self):
+        for payload in (['ada@example.edu'], 'ada@example.edu', 7, None):
+            with self.subTest(payload=payload):
+                self.assertEqual(self.post(payload).status_code, 400)
+
+@override_settings(INTAKE_API_TOKEN='intake-token')
+class WebhookContactFormBatchTests(TestCase):
+    def test_bad_lines_are_reported_and_the_rest_stored(self):
+        lines = [VALID, *WRONG_TYPES, {**VALID, 'email': 'grace@example.edu'}]
+        body = '\n'.join(json.dumps(line) for line in lines) + '\nnot json\n'
+        response = self.client.post(
+            reverse('webhook_contact_batch'), body, content_type='application/x-ndjson',
+            HTTP_AUTHORIZATION='Bearer intake-token',
+        )
+        self.assertEqual(response.status_code, 200)
+        results = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        
+        statuses = {result['line']: result['status'] for result in results if 'line' in result}
+        self.assertEqual(statuses[1], 'success')
+        self.assertEqual(statuses[len(lines)], 'success')
+        for line_number in range(2, len(lines)):
+            self.assertEqual(statuses[line_number], 'error')
+        self.assertEqual(statuses[len(lines) + 1], 'error')
+        self.assertEqual(results[-1], {'status': 'done', 'stored': 2, 'rejected': len(WRONG_TYPES) + 1})
+        self.assertEqual(Client.objects.count(), 2)
+
 # ===== REPORTING VIEWS =====
 
 # reports/views.py
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from django.db.models import Sum, Count, Avg, Q
+from django.db.models import Sum, Count, Q
 from django.utils import timezone
+from collections import defaultdict
 from datetime import timedelta, datetime
+from decimal import Decimal
+from functools import partial
 from clients.models import Client
 from projects.models import Project
+from latex_services.concurrency import async_login_required, gather_queries
+from latex_services.replicas import read_from_replica
+from .models import MonthlyRevenue, PipelineSnapshot
+from .rollups import conversion_rates, pipeline_stage_totals
 import json
 
-@login_required
-def revenue_report(request):
-    """Monthly revenue and project completion report"""
-    
-    # Get last 12 months of data
-    end_date = timezone.now()
-    start_date = end_date - timedelta(days=365)
+# Each report is split into independent queries (evaluated to lists/dicts)
+# and a pure function assembling the context, so the sync views run the
+# queries in turn and the async views run them side by side.
+
+def parse_month(value, default):
+    """First day of the month for a 'YYYY-MM' query parameter"""
+    try:
+        return datetime.strptime(value, '%Y-%m').date()
+    except (TypeError, ValueError):
+        return default
+
+# Longest ?start/?end range the revenue report covers
+MAX_REVENUE_YEARS = 10
+
+def revenue_range(request):
+    # Default to the last 12 months; ?start=YYYY-MM&end=YYYY-MM for up to
+    # MAX_REVENUE_YEARS ending no later than this month (nothing completes in
+    # the future, and the month arithmetic stays clear of date.max)
+    this_month = timezone.localdate().replace(day=1)
+    default_start = (this_month - timedelta(days=365)).replace(day=1)
+    end_month = min(parse_month(request.GET.get('end'), this_month), this_month)
+    earliest = end_month.replace(year=max(1, end_month.year - MAX_REVENUE_YEARS))
+    return (
+        max(parse_month(request.GET.get('start'), default_start), earliest),
+        end_month,
+    )
+
+def revenue_queries(start_month, end_month):
+    return {
+        # One read of the rollup covers the monthly series and the type breakdown
+        'buckets': partial(_revenue_buckets, start_month, end_month),
+        # Client value analysis
+        'top_clients': _top_clients,
+        'all_time': _all_time_revenue,
+    }
+
+def _revenue_buckets(start_month, end_month):
+    return list(MonthlyRevenue.objects.filter(month__gte=start_month, month__lte=end_month))
+
+def _top_clients():
+    return list(Client.objects.filter(total_value__gt=0).order_by('-total_value')[:10])
+
+def _all_time_revenue():
+    return MonthlyRevenue.objects.aggregate(revenue=Sum('revenue'), valued=Sum('valued_count'))
+
+def revenue_context(start_month, end_month, buckets, top_clients, all_time):
+    by_month = defaultdict(lambda: {'revenue': Decimal(0), 'projects': 0})
+    by_type = defaultdict(lambda: {'revenue': Decimal(0), 'count': 0})
+    for bucket in buckets:
+        by_month[bucket.month]['revenue'] += bucket.revenue
+        by_month[bucket.month]['projects'] += bucket.completed_count
+        by_type[bucket.project_type]['revenue'] += bucket.revenue
+        by_type[bucket.project_type]['count'] += bucket.completed_count
     
     # Monthly revenue
     monthly_data = []
-    current_date = start_date.replace(day=1)
+    current_date = start_month
     
-    while current_date <= end_date:
-        next_month = (current_date.replace(day=28) + timedelta(days=4)).replace(day=1)
-        
-        revenue = Project.objects.filter(
-            completed_at__gte=current_date,
-            completed_at__lt=next_month,
-            status='completed'
-        ).aggregate(total=Sum('final_amount'))['total'] or 0
-        
-        project_count = Project.objects.filter(
-            completed_at__gte=current_date,
-            completed_at__lt=next_month,
-            status='completed'
-        ).count()
-        
+    while current_date <= end_month:
+        month = by_month.get(current_date, {'revenue': 0, 'projects': 0})
         monthly_data.append({
             'month': current_date.strftime('%Y-%m'),
             'month_name': current_date.strftime('%B %Y'),
-            'revenue': float(revenue),
-            'projects': project_count
+            'revenue': float(month['revenue']),
+            'projects': month['projects']
         })
-        
-        current_date = next_month
+        current_date = (current_date + timedelta(days=32)).replace(day=1)
     
     # Project type breakdown
-    project_types = Project.objects.filter(
-        status='completed',
-        completed_at__gte=start_date
-    ).values('project_type').annotate(
-        count=Count('id'),
-        revenue=Sum('final_amount')
-    ).order_by('-revenue')
-    
-    # Client value analysis
-    top_clients = Client.objects.annotate(
-        total_value=Sum('projects__final_amount'),
-        project_count=Count('projects')
-    ).filter(total_value__gt=0).order_by('-total_value')[:10]
+    project_types = sorted(
+        ({'project_type': project_type, **totals} for project_type, totals in by_type.items()),
+        key=lambda item: item['revenue'],
+        reverse=True
+    )
     
-    context = {
+    return {
         'monthly_data': monthly_data,
         'monthly_data_json': json.dumps(monthly_data),
         'project_types': project_types,
         'top_clients': top_clients,
+        'start_month': start_month,
+        'end_month': end_month,
         'total_revenue': sum(item['revenue'] for item in monthly_data),
         'total_projects': sum(item['projects'] for item in monthly_data),
-        'avg_project_value': Project.objects.filter(
-            status='completed', final_amount__isnull=False
-        ).aggregate(avg=Avg('final_amount'))['avg'] or 0
+        # Over projects with a final amount; unpriced ones would drag it down
+        'avg_project_value': (all_time['revenue'] / all_time['valued']) if all_time['valued'] else 0
     }
-    
+
+@login_required
+@read_from_replica
+def revenue_report(request):
+    """Monthly revenue and project completion report"""
+    start_month, end_month = revenue_range(request)
+    results = {name: query() for name, query in revenue_queries(start_month, end_month).items()}
+    context = revenue_context(start_month, end_month, **results)
     return render(request, 'reports/revenue_report.html', context)
 
-@login_required  
-def pipeline_report(request):
-    """Sales pipeline and conversion analysis"""
-    
-    # Pipeline stages
+@async_login_required
+@read_from_replica
+async def revenue_report_async(request):
+    """revenue_report with its queries run concurrently"""
+    start_month, end_month = revenue_range(request)
+    results = await gather_queries(**revenue_queries(start_month, end_month))
+    context = revenue_context(start_month, end_month, **results)
+    return await sync_to_async(render)(request, 'reports/revenue_report.html', context)
+
+def history_start(request):
+    # Funnel history window from the daily snapshots (see snapshot_pipeline)
+    try:
+        weeks = max(1, min(int(request.GET.get('weeks', 12)), 520))
+    except ValueError:
+        weeks = 12
+    return timezone.localdate() - timedelta(weeks=weeks)
+
+def pipeline_queries(since):
+    return {
+        # Pipeline stages (one grouped query also feeds the conversion rates)
+        'stage_totals': pipeline_stage_totals,
+        'snapshots': partial(_pipeline_snapshots, since),
+        # Lead sources performance
+        'lead_sources': _lead_sources,
+    }
+
+def _pipeline_snapshots(since):
+    return list(PipelineSnapshot.objects.filter(date__gte=since).order_by('date'))
+
+def _lead_sources():
+    return list(Client.objects.values('lead_source').annotate(
+        count=Count('id'),
+        converted=Count('projects', filter=Q(projects__status='completed'))
+    ).order_by('-count'))
+
+def pipeline_context(stage_totals, snapshots, lead_sources):
     pipeline_data = []
     for status, label in Project.STATUS_CHOICES:
-        count = Project.objects.filter(status=status).count()
-        total_value = Project.objects.filter(
-            status=status
-        ).aggregate(total=Sum('quoted_amount'))['total'] or 0
-        
         pipeline_data.append({
             'status': status,
             'label': label,
-            'count': count,
-            'value': float(total_value)
+            'count': stage_totals[status]['count'],
+            'value': float(stage_totals[status]['value'])
         })
     
     # Conversion rates
-    total_inquiries = Project.objects.filter(status='inquiry').count()
-    total_quotes = Project.objects.filter(status__in=['quoted', 'approved', 'in_progress', 'completed']).count()
-    total_completed = Project.objects.filter(status='completed').count()
-    
-    conversion_rates = {
-        'inquiry_to_quote': (total_quotes / total_inquiries * 100) if total_inquiries else 0,
-        'quote_to_completion': (total_completed / total_quotes * 100) if total_quotes else 0,
-        'overall_conversion': (total_completed / total_inquiries * 100) if total_inquiries else 0
-    }
+    current_rates = conversion_rates({status: totals['count'] for status, totals in stage_totals.items()})
     
-    # Lead sources performance
-    lead_sources = Client.objects.values('lead_source').annotate(
-        count=Count('id'),
-        converted=Count('projects', filter=Q(projects__status='completed'))
-    ).order_by('-count')
+    snapshot_counts = defaultdict(dict)
+    for snapshot in snapshots:
+        snapshot_counts[snapshot.date][snapshot.status] = snapshot.count
     
-    context = {
+    funnel_history = [
+        {'date': date.isoformat(), 'counts': counts, **conversion_rates(counts)}
+        for date, counts in snapshot_counts.items()
+    ]
+    
+    # Week-over-week change against the snapshot closest to 7 days ago
+    week_over_week = None
+    week_ago = timezone.localdate() - timedelta(days=7)
+    earlier = [date for date in snapshot_counts if date <= week_ago]
+    if earlier:
+        previous_rates = conversion_rates(snapshot_counts[max(earlier)])
+        week_over_week = {
+            key: current_rates[key] - previous_rates[key] for key in current_rates
+        }
+    
+    return {
         'pipeline_data': pipeline_data,
         'pipeline_data_json': json.dumps(pipeline_data),
-        'conversion_rates': conversion_rates,
+        'conversion_rates': current_rates,
+        'funnel_history_json': json.dumps(funnel_history),
+        'week_over_week': week_over_week,
         'lead_sources': lead_sources
     }
-    
-    return render(request, 'reports/pipeline_report.html', context)
+
+@login_required
+@read_from_replica
+def pipeline_report(request):
+    """Sales pipeline and conversion analysis"""
+    results = {name: query() for name, query in pipeline_queries(history_start(request)).items()}
+    return render(request, 'reports/pipeline_report.html', pipeline_context(**results))
+
+@async_login_required
+@read_from_replica
+async def pipeline_report_async(request):
+    """pipeline_report with its queries run concurrently"""
+    results = await gather_queries(**pipeline_queries(history_start(request)))
+    return await sync_to_async(render)(request, 'reports/pipeline_report.html', pipeline_context(**results))
 
 # reports/urls.py
 from django.urls import path
@@ -717,8 +2789,96 @@ from . import views
 urlpatterns = [
     path('revenue/', views.revenue_report, name='revenue_report'),
     path('pipeline/', views.pipeline_report, name='pipeline_report'),
+    path('revenue/async/', views.revenue_report_async, name='revenue_report_async'),
+    path('pipeline/async/', views.pipeline_report_async, name='pipeline_report_async'),
 ]
 
+# reports/tests.py
+from datetime import datetime
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncMonth
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from clients.models import Client
+from projects.models import Project
+from .models import MonthlyRevenue
+from .rollups import rebuild_revenue_rollup
+
+def completed_on(year, month, day):
+    return timezone.make_aware(datetime(year, month, day, 12))
+
+@override_settings(JOBS_EAGER=True)
+class RevenueRollupTests(TestCase):
+    def setUp(self):
+        self.client_record = Client.objects.create(first_name='Ada', last_name='Lovelace', email='ada@example.edu')
+    
+    def project(self, project_type='quick_fix', status='completed', completed_at=None, final_amount=None):
+        return Project.objects.create(
+            client=self.client_record, title='Thesis conversion', project_type=project_type, description='',
+            status=status, completed_at=completed_at, final_amount=final_amount,
+        )
+    
+    def assertRollupMatchesProjects(self):
+        live = Project.objects.filter(status='completed', completed_at__isnull=False).order_by().annotate(
+            month=TruncMonth('completed_at', output_field=DateField())
+        ).values('month', 'project_type').annotate(
+            revenue=Sum('final_amount'), completed_count=Count('id'), valued_count=Count('final_amount'),
+        )
+        expected = {
+            (row['month'], row['project_type']): (row['revenue'] or Decimal(0), row['completed_count'], row['valued_count'])
+            for row in live
+        }
+        stored = {
+            (row.month, row.project_type): (row.revenue, row.completed_count, row.valued_count)
+            for row in MonthlyRevenue.objects.all()
+        }
+        self.assertEqual(stored, expected)
+    
+    def test_saves_and_deletes_keep_the_rollup_current(self):
+        first = self.project(completed_at=completed_on(2024, 3, 5), final_amount=Decimal('200.00'))
+        second = self.project(completed_at=completed_on(2024, 3, 20), final_amount=Decimal('250.00'))
+        self.project('premium_workflow', completed_at=completed_on(2024, 4, 2))
+        self.project(status='in_progress', final_amount=Decimal('900.00'))
+        self.assertRollupMatchesProjects()
+        
+        steps = [
+            ('moved to another month', {'completed_at': completed_on(2024, 4, 30)}),
+            ('changed type', {'project_type': 'custom'}),
+            ('repriced', {'final_amount': Decimal('300.00')}),
+            ('reopened', {'status': 'review'}),
+        ]
+        for step, changes in steps:
+            with self.subTest(step=step):
+                for name, value in changes.items():
+                    setattr(first, name, value)
+                first.save()
+                self.assertRollupMatchesProjects()
+        
+        second.delete()
+        self.assertRollupMatchesProjects()
+        self.assertFalse(MonthlyRevenue.objects.filter(month=completed_on(2024, 3, 1).date()).exists())
+    
+    def test_rebuild_matches_the_projects(self):
+        with self.settings(JOBS_EAGER=False):
+            for day in (1, 15, 28):
+                self.project(completed_at=completed_on(2024, 2, day), final_amount=Decimal('200.00'))
+            self.project('standard_conversion', completed_at=completed_on(2024, 5, 9))
+        MonthlyRevenue.objects.all().delete()
+        self.assertEqual(rebuild_revenue_rollup(), 2)
+        self.assertRollupMatchesProjects()
+    
+    def test_average_value_skips_unpriced_projects(self):
+        self.project(completed_at=completed_on(2024, 3, 5), final_amount=Decimal('400.00'))
+        self.project(completed_at=completed_on(2024, 3, 6), final_amount=Decimal('200.00'))
+        self.project('custom', completed_at=completed_on(2024, 3, 7))
+        self.client.force_login(User.objects.create_user('staff', password='secret'))
+        response = self.client.get(reverse('revenue_report'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['avg_project_value'], Decimal('300.00'))
+
 # ===== EMAIL TEMPLATES =====
 
 # templates/emails/quote_template.html
@@ -806,8 +2966,9 @@ python manage.py migrate
 # Collect static files
 python manage.py collectstatic --noinput
 
-# Restart services (adjust for your setup)
+# Restart services (adjust for your setup); the workers run queued jobs
 sudo systemctl restart gunicorn
+sudo systemctl restart latex-workers
 sudo systemctl restart nginx
 
 echo "✅ Deployment complete!"
@@ -842,6 +3003,17 @@ services:
       - DEBUG=1
       - DB_HOST=db
 
+  worker:
+    build: .
+    command: python manage.py run_workers --processes 2 --threads 4
+    volumes:
+      - .:/code
+    depends_on:
+      - db
+    environment:
+      - DEBUG=1
+      - DB_HOST=db
+
 volumes:
   postgres_data:
 """
@@ -852,6 +3024,10 @@ FROM python:3.11-slim
 
 WORKDIR /code
 
+# pdftoppm renders PDF previews
+RUN apt-get update && apt-get install -y --no-install-recommends poppler-utils \
+    && rm -rf /var/lib/apt/lists/*
+
 COPY requirements.txt .
 RUN pip install -r requirements.txt
 
@@ -15,10 +15,17 @@ from . import views
 
 urlpatterns = [
     path('', views.project_list, name='project_list'),
+    path('queue/', views.work_queue, name='work_queue'),
     path('<int:pk>/', views.project_detail, name='project_detail'),
     path('add/', views.project_create, name='project_create'),
     path('<int:pk>/edit/', views.project_edit, name='project_edit'),
     path('<int:pk>/files/upload/', views.upload_file, name='upload_file'),
+    path('<int:pk>/uploads/', views.start_upload, name='start_upload'),
+    path('uploads/<uuid:upload_id>/', views.upload_status, name='upload_status'),
+    path('uploads/<uuid:upload_id>/chunk/', views.upload_chunk, name='upload_chunk'),
+    path('files/<int:file_pk>/download/', views.download_file, name='download_file'),
+    path('files/<int:file_pk>/preview/', views.file_preview, name='file_preview'),
+    path('files/<int:file_pk>/preview/<int:page>/', views.file_preview, name='file_preview_page'),
 ]
 
 # communications/urls.py
@@ -86,6 +93,12 @@ urlpatterns = [
                             <i class="fas fa-project-diagram me-2"></i>Projects
                         </a>
                     </li>
+                    <li class="nav-item mb-2">
+                        <a class="nav-link {% if request.resolver_match.url_name == 'work_queue' %}active{% endif %}" 
+                           href="{% url 'work_queue' %}">
+                            <i class="fas fa-list-ol me-2"></i>Work Queue
+                        </a>
+                    </li>
                     <li class="nav-item mb-2">
                         <a class="nav-link {% if 'communication' in request.resolver_match.url_name %}active{% endif %}" 
                            href="{% url 'communication_list' %}">
@@ -142,22 +155,8 @@ urlpatterns = [
 </div>
 
 <!-- Statistics Cards -->
-<div class="row mb-4">
-    <div class="col-md-3">
-        <div class="card bg-primary text-white">
-            <div class="card-body">
-                <div class="d-flex justify-content-between">
-                    <div>
-                        <h3>{{ stats.active_projects }}</h3>
-                        <p class="mb-0">Active Projects</p>
-                    </div>
-                    <div class="align-self-center">
-                        <i class="fas fa-users fa-2x"></i>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
+<div id="widget-stats">
+    {% if streaming %}{% include 'dashboard/_loading.html' %}{% else %}{% include 'dashboard/_stats.html' %}{% endif %}
 </div>
 
 <!-- Recent Activity -->
@@ -168,46 +167,8 @@ urlpatterns = [
                 <h5 class="mb-0">Recent Projects</h5>
             </div>
             <div class="card-body">
-                <div class="table-responsive">
-                    <table class="table table-hover">
-                        <thead>
-                            <tr>
-                                <th>Project</th>
-                                <th>Client</th>
-                                <th>Status</th>
-                                <th>Deadline</th>
-                                <th>Value</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {% for project in recent_projects %}
-                            <tr class="priority-{{ project.priority }}">
-                                <td>
-                                    <a href="{% url 'project_detail' project.pk %}">{{ project.title }}</a>
-                                </td>
-                                <td>{{ project.client.full_name }}</td>
-                                <td>
-                                    <span class="badge bg-secondary status-badge">{{ project.get_status_display }}</span>
-                                </td>
-                                <td>
-                                    {% if project.deadline %}
-                                        {{ project.deadline|date:"M d, Y" }}
-                                        {% if project.is_overdue %}
-                                            <span class="badge bg-danger ms-1">Overdue</span>
-                                        {% endif %}
-                                    {% else %}
-                                        No deadline
-                                    {% endif %}
-                                </td>
-                                <td>${{ project.quoted_amount|default:"—" }}</td>
-                            </tr>
-                            {% empty %}
-                            <tr>
-                                <td colspan="5" class="text-center text-muted">No recent projects</td>
-                            </tr>
-                            {% endfor %}
-                        </tbody>
-                    </table>
+                <div id="widget-recent_projects">
+                    {% if streaming %}{% include 'dashboard/_loading.html' %}{% else %}{% include 'dashboard/_recent_projects.html' %}{% endif %}
                 </div>
             </div>
         </div>
@@ -241,24 +202,292 @@ urlpatterns = [
                 <h5 class="mb-0">Recent Communications</h5>
             </div>
             <div class="card-body">
-                {% for comm in recent_communications %}
-                <div class="d-flex mb-3">
-                    <div class="flex-shrink-0">
-                        <i class="fas fa-{{ comm.communication_type }} text-muted"></i>
+                <div id="widget-recent_communications">
+                    {% if streaming %}{% include 'dashboard/_loading.html' %}{% else %}{% include 'dashboard/_recent_communications.html' %}{% endif %}
+                </div>
+            </div>
+        </div>
+    </div>
+</div>
+{% endblock %}
+
+{% block extra_js %}
+{% if streaming %}
+<script>
+    // Widgets arrive as <template data-widget> chunks after the shell
+    function fillWidget(name) {
+        var chunk = document.querySelector('template[data-widget="' + name + '"]');
+        document.getElementById('widget-' + name).replaceChildren(chunk.content);
+        chunk.remove();
+    }
+</script>
+{{ widgets_marker|safe }}
+{% endif %}
+{% endblock %}
+
+# templates/dashboard/_loading.html
+<div class="text-center text-muted py-4">
+    <span class="spinner-border spinner-border-sm"></span> Loading...
+</div>
+
+# templates/dashboard/_stats.html
+{% load humanize %}
+<div class="row mb-4">
+    <div class="col-md-3">
+        <div class="card bg-primary text-white">
+            <div class="card-body">
+                <div class="d-flex justify-content-between">
+                    <div>
+                        <h3>{{ stats.active_projects }}</h3>
+                        <p class="mb-0">Active Projects</p>
                     </div>
-                    <div class="flex-grow-1 ms-3">
-                        <div class="fw-bold">{{ comm.subject }}</div>
-                        <small class="text-muted">
-                            {{ comm.client.full_name }} - {{ comm.created_at|timesince }} ago
-                        </small>
+                    <div class="align-self-center">
+                        <i class="fas fa-project-diagram fa-2x"></i>
+                    </div>
+                </div>
+            </div>
+        </div>
+    </div>
+    <div class="col-md-3">
+        <div class="card bg-success text-white">
+            <div class="card-body">
+                <div class="d-flex justify-content-between">
+                    <div>
+                        <h3>${{ stats.monthly_revenue|floatformat:0|intcomma }}</h3>
+                        <p class="mb-0">This Month</p>
+                    </div>
+                    <div class="align-self-center">
+                        <i class="fas fa-dollar-sign fa-2x"></i>
+                    </div>
+                </div>
+            </div>
+        </div>
+    </div>
+    <div class="col-md-3">
+        <div class="card bg-warning text-white">
+            <div class="card-body">
+                <div class="d-flex justify-content-between">
+                    <div>
+                        <h3>{{ stats.pending_quotes }}</h3>
+                        <p class="mb-0">Pending Quotes</p>
+                    </div>
+                    <div class="align-self-center">
+                        <i class="fas fa-clock fa-2x"></i>
                     </div>
                 </div>
-                {% empty %}
-                <p class="text-muted">No recent communications</p>
-                {% endfor %}
             </div>
         </div>
     </div>
+    <div class="col-md-3">
+        <div class="card bg-info text-white">
+            <div class="card-body">
+                <div class="d-flex justify-content-between">
+                    <div>
+                        <h3>{{ stats.total_clients }}</h3>
+                        <p class="mb-0">Total Clients</p>
+                    </div>
+                    <div class="align-self-center">
+                        <i class="fas fa-users fa-2x"></i>
+                    </div>
+                </div>
+            </div>
+        </div>
+    </div>
+</div>
+
+# templates/dashboard/_recent_projects.html
+<div class="table-responsive">
+    <table class="table table-hover">
+        <thead>
+            <tr>
+                <th>Project</th>
+                <th>Client</th>
+                <th>Status</th>
+                <th>Deadline</th>
+                <th>Value</th>
+            </tr>
+        </thead>
+        <tbody>
+            {% for project in recent_projects %}
+            <tr class="priority-{{ project.priority }}">
+                <td>
+                    <a href="{% url 'project_detail' project.pk %}">{{ project.title }}</a>
+                </td>
+                <td>{{ project.client.full_name }}</td>
+                <td>
+                    <span class="badge bg-secondary status-badge">{{ project.get_status_display }}</span>
+                </td>
+                <td>
+                    {% if project.deadline %}
+                        {{ project.deadline|date:"M d, Y" }}
+                        {% if project.is_overdue %}
+                            <span class="badge bg-danger ms-1">Overdue</span>
+                        {% endif %}
+                    {% else %}
+                        No deadline
+                    {% endif %}
+                </td>
+                <td>${{ project.quoted_amount|default:"—" }}</td>
+            </tr>
+            {% empty %}
+            <tr>
+                <td colspan="5" class="text-center text-muted">No recent projects</td>
+            </tr>
+            {% endfor %}
+        </tbody>
+    </table>
+</div>
+
+# templates/dashboard/_recent_communications.html
+{% for comm in recent_communications %}
+<div class="d-flex mb-3">
+    <div class="flex-shrink-0">
+        <i class="fas fa-{{ comm.communication_type }} text-muted"></i>
+    </div>
+    <div class="flex-grow-1 ms-3">
+        <div class="fw-bold">{{ comm.subject }}</div>
+        <small class="text-muted">
+            {{ comm.client.full_name }} - {{ comm.created_at|timesince }} ago
+        </small>
+    </div>
+</div>
+{% empty %}
+<p class="text-muted">No recent communications</p>
+{% endfor %}
+
+# templates/debug/request_metrics.html
+{% extends 'base.html' %}
+
+{% block title %}Request Metrics - LaTeX Services{% endblock %}
+
+{% block content %}
+<div class="d-flex justify-content-between align-items-center mb-4">
+    <h1>Request Metrics</h1>
+    <span class="text-muted">Last {{ buffered }} requests served by this process</span>
+</div>
+
+<div class="card mb-4">
+    <div class="card-header">
+        <h5 class="mb-0">By View</h5>
+    </div>
+    <div class="card-body">
+        <div class="table-responsive">
+            <table class="table table-sm table-hover">
+                <thead>
+                    <tr>
+                        <th>View</th>
+                        <th>Requests</th>
+                        <th>Avg Queries</th>
+                        <th>Max Queries</th>
+                        <th>Budget</th>
+                        <th>Avg DB (ms)</th>
+                        <th>Avg Render (ms)</th>
+                        <th>p50 (ms)</th>
+                        <th>p95 (ms)</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {% for row in summary %}
+                    <tr{% if row.budget is not None and row.max_queries > row.budget %} class="table-danger"{% endif %}>
+                        <td><code>{{ row.view }}</code></td>
+                        <td>{{ row.requests }}</td>
+                        <td>{{ row.avg_queries|floatformat:1 }}</td>
+                        <td>{{ row.max_queries }}</td>
+                        <td>{{ row.budget|default_if_none:"—" }}</td>
+                        <td>{{ row.avg_db_ms|floatformat:1 }}</td>
+                        <td>{{ row.avg_render_ms|floatformat:1 }}</td>
+                        <td>{{ row.p50_ms|floatformat:1 }}</td>
+                        <td>{{ row.p95_ms|floatformat:1 }}</td>
+                    </tr>
+                    {% empty %}
+                    <tr>
+                        <td colspan="9" class="text-center text-muted">No requests recorded yet</td>
+                    </tr>
+                    {% endfor %}
+                </tbody>
+            </table>
+        </div>
+    </div>
+</div>
+
+{% if db_pools %}
+<div class="card mb-4">
+    <div class="card-header">
+        <h5 class="mb-0">Connection Pools</h5>
+    </div>
+    <div class="card-body">
+        <div class="table-responsive">
+            <table class="table table-sm">
+                <thead>
+                    <tr>
+                        <th>Database</th>
+                        <th>Size</th>
+                        <th>In Use</th>
+                        <th>Idle</th>
+                        <th>Checkouts</th>
+                        <th>Created</th>
+                        <th>Timeouts</th>
+                        <th>Avg Wait (ms)</th>
+                        <th>Max Wait (ms)</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {% for alias, pool in db_pools.items %}
+                    <tr{% if pool.timeouts %} class="table-warning"{% endif %}>
+                        <td><code>{{ alias }}</code></td>
+                        <td>{{ pool.size }}</td>
+                        <td>{{ pool.in_use }}</td>
+                        <td>{{ pool.idle }}</td>
+                        <td>{{ pool.checkouts }}</td>
+                        <td>{{ pool.created }}</td>
+                        <td>{{ pool.timeouts }}</td>
+                        <td>{{ pool.avg_wait_ms }}</td>
+                        <td>{{ pool.max_wait_ms }}</td>
+                    </tr>
+                    {% endfor %}
+                </tbody>
+            </table>
+        </div>
+    </div>
+</div>
+{% endif %}
+
+<div class="card">
+    <div class="card-header">
+        <h5 class="mb-0">Recent Requests</h5>
+    </div>
+    <div class="card-body">
+        <div class="table-responsive">
+            <table class="table table-sm">
+                <thead>
+                    <tr>
+                        <th>Time</th>
+                        <th>Request</th>
+                        <th>View</th>
+                        <th>Status</th>
+                        <th>Queries</th>
+                        <th>DB (ms)</th>
+                        <th>Render (ms)</th>
+                        <th>Total (ms)</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {% for entry in recent %}
+                    <tr>
+                        <td>{{ entry.at|date:"H:i:s" }}</td>
+                        <td>{{ entry.method }} {{ entry.path }}</td>
+                        <td><code>{{ entry.view }}</code></td>
+                        <td>{{ entry.status }}</td>
+                        <td>{{ entry.queries }}</td>
+                        <td>{{ entry.db_ms }}</td>
+                        <td>{{ entry.render_ms }}</td>
+                        <td>{{ entry.total_ms }}</td>
+                    </tr>
+                    {% endfor %}
+                </tbody>
+            </table>
+        </div>
+    </div>
 </div>
 {% endblock %}
 
@@ -320,36 +549,8 @@ urlpatterns = [
                     </tr>
                 </thead>
                 <tbody>
-                    {% for client in clients %}
-                    <tr>
-                        <td>
-                            <div class="fw-bold">{{ client.full_name }}</div>
-                            <small class="text-muted">{{ client.email }}</small>
-                        </td>
-                        <td>{{ client.institution|default:"—" }}</td>
-                        <td>
-                            <span class="badge bg-{% if client.status == 'active' %}success{% elif client.status == 'lead' %}warning{% else %}secondary{% endif %}">
-                                {{ client.get_status_display }}
-                            </span>
-                        </td>
-                        <td>{{ client.project_count }}</td>
-                        <td>${{ client.total_value|default:0|floatformat:0|intcomma }}</td>
-                        <td>
-                            {% if client.last_contact %}
-                                {{ client.last_contact|timesince }} ago
-                            {% else %}
-                                Never
-                            {% endif %}
-                        </td>
-                        <td>
-                            <a href="{% url 'client_detail' client.pk %}" class="btn btn-sm btn-outline-primary">
-                                <i class="fas fa-eye"></i>
-                            </a>
-                            <a href="{% url 'client_edit' client.pk %}" class="btn btn-sm btn-outline-secondary">
-                                <i class="fas fa-edit"></i>
-                            </a>
-                        </td>
-                    </tr>
+                    {% for row in rows %}
+                    {{ row }}
                     {% empty %}
                     <tr>
                         <td colspan="7" class="text-center text-muted py-4">
@@ -360,6 +561,18 @@ urlpatterns = [
                 </tbody>
             </table>
         </div>
+        {% if page.has_previous or page.has_next %}
+        <nav aria-label="Client list pages">
+            <ul class="pagination justify-content-end mb-0">
+                <li class="page-item {% if not page.has_previous %}disabled{% endif %}">
+                    <a class="page-link" href="{% if prev_query %}?{{ prev_query }}{% else %}#{% endif %}">&laquo; Newer</a>
+                </li>
+                <li class="page-item {% if not page.has_next %}disabled{% endif %}">
+                    <a class="page-link" href="{% if next_query %}?{{ next_query }}{% else %}#{% endif %}">Older &raquo;</a>
+                </li>
+            </ul>
+        </nav>
+        {% endif %}
     </div>
 </div>
 {% endblock %}
@@ -438,107 +651,254 @@ urlpatterns = [
                     </tr>
                 </thead>
                 <tbody>
-                    {% for project in projects %}
-                    <tr class="priority-{{ project.priority }}">
-                        <td>
-                            <div class="fw-bold">{{ project.title }}</div>
-                            <small class="text-muted">Created {{ project.created_at|date:"M d, Y" }}</small>
-                        </td>
-                        <td>
-                            <a href="{% url 'client_detail' project.client.pk %}">
-                                {{ project.client.full_name }}
-                            </a>
-                        </td>
-                        <td>
-                            <span class="badge bg-light text-dark">{{ project.get_project_type_display }}</span>
-                        </td>
-                        <td>
-                            <span class="badge bg-{% if project.status == 'completed' %}success{% elif project.status == 'in_progress' %}primary{% elif project.status == 'cancelled' %}danger{% else %}secondary{% endif %}">
-                                {{ project.get_status_display }}
-                            </span>
-                        </td>
-                        <td>
-                            <span class="badge bg-{% if project.priority == 'urgent' %}danger{% elif project.priority == 'high' %}warning{% elif project.priority == 'normal' %}success{% else %}secondary{% endif %}">
-                                {{ project.get_priority_display }}
-                            </span>
-                        </td>
-                        <td>
-                            {% if project.deadline %}
-                                {{ project.deadline|date:"M d, Y" }}
-                                {% if project.is_overdue %}
-                                    <br><span class="badge bg-danger">Overdue</span>
-                                {% elif project.days_until_deadline <= 3 %}
-                                    <br><span class="badge bg-warning">Due Soon</span>
-                                {% endif %}
-                            {% else %}
-                                No deadline
-                            {% endif %}
-                        </td>
-                        <td>${{ project.quoted_amount|default:"—" }}</td>
-                        <td>
-                            <a href="{% url 'project_detail' project.pk %}" class="btn btn-sm btn-outline-primary">
-                                <i class="fas fa-eye"></i>
-                            </a>
-                            <a href="{% url 'project_edit' project.pk %}" class="btn btn-sm btn-outline-secondary">
-                                <i class="fas fa-edit"></i>
-                            </a>
+                    {% for row in rows %}
+                    {{ row }}
+                    {% empty %}
+                    <tr>
+                        <td colspan="8" class="text-center text-muted py-4">
+                            No projects found. <a href="{% url 'project_create' %}">Create your first project</a>!
                         </td>
                     </tr>
+                    {% endfor %}
+                </tbody>
+            </table>
+        </div>
+        {% if page.has_previous or page.has_next %}
+        <nav aria-label="Project list pages">
+            <ul class="pagination justify-content-end mb-0">
+                <li class="page-item {% if not page.has_previous %}disabled{% endif %}">
+                    <a class="page-link" href="{% if prev_query %}?{{ prev_query }}{% else %}#{% endif %}">&laquo; Newer</a>
+                </li>
+                <li class="page-item {% if not page.has_next %}disabled{% endif %}">
+                    <a class="page-link" href="{% if next_query %}?{{ next_query }}{% else %}#{% endif %}">Older &raquo;</a>
+                </li>
+            </ul>
+        </nav>
+        {% endif %}
+    </div>
+</div>
+{% endblock %}
+
+# templates/clients/_client_row.html
+{% load humanize %}
+<tr>
+    <td>
+        <div class="fw-bold">{{ client.full_name }}</div>
+        <small class="text-muted">{{ client.email }}</small>
+    </td>
+    <td>{{ client.institution|default:"—" }}</td>
+    <td>
+        <span class="badge bg-{% if client.status == 'active' %}success{% elif client.status == 'lead' %}warning{% else %}secondary{% endif %}">
+            {{ client.get_status_display }}
+        </span>
+    </td>
+    <td>{{ client.project_count }}</td>
+    <td>${{ client.total_value|default:0|floatformat:0|intcomma }}</td>
+    <td>
+        <!--live:last_contact-->
+    </td>
+    <td>
+        <a href="{% url 'client_detail' client.pk %}" class="btn btn-sm btn-outline-primary">
+            <i class="fas fa-eye"></i>
+        </a>
+        <a href="{% url 'client_edit' client.pk %}" class="btn btn-sm btn-outline-secondary">
+            <i class="fas fa-edit"></i>
+        </a>
+    </td>
+</tr>
+
+# templates/projects/_project_row.html
+<tr class="priority-{{ project.priority }}">
+    <td>
+        <div class="fw-bold">{{ project.title }}</div>
+        <small class="text-muted">Created {{ project.created_at|date:"M d, Y" }}</small>
+    </td>
+    <td>
+        <a href="{% url 'client_detail' project.client.pk %}">
+            {{ project.client.full_name }}
+        </a>
+    </td>
+    <td>
+        <span class="badge bg-light text-dark">{{ project.get_project_type_display }}</span>
+    </td>
+    <td>
+        <span class="badge bg-{% if project.status == 'completed' %}success{% elif project.status == 'in_progress' %}primary{% elif project.status == 'cancelled' %}danger{% else %}secondary{% endif %}">
+            {{ project.get_status_display }}
+        </span>
+    </td>
+    <td>
+        <span class="badge bg-{% if project.priority == 'urgent' %}danger{% elif project.priority == 'high' %}warning{% elif project.priority == 'normal' %}success{% else %}secondary{% endif %}">
+            {{ project.get_priority_display }}
+        </span>
+    </td>
+    <td>
+        {% if project.deadline %}
+            {{ project.deadline|date:"M d, Y" }}
+            <!--live:deadline_badge-->
+        {% else %}
+            No deadline
+        {% endif %}
+    </td>
+    <td>${{ project.quoted_amount|default:"—" }}</td>
+    <td>
+        <a href="{% url 'project_detail' project.pk %}" class="btn btn-sm btn-outline-primary">
+            <i class="fas fa-eye"></i>
+        </a>
+        <a href="{% url 'project_edit' project.pk %}" class="btn btn-sm btn-outline-secondary">
+            <i class="fas fa-edit"></i>
+        </a>
+    </td>
+</tr>
+
+# templates/projects/work_queue.html
+{% extends 'base.html' %}
+
+{% block title %}Work Queue - LaTeX Services{% endblock %}
+
+{% block content %}
+<div class="d-flex justify-content-between align-items-center mb-4">
+    <h1>Work Queue</h1>
+    <a href="{% url 'project_list' %}" class="btn btn-outline-secondary">
+        <i class="fas fa-project-diagram"></i> All Projects
+    </a>
+</div>
+
+<!-- Active projects, most urgent first, then by deadline -->
+<div class="card">
+    <div class="card-body">
+        <div class="table-responsive">
+            <table class="table table-hover">
+                <thead>
+                    <tr>
+                        <th>Project</th>
+                        <th>Client</th>
+                        <th>Type</th>
+                        <th>Status</th>
+                        <th>Priority</th>
+                        <th>Deadline</th>
+                        <th>Value</th>
+                        <th>Actions</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {% for row in rows %}
+                    {{ row }}
                     {% empty %}
                     <tr>
                         <td colspan="8" class="text-center text-muted py-4">
-                            No projects found. <a href="{% url 'project_create' %}">Create your first project</a>!
+                            Nothing in the queue.
                         </td>
                     </tr>
                     {% endfor %}
                 </tbody>
             </table>
         </div>
+        {% if continued or next_query %}
+        <nav aria-label="Work queue pages">
+            <ul class="pagination justify-content-end mb-0">
+                <li class="page-item {% if not continued %}disabled{% endif %}">
+                    <a class="page-link" href="{% url 'work_queue' %}">&laquo; Top of queue</a>
+                </li>
+                <li class="page-item {% if not next_query %}disabled{% endif %}">
+                    <a class="page-link" href="{% if next_query %}?{{ next_query }}{% else %}#{% endif %}">Next &raquo;</a>
+                </li>
+            </ul>
+        </nav>
+        {% endif %}
     </div>
 </div>
 {% endblock %}
-                        <i class="fas fa-project-diagram fa-2x"></i>
+
+# templates/projects/project_detail.html
+{% extends 'base.html' %}
+{% load humanize %}
+
+{% block title %}{{ project.title }} - LaTeX Services{% endblock %}
+
+{% block content %}
+<div class="d-flex justify-content-between align-items-center mb-4">
+    <div>
+        <h1>{{ project.title }}</h1>
+        <p class="text-muted mb-0">
+            {{ project.client.full_name }} &middot; {{ project.get_project_type_display }} &middot;
+            <span class="badge bg-secondary status-badge">{{ project.get_status_display }}</span>
+        </p>
+    </div>
+    <a href="{% url 'project_edit' project.pk %}" class="btn btn-outline-primary">
+        <i class="fas fa-edit"></i> Edit
+    </a>
+</div>
+
+<div class="row">
+    <div class="col-md-8">
+        <div class="card mb-4">
+            <div class="card-header">
+                <h5 class="mb-0">Files</h5>
+            </div>
+            <div class="card-body">
+                <div class="row g-3">
+                    {% for file in files %}
+                    <div class="col-sm-6 col-lg-4">
+                        <div class="card h-100">
+                            {% if file.has_preview %}
+                            <a href="{% url 'file_preview_page' file.pk 1 %}" target="_blank" rel="noopener">
+                                <img src="{% url 'file_preview' file.pk %}" class="card-img-top" loading="lazy" alt="First page of {{ file.filename }}">
+                            </a>
+                            {% elif file.preview_pending %}
+                            <div class="card-img-top bg-light text-muted small text-center py-5">
+                                <i class="fas fa-hourglass-half"></i> Preview pending
+                            </div>
+                            {% endif %}
+                            <div class="card-body">
+                                <div class="fw-bold text-truncate">{{ file.filename }}</div>
+                                <small class="text-muted">
+                                    {{ file.get_file_type_display }}{% if file.version %} &middot; {{ file.version }}{% endif %}
+                                    &middot; {{ file.uploaded_at|date:"M d, Y" }}
+                                </small>
+                            </div>
+                            <div class="card-footer bg-transparent">
+                                <a href="{{ file.get_absolute_url }}" class="btn btn-sm btn-outline-secondary">
+                                    <i class="fas fa-download"></i> Download
+                                </a>
+                            </div>
+                        </div>
                     </div>
+                    {% empty %}
+                    <p class="text-muted">No files yet</p>
+                    {% endfor %}
                 </div>
             </div>
         </div>
     </div>
-    <div class="col-md-3">
-        <div class="card bg-success text-white">
+    
+    <div class="col-md-4">
+        <div class="card mb-4">
+            <div class="card-header">
+                <h5 class="mb-0">Details</h5>
+            </div>
             <div class="card-body">
-                <div class="d-flex justify-content-between">
-                    <div>
-                        <h3>${{ stats.monthly_revenue|floatformat:0|intcomma }}</h3>
-                        <p class="mb-0">This Month</p>
-                    </div>
-                    <div class="align-self-center">
-                        <i class="fas fa-dollar-sign fa-2x"></i>
-                    </div>
-                </div>
+                <p class="mb-1"><strong>Priority:</strong> {{ project.get_priority_display }}</p>
+                <p class="mb-1"><strong>Deadline:</strong> {{ project.deadline|date:"M d, Y"|default:"No deadline" }}</p>
+                <p class="mb-1"><strong>Quoted:</strong> ${{ project.quoted_amount|default:"—" }}</p>
+                <p class="mb-0">{{ project.description|linebreaksbr }}</p>
             </div>
         </div>
-    </div>
-    <div class="col-md-3">
-        <div class="card bg-warning text-white">
+        
+        <div class="card">
+            <div class="card-header">
+                <h5 class="mb-0">Communications</h5>
+            </div>
             <div class="card-body">
-                <div class="d-flex justify-content-between">
-                    <div>
-                        <h3>{{ stats.pending_quotes }}</h3>
-                        <p class="mb-0">Pending Quotes</p>
-                    </div>
-                    <div class="align-self-center">
-                        <i class="fas fa-clock fa-2x"></i>
-                    </div>
+                {% for comm in communications %}
+                <div class="mb-3">
+                    <div class="fw-bold">{{ comm.subject }}</div>
+                    <small class="text-muted">{{ comm.get_direction_display }} &middot; {{ comm.created_at|timesince }} ago</small>
                 </div>
+                {% empty %}
+                <p class="text-muted">No communications yet</p>
+                {% endfor %}
             </div>
         </div>
     </div>
-    <div class="col-md-3">
-        <div class="card bg-info text-white">
-            <div class="card-body">
-                <div class="d-flex justify-content-between">
-                    <div>
-                        <h3>{{ stats.total_clients }}</h3>
-                        <p class="mb-0">Total Clients</p>
-                    </div>
-                    <div class="align-self-center">
\ No newline at end of file
+</div>
+{% endblock %}
@@ -1,16 +1,32 @@
 # projects/admin.py
 from django.contrib import admin
+from django.urls import reverse
 from django.utils.html import format_html
 from django.utils import timezone
+from latex_services.replicas import ReplicaChangelistMixin
+from latex_services.search import search_projects
 from .models import Project, ProjectFile
+from .previews import annotate_previews
 
 class ProjectFileInline(admin.TabularInline):
     model = ProjectFile
     extra = 0
-    readonly_fields = ['uploaded_at']
+    readonly_fields = ['preview', 'uploaded_at']
+    
+    def get_queryset(self, request):
+        return annotate_previews(super().get_queryset(request))
+    
+    def preview(self, obj):
+        # Thumbnail from the preview cache, linking to the download
+        if not getattr(obj, 'has_preview', False):
+            return '—'
+        return format_html(
+            '<a href="{}"><img src="{}" alt="Preview of {}" style="max-height: 80px;"></a>',
+            obj.get_absolute_url(), reverse('file_preview', args=[obj.pk]), obj.filename
+        )
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(ReplicaChangelistMixin, admin.ModelAdmin):
     list_display = [
         'title', 'client', 'project_type', 'status_display', 
         'priority_display', 'deadline_display', 'quoted_amount', 'created_at'
@@ -47,6 +63,20 @@ class ProjectAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_deadline_state()
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Indexed search instead of the icontains scan built from search_fields
+        if not search_term:
+            return queryset, False
+        return search_projects(queryset, search_term, ranked=True), False
+    
+    def get_ordering(self, request):
+        if request.GET.get('q'):
+            return ['-search_rank', '-created_at']
+        return super().get_ordering(request)
+    
     def status_display(self, obj):
         colors = {
             'inquiry': 'gray',
@@ -77,17 +107,18 @@ class ProjectAdmin(admin.ModelAdmin):
             color, obj.get_priority_display()
         )
     priority_display.short_description = 'Priority'
+    priority_display.admin_order_field = 'priority_rank'
     
     def deadline_display(self, obj):
         if not obj.deadline:
             return 'No deadline'
         
-        if obj.deadline < timezone.now():
+        if obj.is_overdue:
             return format_html(
                 '<span style="color: red; font-weight: bold;">{} (OVERDUE)</span>',
                 obj.deadline.strftime('%Y-%m-%d')
             )
-        elif (obj.deadline - timezone.now()).days <= 3:
+        elif obj.is_due_soon:
             return format_html(
                 '<span style="color: orange; font-weight: bold;">{} (DUE SOON)</span>',
                 obj.deadline.strftime('%Y-%m-%d')
@@ -95,9 +126,17 @@ class ProjectAdmin(admin.ModelAdmin):
         else:
             return obj.deadline.strftime('%Y-%m-%d')
     deadline_display.short_description = 'Deadline'
+    deadline_display.admin_order_field = 'deadline'
 
 @admin.register(ProjectFile)
-class ProjectFileAdmin(admin.ModelAdmin):
+class ProjectFileAdmin(ReplicaChangelistMixin, admin.ModelAdmin):
     list_display = ['filename', 'project', 'file_type', 'version', 'uploaded_at']
     list_filter = ['file_type', 'uploaded_at']
     search_fields = ['filename', 'description', 'project__title']
+    # str(project) includes the client's name
+    list_select_related = ['project__client']
+    
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'project':
+            kwargs['queryset'] = Project.objects.select_related('client')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)